@@ -40,7 +40,7 @@ resource "google_bigquery_table" "player_stats_data" {
   dataset_id = var.big_query_dataset
   table_id = "player_stats_data"
 
-  schema = local.player_stats_schema
+  schema = local.player_stats_schema_v1
 
   # Define clustering configuration
   clustering = ["Season"]
@@ -53,6 +53,37 @@ resource "google_bigquery_table" "player_demo_data" {
   dataset_id = var.big_query_dataset
   table_id = "player_demo_data"
 
+  schema = local.player_demo_schema_v1
+
+  deletion_protection = false
+
+  # Define clustering configuration
+  clustering = ["Season", "Club", "Position", "Nationality"]
+
+  }
+
+# Typed tables. BigQuery cannot change a STRING column to a
+# number in place, the backfill script copies the first ones over
+
+# Player Stats Table, typed
+resource "google_bigquery_table" "player_stats_data_v2" {
+  project = var.project
+  dataset_id = var.big_query_dataset
+  table_id = "player_stats_data_v2"
+
+  schema = local.player_stats_schema
+
+  # Define clustering configuration
+  clustering = ["Season"]
+
+  }
+
+# Player Demographics Table, typed
+resource "google_bigquery_table" "player_demo_data_v2" {
+  project = var.project
+  dataset_id = var.big_query_dataset
+  table_id = "player_demo_data_v2"
+
   schema = local.player_demo_schema
 
   deletion_protection = false
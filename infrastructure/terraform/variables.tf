@@ -6,6 +6,9 @@ locals {
   data_lake_bucket = "epl_data_lake"
   player_stats_schema = file("./resources/schema/player_stats_data.json")
   player_demo_schema = file("./resources/schema/player_data_football_critic.json")
+  # String typed schemas of the first tables, kept until they are backfilled
+  player_stats_schema_v1 = file("./resources/schema/player_stats_data_v1.json")
+  player_demo_schema_v1 = file("./resources/schema/player_data_football_critic_v1.json")
 }
 
 variable "credentials_file" {}
@@ -0,0 +1 @@
+""" Analytics computed over the EPL datasets """
@@ -0,0 +1,498 @@
+""" Elo-style team ratings, updated match by match
+in date order and checkpointed per season """
+
+import os
+import glob
+import math
+
+import numpy as np
+import pandas as pd
+
+
+INITIAL_RATING = 1500.0
+
+# Rating points a result moves before the goal margin multiplier
+K_FACTOR = 20.0
+
+# Rating points added to the home side's expected score
+HOME_ADVANTAGE = 60.0
+
+# Share of each rating's distance from the initial
+# rating removed between seasons
+SEASON_REGRESSION = 0.2
+
+# History keys, ordered by team then day. A struct rather than
+# packed bits, days before the epoch are negative
+_KEY_DTYPE = np.dtype([('team', np.int64), ('day', np.int64)])
+
+# Odd multiplier mixing the columns of a match fingerprint
+_HASH_MIX = np.uint64(0xBF58476D1CE4E5B9)
+
+
+def _days(dates) -> np.ndarray:
+    """Days since the epoch of datetime-like values"""
+
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+
+
+def _keys(team_ids, days) -> np.ndarray:
+    """`(team, day)` history keys"""
+
+    keys = np.empty(len(team_ids), dtype=_KEY_DTYPE)
+    keys['team'] = team_ids
+    keys['day'] = days
+
+    return keys
+
+
+def _match_hash(*columns) -> int:
+    """Fingerprint of matches and their results,
+    independent of their order
+
+    Args:
+    -----
+    columns :
+        Integer arrays, e.g. day, home and away team
+        ids and goals, one value per match
+
+    Returns:
+    --------
+        Sum of the matches' hashes, modulo 2 ** 64
+    """
+
+    # Unsigned arithmetic wraps around silently
+    rows = np.zeros(len(columns[0]), dtype=np.uint64)
+    for column in columns:
+        rows = (rows ^ np.asarray(column).astype(np.uint64)) * _HASH_MIX
+        rows ^= rows >> np.uint64(31)
+
+    return int(rows.sum(dtype=np.uint64))
+
+
+class EloEngine:
+    """Team ratings held in arrays and updated in
+    date order, with an append-only rating history.
+    With a checkpoint directory, each season's state
+    and history are saved as the season is processed,
+    and late or corrected matches are replayed from
+    the checkpoint before their season
+
+    Args:
+    -----
+    checkpoint_dir : str
+        Directory of the season checkpoints
+    k_factor : float
+        Base rating change of a result
+    home_advantage : float
+        Rating points given to the home side
+    season_regression : float
+        Share of each rating regressed to the
+        initial rating when a new season starts
+    initial_rating : float
+        Rating of teams never seen before
+    """
+
+    def __init__(self, checkpoint_dir: str = None,
+                 k_factor: float = K_FACTOR,
+                 home_advantage: float = HOME_ADVANTAGE,
+                 season_regression: float = SEASON_REGRESSION,
+                 initial_rating: float = INITIAL_RATING):
+        self.checkpoint_dir = checkpoint_dir
+        self.k_factor = k_factor
+        self.home_advantage = home_advantage
+        self.season_regression = season_regression
+        self.initial_rating = initial_rating
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget every processed match"""
+
+        self.teams = []
+        self.team_index = {}
+        self.ratings = np.empty(0)
+        self.season = None
+        self.last_day = np.iinfo(np.int64).min
+
+        # Ratings after each match, home then away, in date
+        # order. Rows from `_season_start` are the season's
+        self._history = []
+        self._history_rows = 0
+        self._season_start = 0
+        self._lookup = None
+        # Fingerprint of each season's processed matches,
+        # None for seasons checkpointed without one
+        self._season_hashes = {}
+
+    def _team_ids(self, names) -> np.ndarray:
+        """Integer ids of team names, adding new teams"""
+
+        ids = np.empty(len(names), dtype=np.int64)
+        for position, name in enumerate(names):
+            team_id = self.team_index.get(name)
+            if team_id is None:
+                team_id = self.team_index[name] = len(self.teams)
+                self.teams.append(name)
+            ids[position] = team_id
+
+        missing = len(self.teams) - len(self.ratings)
+        if missing:
+            self.ratings = np.concatenate(
+                [self.ratings, np.full(missing, self.initial_rating)])
+
+        return ids
+
+    def update(self, matches: pd.DataFrame) -> int:
+        """Process matches played after the last
+        processed date, in date order. Seasons are
+        passed whole; when one adds or corrects a
+        match on or before the last processed date,
+        the ratings are replayed from the checkpoint
+        before that season
+
+        Args:
+        -----
+        matches : pd.DataFrame
+            Match frame with `Season Year`, `Date`,
+            `HomeTeam`, `AwayTeam`, `FTHG` and `FTAG`
+
+        Returns:
+        --------
+            Number of matches processed
+
+        Raises:
+        -------
+            ValueError when the replay needs seasons
+            missing from `matches`, or checkpoints
+        """
+
+        days = _days(matches['Date'])
+        seen = days <= self.last_day
+
+        changed = self._changed_seasons(matches[seen])
+        if changed:
+            first = min(changed)
+            self._rewind(first, matches)
+            return self.update(
+                matches[matches['Season Year'].astype(str) >= first])
+
+        new = matches[~seen]
+        if new.empty:
+            return 0
+
+        new = new.iloc[np.argsort(_days(new['Date']), kind='stable')]
+        seasons = new['Season Year'].astype(str).to_numpy()
+        boundaries = np.flatnonzero(seasons[1:] != seasons[:-1]) + 1
+
+        for rows in np.split(np.arange(len(new)), boundaries):
+            season = seasons[rows[0]]
+            if season != self.season:
+                self._start_season(season)
+            self._process(new.iloc[rows])
+
+        if self.checkpoint_dir:
+            self.checkpoint()
+
+        return len(new)
+
+    def _changed_seasons(self, seen: pd.DataFrame) -> list:
+        """Seasons whose matches on or before the last
+        processed date differ from those processed"""
+
+        changed = []
+        for season, season_matches in seen.groupby(
+                seen['Season Year'].astype(str)):
+            if season not in self._season_hashes:
+                changed.append(season)
+            elif self._season_hashes[season] is None:
+                print(f'No match fingerprint for {season}, '
+                      f'skipping its already processed dates')
+            elif self._frame_hash(season_matches) != (
+                    self._season_hashes[season]):
+                changed.append(season)
+
+        return changed
+
+    def _frame_hash(self, matches: pd.DataFrame) -> int:
+        """`_match_hash` of processed teams' matches,
+        unknown teams never match a processed one"""
+
+        index = pd.Index(self.teams)
+
+        return _match_hash(
+            _days(matches['Date']),
+            index.get_indexer(matches['HomeTeam'].astype(str)),
+            index.get_indexer(matches['AwayTeam'].astype(str)),
+            matches['FTHG'].to_numpy(dtype=np.int64),
+            matches['FTAG'].to_numpy(dtype=np.int64)
+        )
+
+    def _rewind(self, first_season: str, matches: pd.DataFrame) -> None:
+        """Restore the state before `first_season`
+        from its checkpoints, so it and the seasons
+        after it can be processed again"""
+
+        replayed = sorted(
+            season for season in self._season_hashes
+            if season >= first_season)
+        missing = sorted(
+            set(replayed) - set(matches['Season Year'].astype(str)))
+        if missing:
+            raise ValueError(
+                f'Matches changed in {first_season}, the ratings of '
+                f'{", ".join(missing)} must be replayed too: reload '
+                f'those seasons whole')
+        if not self.checkpoint_dir:
+            raise ValueError(
+                f'Matches changed in {first_season}, replaying them '
+                f'needs a checkpoint directory')
+
+        print(f'Matches changed in {first_season}, replaying '
+              f'the ratings from the start of that season')
+
+        paths = self._checkpoint_paths(self.checkpoint_dir)
+        for path in paths:
+            if self._path_season(path) >= first_season:
+                os.remove(path)
+
+        self._reset()
+        self._load([
+            path for path in paths
+            if self._path_season(path) < first_season
+        ])
+
+    def _start_season(self, season: str) -> None:
+        """Close the previous season and regress the
+        ratings towards the initial rating"""
+
+        if self.season is not None:
+            if self.checkpoint_dir:
+                self.checkpoint()
+            self.ratings = self.ratings - self.season_regression * (
+                self.ratings - self.initial_rating)
+
+        self.season = season
+        self._season_start = self._history_rows
+        self._season_hashes[season] = 0
+
+    def _process(self, matches: pd.DataFrame) -> None:
+        """Update the ratings with one season's
+        matches, already in date order"""
+
+        days = _days(matches['Date'])
+        home = self._team_ids(matches['HomeTeam'].astype(str).to_numpy())
+        away = self._team_ids(matches['AwayTeam'].astype(str).to_numpy())
+        home_goals = matches['FTHG'].to_numpy(dtype=np.int64)
+        away_goals = matches['FTAG'].to_numpy(dtype=np.int64)
+        margins = (home_goals - away_goals).tolist()
+
+        # Plain floats are much faster to index one by one
+        ratings = self.ratings.tolist()
+        after = np.empty((len(matches), 2))
+
+        for match, (home_id, away_id, margin) in enumerate(
+                zip(home.tolist(), away.tolist(), margins)):
+            rating_gap = (
+                ratings[home_id] + self.home_advantage - ratings[away_id])
+
+            expected = 1.0 / (1.0 + 10.0 ** (-rating_gap / 400.0))
+            actual = 1.0 if margin > 0 else 0.5 if margin == 0 else 0.0
+
+            # Bigger wins move ratings more, less so between
+            # sides that were already far apart
+            if margin:
+                winner_gap = rating_gap if margin > 0 else -rating_gap
+                multiplier = (
+                    math.log(abs(margin) + 1.0)
+                    * 2.2 / (winner_gap * 0.001 + 2.2)
+                )
+            else:
+                multiplier = 1.0
+
+            change = self.k_factor * multiplier * (actual - expected)
+            ratings[home_id] += change
+            ratings[away_id] -= change
+            after[match] = ratings[home_id], ratings[away_id]
+
+        self.ratings = np.asarray(ratings)
+        self.last_day = int(days[-1])
+        if self._season_hashes[self.season] is not None:
+            self._season_hashes[self.season] = (
+                self._season_hashes[self.season]
+                + _match_hash(days, home, away, home_goals, away_goals)
+            ) % 2 ** 64
+
+        self._history.append((
+            np.column_stack([home, away]).ravel(),
+            np.repeat(days, 2),
+            after.ravel()
+        ))
+        self._history_rows += 2 * len(matches)
+        self._lookup = None
+
+    def _history_arrays(self, start: int = 0) -> tuple:
+        if not self._history:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+
+        # Merge the appended parts once, later calls reuse them
+        if len(self._history) > 1:
+            self._history = [tuple(
+                np.concatenate(part) for part in zip(*self._history))]
+
+        return tuple(part[start:] for part in self._history[0])
+
+    def _build_lookup(self) -> tuple:
+        """Sorted `(team, day)` keys and the rating
+        after each, searched by `ratings_at`"""
+
+        team_ids, days, ratings = self._history_arrays()
+        keys = _keys(team_ids, days)
+        # Stable, so the last match of a day wins
+        order = np.argsort(keys, kind='stable')
+
+        return keys[order], ratings[order]
+
+    def ratings_at(self, teams, dates) -> np.ndarray:
+        """Ratings of teams after their last match
+        on or before each date, vectorised
+
+        Args:
+        -----
+        teams : array-like
+            Team names
+        dates : array-like
+            Dates, one per team
+
+        Returns:
+        --------
+            Array of ratings, the initial rating for
+            teams without a match by then
+        """
+
+        if self._lookup is None:
+            self._lookup = self._build_lookup()
+        keys, ratings = self._lookup
+
+        team_ids = pd.Index(self.teams).get_indexer(
+            np.asarray(teams)).astype(np.int64)
+        if not len(keys):
+            return np.full(len(team_ids), self.initial_rating)
+
+        query = _keys(team_ids, _days(dates))
+        found = np.searchsorted(keys, query, side='right') - 1
+        safe = np.clip(found, 0, None)
+        valid = (
+            (found >= 0) & (team_ids >= 0)
+            & (keys['team'][safe] == team_ids)
+        )
+
+        return np.where(valid, ratings[safe], self.initial_rating)
+
+    def table(self) -> pd.DataFrame:
+        """Current ratings, strongest first
+
+        Returns:
+        --------
+            Pandas DataFrame with `team` and `rating`
+        """
+
+        return (
+            pd.DataFrame({'team': self.teams, 'rating': self.ratings})
+            .sort_values('rating', ascending=False, ignore_index=True)
+        )
+
+    def checkpoint(self) -> str:
+        """Save the state and the current season's
+        history, replacing the season's checkpoint
+
+        Returns:
+        --------
+            Path of the season checkpoint
+        """
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = os.path.join(self.checkpoint_dir, f'{self.season}.npz')
+        temp_path = os.path.join(self.checkpoint_dir, '.checkpoint.npz')
+
+        team_ids, days, ratings = self._history_arrays(self._season_start)
+        # Write then rename, a crash never leaves a partial file
+        np.savez(
+            temp_path,
+            teams=np.array(self.teams, dtype=str),
+            ratings=self.ratings,
+            season=np.array(self.season),
+            last_day=np.array(self.last_day),
+            match_hash=np.array(
+                self._season_hashes.get(self.season) or 0, dtype=np.uint64),
+            settings=np.array([self.k_factor, self.home_advantage,
+                               self.season_regression, self.initial_rating]),
+            history_teams=team_ids,
+            history_days=days,
+            history_ratings=ratings
+        )
+        os.replace(temp_path, path)
+
+        return path
+
+    @staticmethod
+    def _checkpoint_paths(checkpoint_dir: str) -> list:
+        return sorted(glob.glob(os.path.join(checkpoint_dir, '*.npz')))
+
+    @staticmethod
+    def _path_season(path: str) -> str:
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def _load(self, paths: list) -> None:
+        """Load season checkpoints, in season order:
+        the state of the last and the history and
+        match fingerprint of each"""
+
+        for path in paths:
+            with np.load(path) as state:
+                self._season_start = self._history_rows
+                self._history.append((
+                    state['history_teams'],
+                    state['history_days'],
+                    state['history_ratings']
+                ))
+                self._history_rows += len(state['history_teams'])
+                self._season_hashes[str(state['season'])] = (
+                    int(state['match_hash'])
+                    if 'match_hash' in state.files else None
+                )
+
+                if path == paths[-1]:
+                    self.teams = state['teams'].tolist()
+                    self.team_index = {
+                        team: team_id
+                        for team_id, team in enumerate(self.teams)
+                    }
+                    self.ratings = state['ratings']
+                    self.season = str(state['season'])
+                    self.last_day = int(state['last_day'])
+
+    @classmethod
+    def restore(cls, checkpoint_dir: str):
+        """Rebuild an engine from its season
+        checkpoints: the state of the latest season
+        and the history of all of them
+
+        Args:
+        -----
+        checkpoint_dir : str
+            Directory of the season checkpoints
+
+        Returns:
+        --------
+            EloEngine, new when there is no checkpoint
+        """
+
+        paths = cls._checkpoint_paths(checkpoint_dir)
+        if not paths:
+            return cls(checkpoint_dir)
+
+        with np.load(paths[0]) as state:
+            engine = cls(checkpoint_dir, *state['settings'].tolist())
+        engine._load(paths)
+
+        return engine
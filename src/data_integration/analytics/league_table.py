@@ -0,0 +1,358 @@
+""" League standings after every matchday, computed
+column-wise over the football-data match dataset """
+
+import pandas as pd
+
+
+# Matches the rolling form is computed over
+FORM_WINDOW = 5
+
+# Counters summed over a team's matches
+COUNTERS = [
+    'won', 'drawn', 'lost', 'gf', 'ga', 'points',
+    'home_won', 'home_drawn', 'home_lost', 'home_points',
+    'away_won', 'away_drawn', 'away_lost', 'away_points'
+]
+
+# Order of the standings, ties broken by team name
+RANKING = ['points', 'gd', 'gf', 'team']
+
+
+def team_results(matches: pd.DataFrame) -> pd.DataFrame:
+    """Split each match into one row per team,
+    in the order the matches were played
+
+    Args:
+    -----
+    matches : pd.DataFrame
+        Match frame from `transform_epl_data`, with
+        `Season Year`, `Date`, `HomeTeam`, `AwayTeam`,
+        `FTHG` and `FTAG`
+
+    Returns:
+    --------
+        Pandas DataFrame with a row per team and match
+    """
+
+    sides = []
+    for venue, team, opponent, scored, conceded in [
+        ('home', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG'),
+        ('away', 'AwayTeam', 'HomeTeam', 'FTAG', 'FTHG')
+    ]:
+        sides.append(pd.DataFrame({
+            'season': matches['Season Year'].astype(str).to_numpy(),
+            'date': matches['Date'].to_numpy(),
+            'team': matches[team].astype(str).to_numpy(),
+            'opponent': matches[opponent].astype(str).to_numpy(),
+            'venue': venue,
+            'gf': matches[scored].to_numpy(dtype='int64'),
+            'ga': matches[conceded].to_numpy(dtype='int64')
+        }))
+
+    results = pd.concat(sides, ignore_index=True)
+    results = results.sort_values(
+        ['season', 'date', 'team', 'opponent'],
+        kind='stable', ignore_index=True)
+
+    won = results['gf'] > results['ga']
+    drawn = results['gf'] == results['ga']
+    home = results['venue'] == 'home'
+
+    results['won'] = won.astype('int64')
+    results['drawn'] = drawn.astype('int64')
+    results['lost'] = (~won & ~drawn).astype('int64')
+    results['points'] = 3 * results['won'] + results['drawn']
+    results['result'] = 'L'
+    results.loc[won, 'result'] = 'W'
+    results.loc[drawn, 'result'] = 'D'
+
+    for venue, mask in [('home', home), ('away', ~home)]:
+        for counter in ['won', 'drawn', 'lost', 'points']:
+            results[f'{venue}_{counter}'] = results[counter].where(mask, 0)
+
+    return results
+
+
+def _add_form(results: pd.DataFrame, form_window: int) -> None:
+    """Add the points and W/D/L string of each
+    team's last `form_window` matches"""
+
+    grouped = results.groupby(['season', 'team'], sort=False)
+
+    results['form_points'] = (
+        grouped['points']
+        .rolling(form_window, min_periods=1).sum()
+        .reset_index(level=[0, 1], drop=True)
+        .astype('int64')
+    )
+
+    form = pd.Series('', index=results.index)
+    for lag in range(form_window - 1, -1, -1):
+        form = form + grouped['result'].shift(lag).fillna('')
+    results['form'] = form
+
+
+def _rank(standings: pd.DataFrame) -> pd.Series:
+    """Position of each team within its season
+    and matchday"""
+
+    ordered = standings.sort_values(
+        ['season', 'matchday'] + RANKING,
+        ascending=[True, True, False, False, False, True],
+        kind='stable')
+
+    return (
+        ordered.groupby(['season', 'matchday'], sort=False).cumcount() + 1
+    ).reindex(standings.index)
+
+
+def compute_standings(matches: pd.DataFrame,
+                      form_window: int = FORM_WINDOW) -> pd.DataFrame:
+    """Standings of every team after each of its
+    matches, across all seasons in one pass
+
+    Args:
+    -----
+    matches : pd.DataFrame
+        Match frame from `transform_epl_data`
+    form_window : int
+        Matches the form is computed over
+
+    Returns:
+    --------
+        Pandas DataFrame with a row per team and
+        matchday: played, W/D/L, GF/GA/GD, points,
+        home/away splits, form and position
+    """
+
+    results = team_results(matches)
+    grouped = results.groupby(['season', 'team'], sort=False)
+
+    standings = results[['season', 'team', 'date', 'opponent', 'venue']].copy()
+    standings['matchday'] = grouped.cumcount() + 1
+    standings['played'] = standings['matchday']
+    standings[COUNTERS] = grouped[COUNTERS].cumsum()
+    standings['gd'] = standings['gf'] - standings['ga']
+
+    _add_form(results, form_window)
+    standings['form_points'] = results['form_points']
+    standings['form'] = results['form']
+    standings['position'] = _rank(standings)
+
+    return standings
+
+
+def table_at(standings: pd.DataFrame, season: str,
+             matchday: int = None) -> pd.DataFrame:
+    """League table of a season after a matchday
+
+    Args:
+    -----
+    standings : pd.DataFrame
+        Output of `compute_standings`
+    season : str
+        EPL season, e.g. `2022-2023`
+    matchday : int
+        Matchday, the last one when None
+
+    Returns:
+    --------
+        Pandas DataFrame ordered by position
+    """
+
+    season_rows = standings[standings['season'] == season]
+    if matchday is None:
+        matchday = season_rows['matchday'].max()
+
+    return (
+        season_rows[season_rows['matchday'] == matchday]
+        .sort_values('position')
+        .reset_index(drop=True)
+    )
+
+
+def _match_frame(results: pd.DataFrame) -> pd.DataFrame:
+    """Match frame of the home rows of team results"""
+
+    matches = results[results['venue'] == 'home']
+
+    return pd.DataFrame({
+        'Season Year': matches['season'].to_numpy(),
+        'Date': matches['date'].to_numpy(),
+        'HomeTeam': matches['team'].to_numpy(),
+        'AwayTeam': matches['opponent'].to_numpy(),
+        'FTHG': matches['gf'].to_numpy(),
+        'FTAG': matches['ga'].to_numpy()
+    })
+
+
+class LeagueTable:
+    """Standings kept up to date as new matches
+    are played, without recomputing past matchdays
+
+    Args:
+    -----
+    matches : pd.DataFrame
+        Matches played so far
+    form_window : int
+        Matches the form is computed over
+    """
+
+    def __init__(self, matches: pd.DataFrame,
+                 form_window: int = FORM_WINDOW):
+        self.form_window = form_window
+        self.results = team_results(matches)
+        self.standings = compute_standings(matches, form_window)
+
+    @classmethod
+    def from_standings(cls, standings: pd.DataFrame,
+                       form_window: int = FORM_WINDOW):
+        """Restore a table from stored standings without
+        computing them again. Each match's goals are
+        the steps of the teams' cumulative goals
+
+        Args:
+        -----
+        standings : pd.DataFrame
+            Output of `compute_standings`, e.g. read
+            back from the standings dataset
+        form_window : int
+            Matches the form is computed over
+
+        Returns:
+        --------
+            LeagueTable
+        """
+
+        standings = standings.astype({
+            'season': str, 'team': str, 'opponent': str, 'venue': str,
+            'date': 'datetime64[ns]'
+        }).sort_values(
+            ['season', 'date', 'team', 'opponent'],
+            kind='stable', ignore_index=True)
+
+        grouped = standings.groupby(['season', 'team'], sort=False)
+        steps = standings[['season', 'date', 'team', 'opponent', 'venue']]
+        steps = steps.assign(
+            gf=grouped['gf'].diff().fillna(standings['gf']).astype('int64'),
+            ga=grouped['ga'].diff().fillna(standings['ga']).astype('int64'))
+
+        table = cls.__new__(cls)
+        table.form_window = form_window
+        table.results = team_results(_match_frame(steps))
+        table.standings = standings
+
+        return table
+
+    def sync(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """Bring the table's seasons in line with all
+        of their matches played so far: matches not
+        yet in the table are applied incrementally.
+        When a known match is missing or its score
+        changed, the table is computed again
+
+        Args:
+        -----
+        matches : pd.DataFrame
+            Every match of one or more seasons
+
+        Returns:
+        --------
+            Standings rows of the matches applied
+        """
+
+        incoming = team_results(matches)
+        incoming['date'] = incoming['date'].astype('datetime64[ns]')
+        seasons = incoming['season'].unique()
+        columns = ['season', 'date', 'team', 'opponent', 'venue', 'gf', 'ga']
+
+        known = self.results[self.results['season'].isin(seasons)]
+        compared = incoming[columns].merge(
+            known[columns], how='outer', indicator=True)
+
+        if (compared['_merge'] == 'right_only').any():
+            other = self.results[~self.results['season'].isin(seasons)]
+            self._recompute(pd.concat([other, incoming], ignore_index=True))
+            return self.standings[self.standings['season'].isin(seasons)]
+
+        new = compared[compared['_merge'] == 'left_only']
+        if new.empty:
+            return self.standings.iloc[:0]
+
+        return self.update(_match_frame(new))
+
+    def update(self, matches: pd.DataFrame) -> pd.DataFrame:
+        """Apply newly played matches. Matches dated
+        before a team's latest known match trigger a
+        full recompute
+
+        Args:
+        -----
+        matches : pd.DataFrame
+            New matches, same columns as the match frame
+
+        Returns:
+        --------
+            Standings rows of the new matches
+        """
+
+        new_results = team_results(matches)
+        keys = ['season', 'team']
+
+        latest = self.results.groupby(keys)['date'].max().rename('latest')
+        checked = new_results.join(latest, on=keys)
+        if (checked['date'] < checked['latest']).any():
+            all_results = pd.concat(
+                [self.results, new_results], ignore_index=True)
+            self._recompute(all_results)
+            return self.standings.merge(
+                new_results[['season', 'team', 'date', 'opponent']])
+
+        # Offsets: each team's totals before the new matches
+        totals = (
+            self.standings.groupby(keys, sort=False)
+            [['matchday'] + COUNTERS].last()
+        )
+
+        grouped = new_results.groupby(keys, sort=False)
+        new_rows = new_results[
+            ['season', 'team', 'date', 'opponent', 'venue']].copy()
+        new_rows['matchday'] = grouped.cumcount() + 1
+        new_rows[COUNTERS] = grouped[COUNTERS].cumsum()
+
+        offsets = new_rows[keys].join(totals, on=keys).fillna(0)
+        for column in ['matchday'] + COUNTERS:
+            new_rows[column] += offsets[column].astype('int64')
+        new_rows['played'] = new_rows['matchday']
+        new_rows['gd'] = new_rows['gf'] - new_rows['ga']
+
+        # Form needs the last matches before the new ones
+        context = self.results.groupby(keys, sort=False).tail(
+            self.form_window - 1)
+        with_context = pd.concat([context, new_results], ignore_index=True)
+        _add_form(with_context, self.form_window)
+        new_rows['form_points'] = (
+            with_context['form_points'].iloc[len(context):].to_numpy())
+        new_rows['form'] = with_context['form'].iloc[len(context):].to_numpy()
+
+        # Re-rank only the matchdays the new matches touch
+        standings = pd.concat(
+            [self.standings, new_rows], ignore_index=True)
+        touched = standings.set_index(['season', 'matchday']).index.isin(
+            new_rows.set_index(['season', 'matchday']).index)
+        standings.loc[touched, 'position'] = _rank(standings[touched])
+        standings['position'] = standings['position'].astype('int64')
+
+        self.results = pd.concat(
+            [self.results, new_results], ignore_index=True)
+        self.standings = standings
+
+        return standings.iloc[len(standings) - len(new_rows):]
+
+    def _recompute(self, results: pd.DataFrame) -> None:
+        results = results.sort_values(
+            ['season', 'date', 'team', 'opponent'],
+            kind='stable', ignore_index=True)
+        self.results = results
+        self.standings = compute_standings(
+            _match_frame(results), self.form_window)
@@ -0,0 +1,253 @@
+""" Embedded DuckDB query layer over the local Parquet
+datasets, running the dbt models without BigQuery """
+
+import os
+import json
+import hashlib
+import argparse
+
+import duckdb
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+DATA_INTEGRATION_DIR = os.path.dirname(os.path.dirname(__file__))
+
+# Local datasets registered as tables, written by the pipelines
+DATASETS = {
+    'match_data': os.path.join(
+        DATA_INTEGRATION_DIR, 'Data', 'epl_match_data'),
+    'standings': os.path.join(
+        DATA_INTEGRATION_DIR, 'Data', 'epl_standings'),
+    'player_stats_data': os.path.join(
+        DATA_INTEGRATION_DIR, 'epl_scrappers', 'who_scored', 'Data',
+        'epl_player_stats_data'),
+    'player_demo_data': os.path.join(
+        DATA_INTEGRATION_DIR, 'epl_scrappers', 'football_critic', 'Data',
+        'epl_player_data')
+}
+
+# Materialized model results are cached here
+CACHE_DIR = os.path.join(DATA_INTEGRATION_DIR, 'Cache', 'models')
+
+# The dbt models, in DuckDB SQL, with the datasets they read.
+# Staging also applies the clean-up done by the BigQuery loaders
+MODELS = {
+    'stg__player_stats': (['player_stats_data'], """
+        select
+            Player as player_names,
+            try_cast(nullif(Mins, '-') as bigint) as minutes_played,
+            try_cast(nullif(Goals, '-') as bigint) as goals_scored,
+            try_cast(nullif(Assists, '-') as bigint) as assists_made,
+            try_cast(nullif(Yel, '-') as bigint) as yellow_cards_received,
+            try_cast(nullif(Red, '-') as bigint) as red_cards_received,
+            try_cast(nullif(SpG, '-') as double) as shots_per_game,
+            try_cast(nullif("PS%", '-') as double)
+                as pass_success_percentage,
+            try_cast(nullif(AerialsWon, '-') as double)
+                as aerial_duels_won_per_game,
+            try_cast(nullif(MotM, '-') as bigint) as man_of_the_match,
+            Season as season
+        from player_stats_data
+    """),
+    'stg__player_demographics': (['player_demo_data'], """
+        select
+            "Player Names" as player_names,
+            Club as club,
+            Nationality as nationality,
+            try_cast(Age as bigint) as age,
+            Position as playing_position,
+            nullif("Prefered Foot", '-') as prefered_playing_foot,
+            try_cast(substring(Height, 1, 3) as bigint) as height,
+            substring(Height, 5, 2) as height_units,
+            try_cast(substring(Weight, 1, 2) as bigint) as weight,
+            substring(Weight, 4, 2) as weight_units,
+            "Previous Teams" as previous_teams,
+            DOB as date_of_birth,
+            Season as season
+        from player_demo_data
+    """),
+    'player_game_stats': (['player_stats_data'], """
+        select
+            player_names,
+            season,
+            sum(goals_scored) as goals_scored,
+            sum(assists_made) as assists_made,
+            sum(yellow_cards_received) as yellow_cards_received,
+            sum(red_cards_received) as red_cards_received
+        from stg__player_stats
+        group by player_names, season
+    """),
+    'epl_dataset': (['player_stats_data', 'player_demo_data'], """
+        select
+            demo.player_names,
+            demo.club,
+            demo.nationality,
+            demo.age,
+            demo.playing_position,
+            demo.prefered_playing_foot,
+            demo.height,
+            demo.weight,
+            demo.previous_teams,
+            demo.date_of_birth,
+            stats.season,
+            stats.goals_scored,
+            stats.assists_made,
+            stats.yellow_cards_received,
+            stats.red_cards_received
+        from stg__player_demographics as demo
+        left join player_game_stats as stats
+            on demo.player_names = stats.player_names
+    """)
+}
+
+
+def dataset_files(dataset_path: str) -> list:
+    """Parquet files of a local dataset, skipping
+    the hidden files of unfinished writes"""
+
+    files = []
+    for directory, _, names in os.walk(dataset_path):
+        files.extend(
+            os.path.join(directory, name) for name in names
+            if name.endswith('.parquet') and not name.startswith('.'))
+
+    return sorted(files)
+
+
+class LocalLake:
+    """DuckDB connection with the local datasets
+    registered as views and the dbt models as
+    views on top, their results cached on disk.
+    Datasets without files yet, and the models
+    reading them, are left out
+
+    Args:
+    -----
+    datasets : dict
+        Table name to local dataset directory
+    cache_dir : str
+        Directory of the materialized model results
+    """
+
+    def __init__(self, datasets: dict = None, cache_dir: str = CACHE_DIR):
+        self.datasets = datasets or DATASETS
+        self.cache_dir = cache_dir
+        self.connection = duckdb.connect()
+
+        self.missing = set()
+        for name, dataset_path in self.datasets.items():
+            if not dataset_files(dataset_path):
+                self.missing.add(name)
+                continue
+            # The files keep their season column, the
+            # directory names are not read back
+            self.connection.execute(
+                f'create view {name} as select * from read_parquet('
+                f"'{dataset_path}/*/*.parquet', hive_partitioning=0)"
+            )
+
+        for name, (datasets, model_sql) in MODELS.items():
+            if self.missing.isdisjoint(datasets):
+                self.connection.execute(
+                    f'create view {name} as {model_sql}')
+
+    def sql(self, query: str) -> pd.DataFrame:
+        """Run an ad hoc query over the datasets and
+        models
+
+        Args:
+        -----
+        query : str
+            DuckDB SQL
+
+        Returns:
+        --------
+            Pandas DataFrame
+        """
+
+        return self.connection.execute(query).df()
+
+    def _source_version(self, model: str) -> str:
+        """Hash of the model SQL and of the path, size
+        and modification time of every file it reads"""
+
+        datasets, model_sql = MODELS[model]
+        digest = hashlib.sha256(model_sql.encode('utf-8'))
+
+        for name in datasets:
+            for path in dataset_files(self.datasets[name]):
+                stat = os.stat(path)
+                file_key = f'{path}:{stat.st_size}:{stat.st_mtime_ns}'
+                digest.update(file_key.encode('utf-8'))
+
+        return digest.hexdigest()
+
+    def model(self, model: str, refresh: bool = False) -> pd.DataFrame:
+        """Result of a dbt model, from the cache
+        unless its datasets changed since it was
+        materialized
+
+        Args:
+        -----
+        model : str
+            Model name, a key of `MODELS`
+        refresh : bool
+            Materialize again even if cached
+
+        Returns:
+        --------
+            Pandas DataFrame
+
+        Raises:
+        -------
+            FileNotFoundError when a dataset the model
+            reads has no local files yet
+        """
+
+        missing = sorted(self.missing.intersection(MODELS[model][0]))
+        if missing:
+            raise FileNotFoundError(
+                f'{model} reads {", ".join(missing)}, not written yet')
+
+        version = self._source_version(model)
+        result_path = os.path.join(self.cache_dir, f'{model}.parquet')
+        version_path = os.path.join(self.cache_dir, f'{model}.json')
+
+        if not refresh and os.path.exists(version_path):
+            with open(version_path, encoding='utf-8') as version_file:
+                if json.load(version_file)['version'] == version:
+                    return pd.read_parquet(result_path)
+
+        result = self.connection.execute(f'select * from {model}').arrow()
+
+        # Drop the version before replacing the result, a crash
+        # in between leaves a result that is never read
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if os.path.exists(version_path):
+            os.remove(version_path)
+        temp_path = os.path.join(self.cache_dir, f'.{model}.parquet')
+        pq.write_table(result, temp_path, compression='zstd')
+        os.replace(temp_path, result_path)
+        with open(version_path, 'w', encoding='utf-8') as version_file:
+            json.dump({'version': version}, version_file)
+
+        return result.to_pandas()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Query the local EPL datasets')
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--model', choices=sorted(MODELS),
+                       help='dbt model to materialize')
+    group.add_argument('--sql', help='Ad hoc DuckDB query')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignore the cached model result')
+    args = parser.parse_args()
+
+    lake = LocalLake()
+    if args.model:
+        print(lake.model(args.model, args.refresh).to_string(max_rows=50))
+    else:
+        print(lake.sql(args.sql).to_string(max_rows=50))
@@ -0,0 +1,133 @@
+"""Copy the first, string typed versions of the player
+tables into the typed `_v2` tables Terraform creates.
+BigQuery cannot change a STRING column to a number in
+place, so the loaders write to the new tables and this
+backfills the rows loaded before"""
+
+import os
+import sys
+import argparse
+
+# The per-dataset loaders live with their scrapers
+SCRAPERS_DIR = os.path.join(os.path.dirname(__file__), 'epl_scrappers')
+sys.path.append(os.path.join(SCRAPERS_DIR, 'who_scored'))
+sys.path.append(os.path.join(SCRAPERS_DIR, 'football_critic'))
+
+import etl_gcs_to_bigquery as who_scored_load
+import el_gcs_to_bigquery as football_critic_load
+
+from common import column_schema
+from common.warehouse import KEY_COLUMN, NULL_TOKEN
+
+
+# Loader module, first table and the schema files of both versions
+DATASETS = {
+    'stats': (
+        who_scored_load, 'player_stats_data',
+        'player_stats_data_v1.json', 'player_stats_data.json'),
+    'demographics': (
+        football_critic_load, 'player_demo_data',
+        'player_data_football_critic_v1.json',
+        'player_data_football_critic.json')
+}
+
+
+def backfill_queries(dataset: str, source_table: str,
+                     target_table: str) -> tuple:
+    """Nulled values count and backfill queries
+    of one dataset
+
+    Args:
+    -----
+    dataset : str
+        Key of `DATASETS`
+    source_table : str
+        `dataset.table` of the first version
+    target_table : str
+        `dataset.table` of the typed version
+
+    Returns:
+    --------
+        Tuple of the count and the backfill SQL
+    """
+
+    module, _, source_schema, target_schema = DATASETS[dataset]
+    source_fields = column_schema.read_fields(source_schema)
+    target_fields = column_schema.read_fields(target_schema)
+
+    return (
+        column_schema.nulled_values_query(
+            source_table, source_fields, target_fields),
+        column_schema.backfill_query(
+            source_table, target_table, source_fields, target_fields,
+            module.KEY_COLUMNS, KEY_COLUMN, NULL_TOKEN)
+    )
+
+
+def backfill(dataset: str, target_table: str, client,
+             dry_run: bool = False) -> int:
+    """Count the values a backfill nulls, then copy
+    the first table's rows into the typed one
+
+    Args:
+    -----
+    dataset : str
+        Key of `DATASETS`
+    target_table : str
+        `dataset.table` of the typed version, e.g.
+        `epl_analytics_dwh.player_stats_data_v2`
+    client : google.cloud.bigquery.Client
+        e.g. the shared `clients.bigquery_client()`
+    dry_run : bool
+        Print the queries without running them
+
+    Returns:
+    --------
+        Rows copied
+    """
+
+    # The first table sits next to the typed one
+    source_table = '.'.join(
+        target_table.split('.')[:-1] + [DATASETS[dataset][1]])
+    count_sql, backfill_sql = backfill_queries(
+        dataset, source_table, target_table)
+
+    if dry_run:
+        print(f'{count_sql};\n\n{backfill_sql};')
+        return 0
+
+    nulled = dict(next(iter(client.query(count_sql).result())).items())
+    for column, count in nulled.items():
+        if count:
+            print(f'{source_table}.{column}: {count} values are not '
+                  'typed, copied as null')
+
+    job = client.query(backfill_sql)
+    job.result()
+    print(f'Copied {job.num_dml_affected_rows} rows from {source_table} '
+          f'to {target_table}')
+
+    return job.num_dml_affected_rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Backfill the typed player tables')
+    parser.add_argument('--datasets', nargs='+', choices=sorted(DATASETS),
+                        default=sorted(DATASETS))
+    parser.add_argument('--dry_run', action='store_true',
+                        help='Print the queries without running them')
+    args = parser.parse_args()
+
+    client = None
+    if not args.dry_run:
+        from common import clients
+
+        client = clients.bigquery_client(who_scored_load.project_id)
+
+    targets = {
+        'stats': who_scored_load.player_stats_table,
+        'demographics': football_critic_load.player_demo_table
+    }
+    for dataset in args.datasets:
+        backfill(dataset, targets[dataset], client, args.dry_run)
@@ -0,0 +1,136 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from prefect import flow
+
+# The per-dataset loaders live with their scrapers
+SCRAPERS_DIR = os.path.join(os.path.dirname(__file__), 'epl_scrappers')
+sys.path.append(os.path.join(SCRAPERS_DIR, 'who_scored'))
+sys.path.append(os.path.join(SCRAPERS_DIR, 'football_critic'))
+
+import etl_gcs_to_bigquery as who_scored_load
+import el_gcs_to_bigquery as football_critic_load
+
+from common import parquet_dataset
+from common.object_store import GcsObjectStore
+from common.warehouse import BigQueryLoader, LoadSnapshot
+
+
+# Loader module and BigQuery table of each dataset
+DATASETS = {
+    'stats': (who_scored_load, who_scored_load.player_stats_table),
+    'demographics': (
+        football_critic_load, football_critic_load.player_demo_table)
+}
+
+
+def load_job(dataset: str, season: str, source, loader,
+             snapshot: LoadSnapshot) -> dict:
+    """Load one dataset's season and time it"""
+
+    module, _ = DATASETS[dataset]
+    object_path = parquet_dataset.partition_path(
+        module.GCS_DATASET_PATH, season)
+
+    start = time.perf_counter()
+    report = module.load_object(object_path, source, loader, snapshot)
+    report['seconds'] = time.perf_counter() - start
+
+    return report
+
+
+@flow(name='GCS to BigQuery Seasons')
+def etl_batch(seasons: list, datasets: list = None, max_workers: int = 4,
+              local_dir: str = None, force: bool = False) -> dict:
+    """Load several seasons of the player datasets
+    in one process, a bounded number at a time,
+    with the bucket and credentials blocks loaded once
+
+    Args:
+    -----
+    seasons : list
+        EPL seasons, e.g. `['2021-2022', '2022-2023']`
+    datasets : list
+        Keys of `DATASETS`, all when None
+    max_workers : int
+        Seasons loaded concurrently
+    local_dir : str
+        Local directory standing in for the bucket
+    force : bool
+        Merge every row, even if unchanged
+
+    Returns:
+    --------
+        Dictionary of `(dataset, season)` to its load
+        report, with `seconds` or the `error` raised
+    """
+
+    datasets = datasets or list(DATASETS)
+
+    # Shared by every job, the clients are thread-safe
+    source = who_scored_load.get_object_source(local_dir)
+    loader = who_scored_load.get_warehouse_loader()
+    snapshots = {}
+    for dataset in datasets:
+        snapshots[dataset] = LoadSnapshot.for_table(
+            loader, DATASETS[dataset][1])
+        if force:
+            snapshots[dataset].clear()
+
+    reports = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(load_job, dataset, season, source, loader,
+                            snapshots[dataset]): (dataset, season)
+            for dataset in datasets for season in seasons
+        }
+        for future in as_completed(futures):
+            try:
+                reports[futures[future]] = future.result()
+            except Exception as error:
+                reports[futures[future]] = {'error': repr(error)}
+
+    print(f'Loaded {len(reports)} seasons in '
+          f'{time.perf_counter() - start:.1f} s:')
+    for (dataset, season), report in sorted(reports.items()):
+        if 'error' in report:
+            print(f'  {dataset:<12} {season}  failed: {report["error"]}')
+        else:
+            print(f'  {dataset:<12} {season}  {report["rows"]:>7} rows  '
+                  f'{report["bytes"]:>10} bytes  '
+                  f'{report["seconds"] * 1000:>8.1f} ms')
+    # The GCP clients are only built for the bucket and BigQuery
+    if isinstance(source, GcsObjectStore) or isinstance(
+            loader, BigQueryLoader):
+        from common import clients
+
+        clients.report()
+
+    failed = [job for job, report in reports.items() if 'error' in report]
+    if failed:
+        raise RuntimeError(f'{len(failed)} season loads failed: {failed}')
+
+    return reports
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Load seasons of the player datasets from GCS')
+    parser.add_argument('--seasons', nargs='+', required=True,
+                        help='EPL seasons, e.g. 2021-2022 2022-2023')
+    parser.add_argument('--datasets', nargs='+', choices=sorted(DATASETS),
+                        default=sorted(DATASETS))
+    parser.add_argument('--max_workers', type=int, default=4,
+                        help='Seasons loaded concurrently')
+    parser.add_argument('--local_dir', type=str, default=None,
+                        help='Read from a local copy of the bucket')
+    parser.add_argument('--force', action='store_true',
+                        help='Merge every row, even if unchanged')
+    args = parser.parse_args()
+
+    etl_batch(args.seasons, args.datasets, args.max_workers,
+              args.local_dir, args.force)
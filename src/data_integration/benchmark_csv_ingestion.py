@@ -0,0 +1,147 @@
+"""Benchmark parsing football-data season CSVs,
+the previous full pandas parse against the
+column-pruned, typed pyarrow parse"""
+
+import os
+import time
+import random
+import argparse
+import warnings
+import resource
+import tempfile
+import multiprocessing
+from datetime import date, timedelta
+
+import pandas as pd
+
+from etl_web_to_local import STATS_FIELDS, read_epl_csv
+
+
+TEAMS = [
+    'Arsenal', 'Aston Villa', 'Bournemouth', 'Brentford', 'Brighton',
+    'Chelsea', 'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Leicester',
+    'Liverpool', 'Man City', 'Man United', 'Newcastle', "Nott'm Forest",
+    'Southampton', 'Tottenham', 'West Ham', 'Wolves'
+]
+
+# Betting odds columns published next to the results
+ODDS_COLUMNS = [
+    f'{bookmaker}{market}'
+    for bookmaker in ['B365', 'BW', 'IW', 'PS', 'WH', 'VC', 'Max', 'Avg',
+                      'P', 'BF', '1XB', 'CL']
+    for market in ['H', 'D', 'A', '>2.5', '<2.5', 'AHH', 'AHA', 'CH', 'CD']
+]
+
+
+def legacy_read(path: str) -> pd.DataFrame:
+    """Previous ingestion: parse every column,
+    then select the fields and parse `Date`"""
+
+    epl_df = pd.read_csv(path)[STATS_FIELDS]
+    epl_df['Date'] = pd.to_datetime(epl_df['Date'], dayfirst=True)
+
+    return epl_df
+
+
+def write_season(path: str, season_start: int, two_digit_years: bool,
+                 rng: random.Random) -> None:
+    """Write a synthetic season CSV with the
+    football-data layout"""
+
+    header = ['Div', 'Date', 'Time', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG',
+              'FTR', 'HTHG', 'HTAG', 'HTR', 'Referee', 'HS', 'AS', 'HST',
+              'AST', 'HF', 'AF', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR']
+    header += ODDS_COLUMNS
+    date_format = '%d/%m/%y' if two_digit_years else '%d/%m/%Y'
+    first_day = date(season_start, 8, 10)
+
+    lines = [','.join(header)]
+    for match in range(380):
+        home, away = rng.sample(TEAMS, 2)
+        home_goals, away_goals = rng.randint(0, 5), rng.randint(0, 5)
+        half_home = rng.randint(0, home_goals)
+        half_away = rng.randint(0, away_goals)
+        match_day = first_day + timedelta(days=match // 10 * 7)
+
+        row = ['E0', match_day.strftime(date_format), '15:00', home, away,
+               home_goals, away_goals,
+               'H' if home_goals > away_goals else
+               'A' if away_goals > home_goals else 'D',
+               half_home, half_away,
+               'H' if half_home > half_away else
+               'A' if half_away > half_home else 'D',
+               'M Oliver']
+        row += [rng.randint(0, 25) for _ in range(12)]
+        row += [f'{rng.uniform(1.01, 15):.2f}' for _ in ODDS_COLUMNS]
+        lines.append(','.join(str(value) for value in row))
+
+    with open(path, 'w', encoding='utf-8') as season_file:
+        season_file.write('\n'.join(lines) + '\n')
+
+
+def _run(method: str, paths: list, repeat: int, results) -> None:
+    """Parse every season `repeat` times in a
+    fresh process, reporting time and peak RSS"""
+
+    read = legacy_read if method == 'legacy' else read_epl_csv
+    # The legacy `Date` parse warns that it falls back to dateutil
+    warnings.simplefilter('ignore', UserWarning)
+
+    # Warm up so one-off allocator and thread pool
+    # start-up is not counted as parsing memory
+    read(paths[0])
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        frames = [read(path) for path in paths]
+        rows = sum(len(frame) for frame in frames)
+        memory = sum(
+            frame.memory_usage(deep=True).sum() for frame in frames)
+        del frames
+    elapsed = (time.perf_counter() - start) / repeat
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    results.put((method, elapsed, peak, rows, memory))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark football-data CSV ingestion')
+    parser.add_argument('--csv_dir',
+                        help='Directory of real season CSVs, '
+                        'synthetic seasons are used otherwise')
+    parser.add_argument('--seasons', type=int, default=8,
+                        help='Number of synthetic seasons')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.csv_dir:
+            paths = sorted(
+                os.path.join(args.csv_dir, name)
+                for name in os.listdir(args.csv_dir) if name.endswith('.csv'))
+        else:
+            rng = random.Random(42)
+            paths = []
+            for season in range(args.seasons):
+                path = os.path.join(temp_dir, f'season_{season}.csv')
+                write_season(path, 2015 + season, season < 3, rng)
+                paths.append(path)
+
+        size = sum(os.path.getsize(path) for path in paths) / 1024 ** 2
+        print(f'{len(paths)} seasons, {size:.1f} MB of CSV')
+
+        results = multiprocessing.Queue()
+        for method in ['legacy', 'pyarrow']:
+            process = multiprocessing.Process(
+                target=_run, args=(method, paths, args.repeat, results))
+            process.start()
+            process.join()
+
+            method, elapsed, peak, rows, memory = results.get()
+            print(
+                f'{method:>8}: {elapsed * 1000:7.1f} ms, '
+                f'peak RSS +{peak / 1024:.1f} MB, {rows} rows, '
+                f'frames {memory / 1024:.0f} KB'
+            )
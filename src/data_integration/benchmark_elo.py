@@ -0,0 +1,98 @@
+"""Benchmark the Elo rating engine on a synthetic
+multi-decade fixture list: a full run, a matchday
+applied from checkpoints and rating-at-date lookups"""
+
+import time
+import random
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from analytics.elo import EloEngine
+
+
+def synthetic_fixtures(seasons: int, teams: int = 20,
+                       seed: int = 42) -> pd.DataFrame:
+    """Double round-robin seasons with ten
+    matches a week and random scores"""
+
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    names = [f'Team {team:02d}' for team in range(teams + 6)]
+
+    frames = []
+    for season in range(seasons):
+        start_year = 1970 + season
+        # A few clubs change every season, like promotion
+        league = rng.sample(names, teams)
+        fixtures = [(home, away) for home in league for away in league
+                    if home != away]
+        rng.shuffle(fixtures)
+
+        weeks = np.arange(len(fixtures)) // (teams // 2)
+        frames.append(pd.DataFrame({
+            'Season Year': f'{start_year}-{start_year + 1}',
+            'Date': (pd.Timestamp(f'{start_year}-08-10')
+                     + pd.to_timedelta(weeks * 7, unit='D')),
+            'HomeTeam': [home for home, _ in fixtures],
+            'AwayTeam': [away for _, away in fixtures],
+            'FTHG': np_rng.poisson(1.5, len(fixtures)),
+            'FTAG': np_rng.poisson(1.2, len(fixtures))
+        }))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Elo rating engine')
+    parser.add_argument('--seasons', type=int, default=50)
+    parser.add_argument('--lookups', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    fixtures = synthetic_fixtures(args.seasons)
+    last_day = fixtures['Date'] == fixtures['Date'].max()
+    history, matchday = fixtures[~last_day], fixtures[last_day]
+    print(f'{len(fixtures)} matches over {args.seasons} seasons')
+
+    # Full run over every season
+    engine = EloEngine()
+    _, seconds = timed(engine.update, fixtures)
+    print(f'Full run: {seconds * 1000:.1f} ms '
+          f'({len(fixtures) / seconds:,.0f} matches/s)')
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        _, seconds = timed(EloEngine(checkpoint_dir).update, history)
+        print(f'Full run with season checkpoints: {seconds * 1000:.1f} ms')
+
+        # Next matchday, from the checkpoints only
+        restored, restore_seconds = timed(EloEngine.restore, checkpoint_dir)
+        processed, seconds = timed(restored.update, matchday)
+        print(f'Restore: {restore_seconds * 1000:.1f} ms, '
+              f'matchday of {processed} matches: {seconds * 1000:.2f} ms')
+
+        assert np.allclose(
+            restored.ratings_at(engine.teams, [fixtures['Date'].max()]
+                                * len(engine.teams)),
+            engine.ratings_at(engine.teams, [fixtures['Date'].max()]
+                              * len(engine.teams)))
+
+    # Rating-at-date lookups through the precomputed index
+    rng = np.random.default_rng(0)
+    teams = rng.choice(engine.teams, args.lookups)
+    dates = rng.choice(fixtures['Date'].to_numpy(), args.lookups)
+
+    _, index_seconds = timed(engine.ratings_at, teams[:1], dates[:1])
+    _, seconds = timed(engine.ratings_at, teams, dates)
+    print(f'Index build: {index_seconds * 1000:.1f} ms, '
+          f'{args.lookups:,} lookups: {seconds * 1000:.1f} ms')
+
+    print(engine.table().head(5).to_string(index=False))
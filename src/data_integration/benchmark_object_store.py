@@ -0,0 +1,105 @@
+"""Benchmark object store transfers: one large object
+in a single stream against parallel parts, and season
+files one at a time against concurrently"""
+
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+import pyarrow as pa
+
+from common import object_store
+
+
+PREFIX = 'benchmark_object_store'
+
+
+def timed(function) -> float:
+    """Seconds `function` takes"""
+
+    start = time.perf_counter()
+    function()
+
+    return time.perf_counter() - start
+
+
+def random_buffer(size: int, seed: int = 42) -> pa.Buffer:
+    """Incompressible bytes, like an encoded season"""
+
+    rng = np.random.default_rng(seed)
+
+    return pa.py_buffer(rng.bytes(size))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark object store uploads and downloads')
+    parser.add_argument('--store', choices=['local', 'bucket'],
+                        default='local')
+    parser.add_argument('--large_mb', type=int, default=256)
+    parser.add_argument('--seasons', type=int, default=16)
+    parser.add_argument('--season_mb', type=int, default=4)
+    args = parser.parse_args()
+
+    temp_dir = tempfile.TemporaryDirectory()
+    store = (
+        object_store.LocalObjectStore(temp_dir.name)
+        if args.store == 'local' else object_store.bucket_store()
+    )
+
+    large = random_buffer(args.large_mb * 1024 * 1024)
+    large_path = f'{PREFIX}/large.bin'
+    threshold = object_store.MULTIPART_THRESHOLD
+
+    # A threshold above the object's size forces one stream
+    object_store.MULTIPART_THRESHOLD = large.size + 1
+    single_put = timed(lambda: store.put(large_path, large))
+    single_get = timed(lambda: store.get(large_path))
+    object_store.MULTIPART_THRESHOLD = threshold
+    parts = len(object_store._parts(large.size))
+    multi_put = timed(lambda: store.put(large_path, large))
+    multi_get = timed(lambda: store.get(large_path))
+    assert store.get(large_path) == large.to_pybytes()
+    store.delete(large_path)
+
+    print(f'{store.name}: {args.large_mb} MiB object, {parts} parts')
+    print(f'  upload   one stream {single_put * 1000:.1f} ms, '
+          f'parts {multi_put * 1000:.1f} ms '
+          f'({single_put / multi_put:.1f}x)')
+    print(f'  download one stream {single_get * 1000:.1f} ms, '
+          f'parts {multi_get * 1000:.1f} ms '
+          f'({single_get / multi_get:.1f}x)')
+
+    seasons = {
+        f'{PREFIX}/season={season}/part-0.parquet':
+            random_buffer(args.season_mb * 1024 * 1024, seed=season)
+        for season in range(args.seasons)
+    }
+
+    def put_each():
+        for path, buffer in seasons.items():
+            store.put(path, buffer)
+
+    def get_each():
+        for path in seasons:
+            store.get(path)
+
+    sequential_put = timed(put_each)
+    sequential_get = timed(get_each)
+    concurrent_put = timed(lambda: store.put_many(seasons))
+    concurrent_get = timed(lambda: store.get_many(list(seasons)))
+    for path in seasons:
+        store.delete(path)
+
+    print(f'{store.name}: {args.seasons} seasons of {args.season_mb} MiB')
+    print(f'  upload   one at a time {sequential_put * 1000:.1f} ms, '
+          f'concurrently {concurrent_put * 1000:.1f} ms '
+          f'({sequential_put / concurrent_put:.1f}x)')
+    print(f'  download one at a time {sequential_get * 1000:.1f} ms, '
+          f'concurrently {concurrent_get * 1000:.1f} ms '
+          f'({sequential_get / concurrent_get:.1f}x)')
+
+    temp_dir.cleanup()
+    assert not os.path.exists(temp_dir.name)
@@ -0,0 +1,72 @@
+"""Benchmark loading a synthetic season of player
+stats into the local DuckDB warehouse: 300-row
+chunks, like `to_gbq`, against one bulk load"""
+
+import time
+import argparse
+
+import numpy as np
+import pyarrow as pa
+
+from common import column_schema, parquet_dataset, warehouse
+
+
+def synthetic_stats(rows: int, seed: int = 42) -> pa.Table:
+    """Player stats shaped like the WhoScored
+    table, with `-` for missing records"""
+
+    rng = np.random.default_rng(seed)
+
+    def stat(high: int) -> list:
+        values = rng.integers(0, high, rows).astype(str)
+        values[rng.random(rows) < 0.3] = '-'
+        return values.tolist()
+
+    return column_schema.clean_and_cast(
+        pa.table({
+            'Player': [f'Player {player}' for player in range(rows)],
+            'Mins': stat(3420),
+            'Goals': stat(30),
+            'Assists': stat(20),
+            'Yel': stat(12),
+            'Red': stat(3),
+            'SpG': stat(5),
+            'PS%': stat(100),
+            'AerialsWon': stat(8),
+            'MotM': stat(10),
+            'Season': ['2022-2023'] * rows
+        }),
+        column_schema.read_schema('player_stats_data.json')
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark chunked and bulk warehouse loads')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--chunksize', type=int, default=300)
+    args = parser.parse_args()
+
+    table = synthetic_stats(args.rows)
+    print(f'{args.rows} rows, {table.nbytes} bytes in memory')
+
+    loader = warehouse.DuckDBLoader(':memory:')
+    start = time.perf_counter()
+    for offset in range(0, table.num_rows, args.chunksize):
+        chunk = table.slice(offset, args.chunksize)
+        buffer = parquet_dataset.encode_parquet(
+            chunk, codec=warehouse.LOAD_CODEC)
+        loader.load(buffer, 'epl.chunked')
+    chunked_seconds = time.perf_counter() - start
+    print(f'{-(-table.num_rows // args.chunksize)} loads of '
+          f'{args.chunksize} rows: {chunked_seconds * 1000:.1f} ms')
+
+    report = warehouse.load_season(table, 'epl.bulk', loader)
+    bulk_seconds = report['encode_seconds'] + report['load_seconds']
+    print(f'One bulk load: {bulk_seconds * 1000:.1f} ms '
+          f'({chunked_seconds / bulk_seconds:.1f}x faster)')
+
+    counts = loader.connection.execute(
+        'select (select count(*) from epl.chunked), '
+        '(select count(*) from epl.bulk)').fetchone()
+    assert counts == (table.num_rows, table.num_rows)
@@ -0,0 +1,314 @@
+""" Process-wide pools of warm browser sessions,
+leased to crawls instead of starting a browser each time """
+
+import os
+import queue
+import atexit
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium import webdriver
+from selenium.common import exceptions
+
+
+# Sessions are recycled after loading this many pages
+MAX_PAGES = 500
+
+# Sessions a pool keeps open at most
+MAX_SESSIONS = 8
+
+
+def driver_factory(driver_name: str = 'Chrome', headless: bool = None):
+    """Return a function that starts a browser
+
+    Args:
+    -----
+    driver_name : str
+        `Chrome` or `Firefox`
+    headless : bool
+        Run without a window, defaults to the
+        `HEADLESS` env variable, itself true by default
+
+    Returns:
+    --------
+        Callable returning a new WebDriver
+    """
+
+    if headless is None:
+        headless = os.getenv('HEADLESS', 'true').lower() != 'false'
+
+    def _start():
+        if driver_name == 'Chrome':
+            options = webdriver.ChromeOptions()
+            if headless:
+                options.add_argument('--headless=new')
+            return webdriver.Chrome(options=options)
+
+        options = webdriver.FirefoxOptions()
+        if headless:
+            options.add_argument('-headless')
+        return webdriver.Firefox(options=options)
+
+    return _start
+
+
+class PooledSession:
+    """A pooled browser session and the number
+    of pages it has loaded"""
+
+    __slots__ = ('driver', 'pages')
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+
+    def page_loaded(self, count: int = 1) -> None:
+        """Count pages loaded during the lease"""
+        self.pages += count
+
+
+class BrowserPool:
+    """Keep browser sessions open between leases,
+    prepared once (e.g. consent dialogs dismissed),
+    health-checked on lease and recycled after
+    `max_pages` pages to bound memory growth, on
+    release or mid-lease with `recycle_if_worn`
+
+    Args:
+    -----
+    factory : callable
+        Starts a new WebDriver
+    prepare : callable
+        Called once with each new WebDriver
+    max_sessions : int
+        Sessions leased at once at most
+    max_pages : int
+        Pages a session loads before it is recycled
+    """
+
+    def __init__(self, factory, prepare=None,
+                 max_sessions: int = MAX_SESSIONS,
+                 max_pages: int = MAX_PAGES):
+        self.factory = factory
+        self.prepare = prepare
+        self.max_sessions = max_sessions
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._lock = threading.Lock()
+        # Sessions started and not yet quit, leased or idle
+        self._open = 0
+        self.started = 0
+        self.leases = 0
+        self.recycled = 0
+
+    def _start_session(self) -> PooledSession:
+        driver = self.factory()
+        try:
+            if self.prepare is not None:
+                self.prepare(driver)
+        except Exception:
+            driver.quit()
+            raise
+
+        with self._lock:
+            self.started += 1
+
+        return PooledSession(driver)
+
+    def _open_session(self, limit: bool = False):
+        """Start a session counted as open, or with
+        `limit` return None when `max_sessions` are
+        already open"""
+
+        with self._lock:
+            if limit and self._open >= self.max_sessions:
+                return None
+            self._open += 1
+
+        try:
+            return self._start_session()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+            raise
+
+    @staticmethod
+    def _is_healthy(session: PooledSession) -> bool:
+        try:
+            session.driver.execute_script('return document.readyState')
+            return True
+        except exceptions.WebDriverException:
+            return False
+
+    def _quit(self, session: PooledSession) -> None:
+        with self._lock:
+            self._open -= 1
+
+        try:
+            session.driver.quit()
+        except exceptions.WebDriverException:
+            pass
+
+    @contextmanager
+    def lease(self):
+        """Lease a healthy session, reusing an idle
+        one when possible, and return it afterwards
+
+        Returns:
+        --------
+            PooledSession
+        """
+
+        self._slots.acquire()
+        session = None
+
+        try:
+            while session is None:
+                try:
+                    candidate = self._idle.get_nowait()
+                except queue.Empty:
+                    session = self._open_session()
+                    break
+
+                if self._is_healthy(candidate):
+                    session = candidate
+                else:
+                    self._quit(candidate)
+
+            with self._lock:
+                self.leases += 1
+
+            yield session
+
+        finally:
+            if session is not None:
+                if session.pages >= self.max_pages:
+                    self._quit(session)
+                    with self._lock:
+                        self.recycled += 1
+                else:
+                    self._idle.put(session)
+            self._slots.release()
+
+    def recycle_if_worn(self, session: PooledSession) -> bool:
+        """Restart the browser of a leased session
+        once it has loaded `max_pages` pages, for
+        leases held over a whole crawl. Call it
+        between pages, the new browser starts blank
+
+        Args:
+        -----
+        session : PooledSession
+            Session leased from this pool
+
+        Returns:
+        --------
+            True when the browser was restarted
+        """
+
+        if session.pages < self.max_pages:
+            return False
+
+        fresh = self._open_session()
+        self._quit(session)
+        session.driver, session.pages = fresh.driver, 0
+
+        with self._lock:
+            self.recycled += 1
+
+        return True
+
+    def _warm_session(self) -> None:
+        # Takes a lease slot while starting, and is
+        # skipped once `max_sessions` are open
+        with self._slots:
+            session = self._open_session(limit=True)
+            if session is not None:
+                self._idle.put(session)
+
+    def warm(self, count: int) -> None:
+        """Start and prepare up to `count` sessions
+        in parallel ahead of a crawl, with at most
+        `max_sessions` open in all. Raises the first
+        error a session failed to start with
+
+        Args:
+        -----
+        count : int
+            Number of idle sessions wanted
+
+        Returns:
+        --------
+            None
+        """
+
+        missing = min(count, self.max_sessions) - self._idle.qsize()
+        if missing <= 0:
+            return
+
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [
+                executor.submit(self._warm_session) for _ in range(missing)
+            ]
+
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        """Quit every idle session"""
+
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def report(self) -> None:
+        """Print how often sessions were reused"""
+
+        print(
+            f'Browser pool: {self.leases} leases served by '
+            f'{self.started} sessions, {self.recycled} recycled'
+        )
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, factory, prepare=None, **options) -> BrowserPool:
+    """Return the process-wide pool called `name`,
+    creating it on first use
+
+    Args:
+    -----
+    name : str
+        Pool name
+    factory : callable
+        Starts a new WebDriver
+    prepare : callable
+        Called once with each new WebDriver
+    options :
+        Passed on to BrowserPool
+
+    Returns:
+    --------
+        BrowserPool
+    """
+
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = BrowserPool(factory, prepare, **options)
+
+        return _pools[name]
+
+
+@atexit.register
+def close_pools() -> None:
+    """Quit the idle sessions of every pool"""
+
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
@@ -0,0 +1,162 @@
+""" Prefect cache keys that fingerprint DataFrame and
+Arrow arguments instead of pickling them whole """
+
+import os
+import hashlib
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from prefect.utilities.hashing import hash_objects
+
+
+# Rows hashed per block, bounds the memory of a fingerprint
+BLOCK_ROWS = 100_000
+
+# Default expiration of each kind of cached task, in hours
+CACHE_HOURS = {
+    'extract': 24,
+    'load': 1
+}
+
+
+def cache_expiration(kind: str) -> timedelta:
+    """Expiration of a kind of cached task, from the
+    `CACHE_HOURS_<KIND>` env variable when set
+
+    Args:
+    -----
+    kind : str
+        Kind of task, a key of `CACHE_HOURS`
+
+    Returns:
+    --------
+        timedelta
+    """
+
+    hours = os.getenv(f'CACHE_HOURS_{kind.upper()}', CACHE_HOURS[kind])
+
+    return timedelta(hours=float(hours))
+
+
+def _hash_values(block: pd.Series) -> memoryview:
+    """Bytes standing for a block of values: the
+    raw buffers of numbers and datetimes, row
+    hashes of anything else"""
+
+    if isinstance(block.dtype, np.dtype) and block.dtype.kind in 'biufmM':
+        return memoryview(
+            np.ascontiguousarray(block.to_numpy()).view(np.uint8))
+
+    if (pd.api.types.is_extension_array_dtype(block.dtype)
+            and block.dtype.kind in 'biuf'):
+        # Nullable numbers: the values buffer plus the null mask
+        values = block.to_numpy(
+            dtype=block.dtype.numpy_dtype, na_value=0)
+        return memoryview(np.concatenate([
+            values.view(np.uint8),
+            block.isna().to_numpy().view(np.uint8)
+        ]))
+
+    try:
+        hashes = pd.util.hash_pandas_object(block, index=False)
+    except TypeError:
+        # Unhashable cells such as lists
+        hashes = pd.util.hash_pandas_object(block.astype(str), index=False)
+
+    return memoryview(hashes.to_numpy())
+
+
+def _frame_fingerprint(data_frame: pd.DataFrame) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(data_frame.dtypes.items())).encode('utf-8'))
+    digest.update(str(len(data_frame)).encode('utf-8'))
+
+    # Hash each column block by block, vectorised
+    for _, column in data_frame.items():
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            digest.update(_hash_values(column.cat.categories.to_series()))
+            column = pd.Series(column.cat.codes)
+
+        for start in range(0, len(column), BLOCK_ROWS):
+            digest.update(_hash_values(column.iloc[start:start + BLOCK_ROWS]))
+
+    return digest.hexdigest()
+
+
+def _update_array(digest, array: pa.Array) -> None:
+    """Hash an array's buffers without copying. The
+    dictionary of a dictionary array is not one of
+    its buffers, it is hashed after the indices"""
+
+    if pa.types.is_dictionary(array.type):
+        _update_array(digest, array.indices)
+        _update_array(digest, array.dictionary)
+        return
+
+    digest.update(f'{array.offset}:{len(array)}'.encode('utf-8'))
+    for buffer in array.buffers():
+        if buffer is not None:
+            digest.update(memoryview(buffer))
+
+
+def _table_fingerprint(table: pa.Table) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(table.schema).encode('utf-8'))
+    digest.update(str(table.num_rows).encode('utf-8'))
+
+    # Chunk by chunk: the same rows chunked differently get
+    # another key, a cache miss but never a wrong hit
+    for column in table.columns:
+        for chunk in column.chunks:
+            _update_array(digest, chunk)
+
+    return digest.hexdigest()
+
+
+def fingerprint(value):
+    """Fingerprint a DataFrame or Arrow table from
+    its schema and the hashes of its columns, other
+    values are returned unchanged
+
+    Args:
+    -----
+    value : pd.DataFrame | pa.Table | Any
+        Task argument
+
+    Returns:
+    --------
+        Fingerprint string, or `value` itself
+    """
+
+    if isinstance(value, pd.DataFrame):
+        return f'frame:{_frame_fingerprint(value)}'
+    if isinstance(value, pa.Table):
+        return f'table:{_table_fingerprint(value)}'
+
+    return value
+
+
+def fingerprint_input_hash(context, arguments: dict):
+    """Prefect `cache_key_fn` like `task_input_hash`,
+    with DataFrame and Arrow arguments replaced by
+    their fingerprints
+
+    Args:
+    -----
+    context : TaskRunContext
+        Context of the task run
+    arguments : dict
+        Task arguments
+
+    Returns:
+    --------
+        Cache key
+    """
+
+    return hash_objects(
+        context.task.task_key,
+        context.task.fn.__code__.co_code.hex(),
+        {name: fingerprint(value) for name, value in arguments.items()}
+    )
@@ -0,0 +1,100 @@
+""" Append-only crawl checkpoints, so retries and
+reruns resume where the last attempt stopped """
+
+import os
+import json
+import hashlib
+import threading
+
+
+class CrawlCheckpoint:
+    """JSON Lines file of crawl progress records,
+    one record per completed page or profile
+
+    Args:
+    -----
+    path : str
+        Checkpoint file path
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_url(cls, checkpoint_dir: str, crawl_url: str):
+        """Checkpoint of the crawl starting at `crawl_url`
+
+        Args:
+        -----
+        checkpoint_dir : str
+            Directory holding checkpoint files
+        crawl_url : str
+            URL the crawl starts from
+
+        Returns:
+        --------
+            CrawlCheckpoint
+        """
+
+        url_hash = hashlib.sha1(crawl_url.encode('utf-8')).hexdigest()[:16]
+
+        return cls(os.path.join(checkpoint_dir, f'{url_hash}.jsonl'))
+
+    def load(self) -> list:
+        """Read the completed records, dropping a
+        last line cut short by a crash so later
+        appends start on a fresh line
+
+        Returns:
+        --------
+            List of records, in the order they were written
+        """
+
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        valid_bytes = 0
+        with self._lock, open(self.path, 'rb+') as checkpoint_file:
+            for line in checkpoint_file:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+                valid_bytes += len(line)
+
+            checkpoint_file.truncate(valid_bytes)
+
+        return records
+
+    def append(self, record: dict) -> None:
+        """Durably append a completed record
+
+        Args:
+        -----
+        record : dict
+            JSON serialisable progress record
+
+        Returns:
+        --------
+            None
+        """
+
+        line = json.dumps(record, default=str) + '\n'
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as checkpoint_file:
+                checkpoint_file.write(line)
+                checkpoint_file.flush()
+                os.fsync(checkpoint_file.fileno())
+
+    def clear(self) -> None:
+        """Remove the checkpoint once the crawl is complete"""
+
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
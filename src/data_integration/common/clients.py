@@ -0,0 +1,175 @@
+""" Process-wide registry of the Prefect blocks and the
+GCS and BigQuery clients built from them, created once
+and shared by every task over pooled connections """
+
+import atexit
+import threading
+
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import bigquery, storage
+from prefect_gcp import GcpCredentials
+from prefect_gcp.cloud_storage import GcsBucket
+from requests.adapters import HTTPAdapter
+
+
+BUCKET_BLOCK = 'epl-gcs-bucket'
+CREDENTIALS_BLOCK = 'epl-analytics-gcs-credentials'
+
+# Connections kept open per host, enough for concurrent task runs
+POOL_SIZE = 16
+
+
+_clients = {}
+_leases = {}
+_sessions = []
+# Reentrant, building a client may build the ones it needs
+_lock = threading.RLock()
+
+
+def get_client(name: str, factory):
+    """Return the process-wide client called `name`,
+    creating it on first use
+
+    Args:
+    -----
+    name : str
+        Client name
+    factory : callable
+        Builds the client
+
+    Returns:
+    --------
+        The shared client
+    """
+
+    with _lock:
+        if name not in _clients:
+            _clients[name] = factory()
+            _leases[name] = 0
+        _leases[name] += 1
+
+        return _clients[name]
+
+
+def _authorized_session(credentials) -> AuthorizedSession:
+    """Authenticated HTTP session keeping up to
+    `POOL_SIZE` connections open per host"""
+
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE,
+                          pool_maxsize=POOL_SIZE)
+    session.mount('https://', adapter)
+
+    with _lock:
+        _sessions.append(session)
+
+    return session
+
+
+def bucket_block() -> GcsBucket:
+    """The `epl-gcs-bucket` block"""
+
+    return get_client('bucket_block', lambda: GcsBucket.load(BUCKET_BLOCK))
+
+
+def credentials_block() -> GcpCredentials:
+    """The `epl-analytics-gcs-credentials` block"""
+
+    return get_client(
+        'credentials_block', lambda: GcpCredentials.load(CREDENTIALS_BLOCK))
+
+
+def storage_bucket() -> storage.Bucket:
+    """Bucket of the `epl-gcs-bucket` block, on one
+    pooled session with the block's credentials
+
+    Returns:
+    --------
+        google.cloud.storage.Bucket
+    """
+
+    def _build():
+        block = bucket_block()
+        credentials = (
+            block.gcp_credentials.get_credentials_from_service_account())
+        client = storage.Client(
+            project=block.gcp_credentials.project,
+            credentials=credentials,
+            _http=_authorized_session(credentials)
+        )
+        return client.bucket(block.bucket)
+
+    return get_client('storage_bucket', _build)
+
+
+def bucket_path(path: str) -> str:
+    """Object path of `path` within the block's
+    bucket folder
+
+    Args:
+    -----
+    path : str
+        Path relative to the bucket folder
+
+    Returns:
+    --------
+        Object path
+    """
+
+    folder = (bucket_block().bucket_folder or '').strip('/')
+
+    return '/'.join(filter(None, [folder, path]))
+
+
+def bigquery_client(project_id: str) -> bigquery.Client:
+    """BigQuery client of a project, on one pooled
+    session with the credentials block
+
+    Args:
+    -----
+    project_id : str
+        GCP project ID
+
+    Returns:
+    --------
+        google.cloud.bigquery.Client
+    """
+
+    def _build():
+        credentials = (
+            credentials_block().get_credentials_from_service_account())
+        return bigquery.Client(
+            project=project_id,
+            credentials=credentials,
+            _http=_authorized_session(credentials)
+        )
+
+    return get_client(f'bigquery_client:{project_id}', _build)
+
+
+def report() -> None:
+    """Print how often each client was reused and
+    how many requests each connection served"""
+
+    with _lock:
+        for name, leases in _leases.items():
+            print(f'{name}: built once, used {leases} times')
+
+        requests = connections = 0
+        for session in _sessions:
+            pools = session.get_adapter('https://').poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                requests += pool.num_requests
+                connections += pool.num_connections
+
+    print(f'{requests} requests over {connections} connections')
+
+
+@atexit.register
+def close_clients() -> None:
+    """Close the pooled connections"""
+
+    with _lock:
+        for session in _sessions:
+            session.close()
@@ -0,0 +1,283 @@
+""" Column schemas of the warehouse tables, read from
+the Terraform table definitions, the Arrow stage that
+cleans and types scraped columns to match, and the
+query backfilling a retyped table from its first
+version """
+
+import os
+import re
+import json
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Table schemas Terraform creates the BigQuery tables from
+SCHEMA_DIR = os.path.join(
+    os.path.dirname(__file__), '..', '..', '..',
+    'infrastructure', 'terraform', 'resources', 'schema')
+
+# Arrow type loaded into each BigQuery column type
+BIGQUERY_TYPES = {
+    'STRING': pa.string(),
+    'INTEGER': pa.int64(),
+    'INT64': pa.int64(),
+    'FLOAT': pa.float64(),
+    'FLOAT64': pa.float64(),
+    'BOOLEAN': pa.bool_(),
+    'BOOL': pa.bool_(),
+    'DATE': pa.date32(),
+    'TIMESTAMP': pa.timestamp('us', tz='UTC')
+}
+
+# BigQuery SQL name of each column type
+SQL_TYPES = {
+    'INTEGER': 'INT64',
+    'FLOAT': 'FLOAT64',
+    'BOOLEAN': 'BOOL'
+}
+
+# Scraped values standing for no record in typed columns
+NULL_VALUES = ['-', '']
+
+
+def column_name(raw_name: str) -> str:
+    """BigQuery column name of a scraped column,
+    e.g. `PS%` to `PS_` and `Player Names` to
+    `Player_Names`"""
+
+    return re.sub(r'[^0-9A-Za-z_]', '_', raw_name)
+
+
+def read_fields(file_name: str) -> dict:
+    """Column names and BigQuery types of a table
+    from its Terraform JSON schema
+
+    Args:
+    -----
+    file_name : str
+        File in `SCHEMA_DIR`, e.g. `player_stats_data.json`
+
+    Returns:
+    --------
+        Dictionary of column name to type, e.g. `INTEGER`
+    """
+
+    with open(os.path.join(SCHEMA_DIR, file_name),
+              encoding='utf-8') as schema_file:
+        fields = json.load(schema_file)
+
+    return {field['name']: field['type'].upper() for field in fields}
+
+
+def read_schema(file_name: str) -> pa.Schema:
+    """Arrow schema of a table from its Terraform
+    JSON schema
+
+    Args:
+    -----
+    file_name : str
+        File in `SCHEMA_DIR`, e.g. `player_stats_data.json`
+
+    Returns:
+    --------
+        pa.Schema
+    """
+
+    return pa.schema([
+        (name, BIGQUERY_TYPES[column_type])
+        for name, column_type in read_fields(file_name).items()
+    ])
+
+
+def safe_cast(values, target: pa.DataType):
+    """Cast scraped strings to a type, values that
+    do not parse become null instead of failing the
+    whole load. Each distinct value is only tried
+    once, on the rare columns that need it
+
+    Args:
+    -----
+    values : pa.ChunkedArray
+        Column values
+    target : pa.DataType
+        Type to cast to
+
+    Returns:
+    --------
+        Tuple of the cast values and how many were nulled
+    """
+
+    try:
+        return pc.cast(values, target), 0
+    except pa.ArrowInvalid:
+        # Only scraped text is expected to hold bad values
+        if not pa.types.is_string(values.type):
+            raise
+
+    distinct = pc.unique(values)
+    cast_values = []
+    for value in distinct:
+        try:
+            cast_values.append(pc.cast(value, target))
+        except pa.ArrowInvalid:
+            cast_values.append(pa.scalar(None, target))
+    cast_distinct = pa.array(
+        [value.as_py() for value in cast_values], target)
+
+    cast = pc.take(cast_distinct, pc.index_in(values, distinct))
+
+    return cast, cast.null_count - values.null_count
+
+
+def clean_and_cast(table: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Rename scraped columns to their BigQuery names
+    and cast them to the schema's types, nulling
+    `NULL_VALUES` in typed columns first. Each column
+    is cleaned and cast in one pass; columns missing
+    from the schema are kept as they are. Values that
+    do not parse are loaded as null and counted
+
+    Args:
+    -----
+    table : pa.Table
+        Scraped rows
+    schema : pa.Schema
+        From `read_schema`
+
+    Returns:
+    --------
+        pa.Table
+    """
+
+    names, columns = [], []
+    for raw_name, values in zip(table.column_names, table.columns):
+        name = column_name(raw_name)
+        target = (
+            schema.field(name).type
+            if schema.get_field_index(name) != -1 else values.type
+        )
+
+        if values.type != target:
+            if pa.types.is_string(values.type):
+                values = pc.if_else(
+                    pc.is_in(values, pa.array(NULL_VALUES)),
+                    pa.scalar(None, values.type),
+                    values
+                )
+            values, nulled = safe_cast(values, target)
+            if nulled:
+                print(f'{name}: {nulled} values are not {target}, '
+                      'loaded as null')
+
+        names.append(name)
+        columns.append(values)
+
+    return pa.table(columns, names=names)
+
+
+def _sql_type(column_type: str) -> str:
+    return SQL_TYPES.get(column_type, column_type)
+
+
+def _key_value(name: str, fields: dict) -> str:
+    if fields[name] == 'TIMESTAMP':
+        return f'date({name})'
+
+    return name
+
+
+def nulled_values_query(source_table: str, source_fields: dict,
+                        target_fields: dict) -> str:
+    """Query counting, per retyped column, the values
+    of a table a backfill would load as null
+
+    Args:
+    -----
+    source_table : str
+        `dataset.table` of the first version
+    source_fields : dict
+        Its columns, from `read_fields`
+    target_fields : dict
+        Columns of the retyped table
+
+    Returns:
+    --------
+        SQL returning one count per retyped column
+    """
+
+    counts = ',\n    '.join(
+        f'countif({name} is not null and safe_cast({name} as '
+        f'{_sql_type(column_type)}) is null) as {name}'
+        for name, column_type in target_fields.items()
+        if source_fields.get(name, column_type) != column_type
+    )
+
+    return f'select\n    {counts}\nfrom `{source_table}`'
+
+
+def backfill_query(source_table: str, target_table: str,
+                   source_fields: dict, target_fields: dict,
+                   key_columns: list, key: str, null_token: str) -> str:
+    """Query copying a table's first version into its
+    retyped one: values cast with `safe_cast`, bad
+    ones null, the row key built as the loaders do
+    and only the last updated row of each key kept.
+    Keys already in the target table are left as
+    they are, a rerun copies nothing twice
+
+    Args:
+    -----
+    source_table : str
+        `dataset.table` of the first version
+    target_table : str
+        `dataset.table` of the retyped version
+    source_fields : dict
+        Columns of the first version, from `read_fields`
+    target_fields : dict
+        Columns of the retyped version
+    key_columns : list
+        Columns identifying a row
+    key : str
+        Row key column, e.g. `RowKey`
+    null_token : str
+        Stands for nulls in keys
+
+    Returns:
+    --------
+        SQL of the backfill
+    """
+
+    typed = ',\n        '.join(
+        name if source_fields[name] == column_type
+        else f'safe_cast({name} as {_sql_type(column_type)}) as {name}'
+        for name, column_type in target_fields.items()
+        if name in source_fields
+    )
+    # dbt_utils.generate_surrogate_key, as `warehouse.add_row_hashes`,
+    # which keys timestamps as their ISO date
+    key_parts = ", '-', ".join(
+        f"coalesce(cast({_key_value(name, target_fields)} as string), "
+        f"'{null_token}')"
+        for name in key_columns
+    )
+    columns = ', '.join(
+        name for name in target_fields
+        if name in source_fields or name == key)
+
+    return (
+        f'insert into `{target_table}` ({columns})\n'
+        'with typed as (\n'
+        f'    select\n        {typed}\n'
+        f'    from `{source_table}`\n'
+        ')\n'
+        f'select {columns}\n'
+        'from (\n'
+        f'    select *, to_hex(md5(concat({key_parts}))) as {key}\n'
+        '    from typed\n'
+        ')\n'
+        f'where {key} not in (\n'
+        f'    select {key} from `{target_table}` where {key} is not null)\n'
+        f'qualify row_number() over (\n'
+        f'    partition by {key} order by UpdatedAt desc) = 1'
+    )
@@ -0,0 +1,173 @@
+""" Concurrent downloads that skip files unchanged
+since the last run, using ETag and Last-Modified """
+
+import os
+import json
+import asyncio
+import tempfile
+import threading
+
+import httpx
+
+
+class ValidatorStore:
+    """JSON file of the `ETag` and `Last-Modified`
+    validators of each downloaded URL
+
+    Args:
+    -----
+    path : str
+        Validator file path
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+
+        with open(self.path, encoding='utf-8') as validator_file:
+            return json.load(validator_file)
+
+    def get(self, url: str) -> dict:
+        """Return the validators stored for a URL
+
+        Args:
+        -----
+        url : str
+            File URL
+
+        Returns:
+        --------
+            Dictionary with `etag` and `last_modified`
+        """
+
+        with self._lock:
+            return self._read().get(url, {})
+
+    def set(self, url: str, validators: dict) -> None:
+        """Store the validators of a processed URL
+
+        Args:
+        -----
+        url : str
+            File URL
+        validators : dict
+            Dictionary with `etag` and `last_modified`
+
+        Returns:
+        --------
+            None
+        """
+
+        with self._lock:
+            stored = self._read()
+            stored[url] = validators
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            # Write then rename, a crash never leaves a partial file
+            handle, temp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(handle, 'w', encoding='utf-8') as validator_file:
+                json.dump(stored, validator_file, indent=2)
+            os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        """Forget every stored validator"""
+
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class Download:
+    """Body and validators of a changed file"""
+
+    __slots__ = ('url', 'content', 'validators')
+
+    def __init__(self, url: str, content: bytes, validators: dict):
+        self.url = url
+        self.content = content
+        self.validators = validators
+
+
+def _conditional_headers(validators: dict) -> dict:
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    return headers
+
+
+async def _download(client: httpx.AsyncClient, url: str,
+                    validators: dict):
+    response = await client.get(url, headers=_conditional_headers(validators))
+
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        return None
+
+    response.raise_for_status()
+
+    return Download(url, response.content, {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified')
+    })
+
+
+async def _download_all(urls: list, store: ValidatorStore,
+                        max_connections: int, timeout: float,
+                        transport) -> list:
+    async with httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=True,
+        transport=transport,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+    ) as client:
+        return await asyncio.gather(
+            *(_download(client, url, store.get(url)) for url in urls))
+
+
+def download_changed(urls: list, store: ValidatorStore,
+                     max_connections: int = 8, timeout: float = 30.0,
+                     transport=None) -> dict:
+    """Download every URL concurrently over pooled
+    connections, sending the stored validators so
+    the server answers `304` for unchanged files
+
+    The new validators are not stored here, call
+    `store.set` once a download has been processed
+    so a failed run downloads it again
+
+    Args:
+    -----
+    urls : list
+        File URLs
+    store : ValidatorStore
+        Validators of earlier downloads
+    max_connections : int
+        Size of the connection pool
+    timeout : float
+        Request timeout in seconds
+    transport : httpx.AsyncBaseTransport
+        Transport stand-in for tests, e.g.
+        `httpx.MockTransport`
+
+    Returns:
+    --------
+        Dictionary of URL to Download, changed files only
+    """
+
+    downloads = asyncio.run(_download_all(
+        urls, store, max_connections, timeout, transport))
+
+    return {
+        download.url: download
+        for download in downloads if download is not None
+    }
@@ -0,0 +1,175 @@
+""" Browserless page fetching over pooled HTTP connections """
+
+import re
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import httpx
+
+
+# Browser-like headers, some pages refuse unknown clients
+DEFAULT_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 '
+        '(KHTML, like Gecko) Chrome/115.0 Safari/537.36'
+    ),
+    'Accept': 'text/html,application/xhtml+xml',
+    'Accept-Language': 'en-GB,en;q=0.9'
+}
+
+
+class JavaScriptRequired(Exception):
+    """Raised when a fetched page lacks content
+    that is only rendered by JavaScript"""
+
+
+class HttpFetcher:
+    """Fetch pages over a pool of keep-alive HTTP
+    connections, safe to share between threads
+
+    Args:
+    -----
+    max_connections : int
+        Size of the connection pool
+    timeout : float
+        Request timeout in seconds
+    """
+
+    def __init__(self, max_connections: int = 8, timeout: float = 30.0):
+        self.client = httpx.Client(
+            headers=DEFAULT_HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            )
+        )
+
+    def fetch(self, url: str) -> str:
+        """Fetch a page and return its HTML
+
+        Args:
+        -----
+        url : str
+            Page URL
+
+        Returns:
+        --------
+            Page HTML
+        """
+
+        response = self.client.get(url)
+        response.raise_for_status()
+
+        return response.text
+
+    def close(self) -> None:
+        """Close pooled connections"""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def fixture_name(url: str) -> str:
+    """Build the fixture file name for a URL
+
+    Args:
+    -----
+    url : str
+        Page URL
+
+    Returns:
+    --------
+        File name of the saved page
+    """
+
+    parts = urlsplit(url)
+    name = re.sub(r'[^A-Za-z0-9]+', '_',
+                  f'{parts.netloc}{parts.path}?{parts.query}')
+
+    return f"{name.strip('_')}.html"
+
+
+class FixtureFetcher:
+    """Serve saved HTML pages in place of live
+    ones, so parsing can run offline
+
+    Args:
+    -----
+    fixture_dir : str
+        Directory with pages saved by `save`
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.fixture_dir = Path(fixture_dir)
+
+    def fetch(self, url: str) -> str:
+        """Return the saved HTML for a URL
+
+        Args:
+        -----
+        url : str
+            Page URL
+
+        Returns:
+        --------
+            Page HTML
+        """
+
+        return (self.fixture_dir / fixture_name(url)).read_text(
+            encoding='utf-8')
+
+    def save(self, url: str, html: str) -> None:
+        """Save a page as a fixture
+
+        Args:
+        -----
+        url : str
+            Page URL
+        html : str
+            Page HTML
+
+        Returns:
+        --------
+            None
+        """
+
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        (self.fixture_dir / fixture_name(url)).write_text(
+            html, encoding='utf-8')
+
+    def close(self) -> None:
+        """Nothing to release for fixtures"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_fetcher(fixture_dir: str = None, max_connections: int = 8):
+    """Return a fixture fetcher when `fixture_dir`
+    is given, otherwise a pooled HTTP fetcher
+
+    Args:
+    -----
+    fixture_dir : str
+        Directory with saved HTML pages
+    max_connections : int
+        Size of the HTTP connection pool
+
+    Returns:
+    --------
+        HttpFetcher | FixtureFetcher
+    """
+
+    if fixture_dir:
+        return FixtureFetcher(fixture_dir)
+
+    return HttpFetcher(max_connections=max_connections)
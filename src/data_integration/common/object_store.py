@@ -0,0 +1,313 @@
+""" Object stores the pipelines read and write season
+files through: a GCS bucket, or a local directory with
+the same semantics for offline runs and benchmarks """
+
+import os
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow as pa
+
+
+# Objects from this size are transferred in parallel parts
+MULTIPART_THRESHOLD = 32 * 1024 * 1024
+
+# Smallest part, GCS composes at most `MAX_PARTS` of them
+PART_SIZE = 8 * 1024 * 1024
+MAX_PARTS = 32
+
+# Parts or objects transferred at once
+MAX_WORKERS = 8
+
+# Bytes fetched per ranged request when streaming an object
+READ_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Backend of `bucket_store`, `gcs` unless set to `local`
+object_store_backend = os.getenv('OBJECT_STORE', 'gcs')
+local_bucket_dir = os.getenv(
+    'LOCAL_BUCKET_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Bucket'))
+
+
+def _parts(size: int) -> list:
+    """`(offset, length)` of the parts of an object"""
+
+    part_size = max(PART_SIZE, -(-size // MAX_PARTS))
+
+    return [
+        (offset, min(part_size, size - offset))
+        for offset in range(0, size, part_size)
+    ]
+
+
+def _each(function, items: list, max_workers: int) -> list:
+    """Apply `function` to every item on a thread pool"""
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(function, items))
+
+
+class ObjectStore(ABC):
+    """Objects addressed by path, written whole and
+    only visible once complete. Large objects are
+    transferred in parallel parts, batches of objects
+    concurrently"""
+
+    name = None
+
+    @abstractmethod
+    def put(self, path: str, buffer: pa.Buffer) -> None:
+        """Write an object, replacing it if it exists
+
+        Args:
+        -----
+        path : str
+            Object path
+        buffer : pa.Buffer
+            Object content
+
+        Returns:
+        --------
+            None
+        """
+
+    @abstractmethod
+    def get(self, path: str) -> bytes:
+        """Read a whole object
+
+        Args:
+        -----
+        path : str
+            Object path
+
+        Returns:
+        --------
+            Object content
+        """
+
+    @abstractmethod
+    def open(self, path: str):
+        """Open an object for reading
+
+        Args:
+        -----
+        path : str
+            Object path
+
+        Returns:
+        --------
+            Seekable binary file-like object
+        """
+
+    @abstractmethod
+    def exists(self, path: str) -> bool:
+        """Whether an object exists"""
+
+    @abstractmethod
+    def delete(self, path: str) -> None:
+        """Delete an object"""
+
+    def put_many(self, objects: dict, max_workers: int = MAX_WORKERS) -> None:
+        """Write several objects concurrently
+
+        Args:
+        -----
+        objects : dict
+            Object path to pa.Buffer
+        max_workers : int
+            Objects written at once
+
+        Returns:
+        --------
+            None
+        """
+
+        _each(lambda item: self.put(*item), list(objects.items()),
+              max_workers)
+
+    def get_many(self, paths: list, max_workers: int = MAX_WORKERS) -> dict:
+        """Read several objects concurrently
+
+        Args:
+        -----
+        paths : list
+            Object paths
+        max_workers : int
+            Objects read at once
+
+        Returns:
+        --------
+            Dictionary of object path to content
+        """
+
+        return dict(zip(paths, _each(self.get, list(paths), max_workers)))
+
+
+class GcsObjectStore(ObjectStore):
+    """Objects of a GCS bucket. Large objects are
+    uploaded as parts composed into the object, and
+    downloaded as byte ranges in parallel
+
+    Args:
+    -----
+    bucket : google.cloud.storage.Bucket
+        e.g. the shared `clients.storage_bucket()`
+    folder : str
+        Folder object paths are relative to
+    """
+
+    name = 'gcs'
+
+    def __init__(self, bucket, folder: str = ''):
+        self.bucket = bucket
+        self.folder = (folder or '').strip('/')
+
+    def _blob_name(self, path: str) -> str:
+        return '/'.join(filter(None, [self.folder, path]))
+
+    def put(self, path: str, buffer: pa.Buffer) -> None:
+        blob = self.bucket.blob(self._blob_name(path))
+        if buffer.size < MULTIPART_THRESHOLD:
+            blob.upload_from_file(pa.BufferReader(buffer), size=buffer.size)
+            return
+
+        upload_id = uuid.uuid4().hex[:8]
+        parts = [
+            (self.bucket.blob(f'{blob.name}.{upload_id}.part-{index:02d}'),
+             offset, length)
+            for index, (offset, length) in enumerate(_parts(buffer.size))
+        ]
+
+        def _upload(part):
+            part_blob, offset, length = part
+            part_blob.upload_from_file(
+                pa.BufferReader(buffer.slice(offset, length)), size=length)
+
+        try:
+            _each(_upload, parts, MAX_WORKERS)
+            blob.compose([part_blob for part_blob, _, _ in parts])
+        finally:
+            for part_blob, _, _ in parts:
+                if part_blob.exists():
+                    part_blob.delete()
+
+    def get(self, path: str) -> bytes:
+        blob = self.bucket.get_blob(self._blob_name(path))
+        if blob is None:
+            raise FileNotFoundError(path)
+        if blob.size < MULTIPART_THRESHOLD:
+            return blob.download_as_bytes()
+
+        # Ranges are inclusive of their end
+        chunks = _each(
+            lambda part: blob.download_as_bytes(
+                start=part[0], end=part[0] + part[1] - 1),
+            _parts(blob.size), MAX_WORKERS)
+
+        return b''.join(chunks)
+
+    def open(self, path: str):
+        # Fetches byte ranges on demand
+        return self.bucket.blob(self._blob_name(path)).open(
+            'rb', chunk_size=READ_CHUNK_SIZE)
+
+    def exists(self, path: str) -> bool:
+        return self.bucket.blob(self._blob_name(path)).exists()
+
+    def delete(self, path: str) -> None:
+        self.bucket.blob(self._blob_name(path)).delete()
+
+
+class LocalObjectStore(ObjectStore):
+    """Objects as files under a local directory,
+    with the semantics of `GcsObjectStore`: large
+    objects written with parallel `pwrite` to a
+    hidden file renamed once complete, and read
+    with parallel `pread`
+
+    Args:
+    -----
+    root : str
+        Directory standing for the bucket
+    """
+
+    name = 'local'
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _file_path(self, path: str) -> str:
+        return os.path.join(self.root, path)
+
+    def put(self, path: str, buffer: pa.Buffer) -> None:
+        file_path = self._file_path(path)
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Hidden until renamed, dataset readers skip it
+        temp_path = os.path.join(
+            directory,
+            f'.{os.path.basename(file_path)}.{uuid.uuid4().hex[:8]}.tmp')
+        handle = os.open(
+            temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(buffer)
+            if buffer.size < MULTIPART_THRESHOLD:
+                os.write(handle, view)
+            else:
+                _each(
+                    lambda part: os.pwrite(
+                        handle, view[part[0]:part[0] + part[1]], part[0]),
+                    _parts(buffer.size), MAX_WORKERS)
+        except BaseException:
+            os.close(handle)
+            os.remove(temp_path)
+            raise
+        os.close(handle)
+        os.replace(temp_path, file_path)
+
+    def get(self, path: str) -> bytes:
+        file_path = self._file_path(path)
+        size = os.path.getsize(file_path)
+
+        with open(file_path, 'rb') as object_file:
+            if size < MULTIPART_THRESHOLD:
+                return object_file.read()
+
+            handle = object_file.fileno()
+            chunks = _each(
+                lambda part: os.pread(handle, part[1], part[0]),
+                _parts(size), MAX_WORKERS)
+
+        return b''.join(chunks)
+
+    def open(self, path: str):
+        # Memory-mapped, pages are read on demand
+        return pa.memory_map(self._file_path(path))
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(self._file_path(path))
+
+    def delete(self, path: str) -> None:
+        os.remove(self._file_path(path))
+
+
+def bucket_store():
+    """Store standing for the `epl-gcs-bucket` bucket:
+    the bucket itself, or `LOCAL_BUCKET_DIR` when the
+    `OBJECT_STORE` env variable is `local`
+
+    Returns:
+    --------
+        ObjectStore
+    """
+
+    if object_store_backend == 'local':
+        return LocalObjectStore(local_bucket_dir)
+
+    # Imported here, the local store runs without GCP libraries
+    from common import clients
+
+    return GcsObjectStore(
+        clients.storage_bucket(), clients.bucket_block().bucket_folder)
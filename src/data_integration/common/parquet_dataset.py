@@ -0,0 +1,160 @@
+""" Season-partitioned Parquet datasets, written with
+tuned codecs and row groups and read with partition
+and predicate pushdown """
+
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+
+# Hive partition key of every dataset
+PARTITION_COLUMN = 'season'
+
+# Each season partition is written as a single file
+PART_FILE_NAME = 'part-0.parquet'
+
+CODECS = ('zstd', 'snappy', 'gzip')
+
+# Codec used unless one is passed, zstd decodes far faster than gzip
+default_codec = os.getenv('PARQUET_CODEC', 'zstd')
+
+# Rows per row group. A season of matches or players fits
+# in one group, multi-season files keep per-season stats
+ROW_GROUP_SIZE = 50_000
+
+
+def partition_path(dataset_path: str, season: str) -> str:
+    """Path of a season's file within a dataset
+
+    Args:
+    -----
+    dataset_path : str
+        Dataset root, local directory or object prefix
+    season : str
+        EPL season
+
+    Returns:
+    --------
+        `<dataset_path>/season=<season>/part-0.parquet`
+    """
+
+    return '/'.join([
+        dataset_path.rstrip('/'),
+        f'{PARTITION_COLUMN}={season}',
+        PART_FILE_NAME
+    ])
+
+
+def write_parquet(data_frame: pd.DataFrame, sink, codec: str = None,
+                  row_group_size: int = ROW_GROUP_SIZE,
+                  dictionary_columns: list = None) -> None:
+    """Write a DataFrame as Parquet with column
+    statistics, dictionary encoding only for the
+    given low-cardinality columns
+
+    Args:
+    -----
+    data_frame : pd.DataFrame | pa.Table
+        Data to write
+    sink : str | file-like
+        File path or writable buffer
+    codec : str
+        One of `CODECS`, defaults to the
+        `PARQUET_CODEC` env variable, itself zstd
+    row_group_size : int
+        Maximum rows per row group
+    dictionary_columns : list
+        Columns to dictionary encode, e.g. teams and clubs
+
+    Returns:
+    --------
+        None
+    """
+
+    codec = codec or default_codec
+    if codec not in CODECS:
+        raise ValueError(f'Unknown codec {codec}, expected one of {CODECS}')
+
+    table = data_frame
+    if isinstance(data_frame, pd.DataFrame):
+        table = pa.Table.from_pandas(data_frame, preserve_index=False)
+    dictionary_columns = [
+        column for column in dictionary_columns or []
+        if column in table.column_names
+    ]
+
+    pq.write_table(
+        table,
+        sink,
+        compression=codec,
+        row_group_size=row_group_size,
+        use_dictionary=dictionary_columns,
+        write_statistics=True
+    )
+
+
+def encode_parquet(data_frame: pd.DataFrame, **options) -> pa.Buffer:
+    """Encode a DataFrame to Parquet in memory,
+    once, for every destination to share
+
+    Args:
+    -----
+    data_frame : pd.DataFrame | pa.Table
+        Data to encode
+    options :
+        Passed on to `write_parquet`
+
+    Returns:
+    --------
+        Arrow buffer with the Parquet file content
+    """
+
+    sink = pa.BufferOutputStream()
+    write_parquet(data_frame, sink, **options)
+
+    return sink.getvalue()
+
+
+def read_dataset(dataset_path: str, seasons: list = None,
+                 columns: list = None, filter=None,
+                 filesystem=None) -> pd.DataFrame:
+    """Read a season-partitioned dataset, opening
+    only the requested seasons' files and skipping
+    row groups whose statistics rule out `filter`
+
+    Args:
+    -----
+    dataset_path : str
+        Dataset root
+    seasons : list
+        Seasons to read, all when None
+    columns : list
+        Columns to read, all when None
+    filter : pyarrow.dataset.Expression
+        Row predicate, e.g.
+        `ds.field('HomeTeam') == 'Arsenal'`
+    filesystem : pyarrow.fs.FileSystem
+        Filesystem of the dataset, e.g. `GcsFileSystem`,
+        local when None
+
+    Returns:
+    --------
+        Pandas DataFrame with a `season` column
+    """
+
+    dataset = ds.dataset(
+        dataset_path,
+        format='parquet',
+        partitioning=ds.partitioning(
+            pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive'),
+        filesystem=filesystem
+    )
+
+    if seasons is not None:
+        season_filter = ds.field(PARTITION_COLUMN).isin(list(seasons))
+        filter = season_filter if filter is None else season_filter & filter
+
+    return dataset.to_table(columns=columns, filter=filter).to_pandas()
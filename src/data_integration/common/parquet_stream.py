@@ -0,0 +1,35 @@
+""" Stream Parquet objects into Arrow record batches
+of bounded size, straight from an object store """
+
+import pyarrow.parquet as pq
+
+
+# Rows per record batch handed to the clean and load stages
+BATCH_ROWS = 10_000
+
+
+def iter_batches(store, object_path: str, batch_size: int = BATCH_ROWS,
+                 columns: list = None):
+    """Read a Parquet object `batch_size` rows at a
+    time, only one batch is decoded at once
+
+    Args:
+    -----
+    store : ObjectStore
+        Where the object is read from
+    object_path : str
+        Path of the Parquet object
+    batch_size : int
+        Maximum rows per batch
+    columns : list
+        Columns to read, all when None
+
+    Returns:
+    --------
+        Generator of pa.RecordBatch
+    """
+
+    with store.open(object_path) as object_file:
+        parquet_file = pq.ParquetFile(object_file)
+        yield from parquet_file.iter_batches(
+            batch_size=batch_size, columns=columns)
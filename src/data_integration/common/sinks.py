@@ -0,0 +1,230 @@
+""" Encode a season to Parquet once and write the
+same buffer to every destination """
+
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from common import parquet_dataset
+
+
+class ObjectSink:
+    """Season partitions of a dataset in an
+    object store
+
+    Args:
+    -----
+    store : ObjectStore
+        Store the partitions are written to
+    dataset_prefix : str
+        Object prefix of the dataset
+    name : str
+        Name in reports, the store's by default
+    """
+
+    def __init__(self, store, dataset_prefix: str, name: str = None):
+        self.store = store
+        self.dataset_prefix = dataset_prefix
+        self.name = name or store.name
+
+    def write(self, season: str, buffer: pa.Buffer) -> str:
+        """Replace a season's partition with the
+        encoded buffer
+
+        Args:
+        -----
+        season : str
+            EPL season
+        buffer : pa.Buffer
+            Encoded Parquet file
+
+        Returns:
+        --------
+            Object path
+        """
+
+        object_path = parquet_dataset.partition_path(
+            self.dataset_prefix, season)
+        self.store.put(object_path, buffer)
+
+        return object_path
+
+    def write_many(self, buffers: dict) -> list:
+        """Replace several seasons' partitions,
+        transferred concurrently
+
+        Args:
+        -----
+        buffers : dict
+            EPL season to encoded Parquet file
+
+        Returns:
+        --------
+            Object paths
+        """
+
+        objects = {
+            parquet_dataset.partition_path(self.dataset_prefix, season):
+                buffer
+            for season, buffer in buffers.items()
+        }
+        self.store.put_many(objects)
+
+        return list(objects)
+
+    def legacy_path(self, season: str) -> str:
+        """Path a season was written to before the
+        season partitions, `<parent>/<season>/<name>.parquet`
+        for a `<parent>/<name>` dataset prefix
+
+        Args:
+        -----
+        season : str
+            EPL season
+
+        Returns:
+        --------
+            Object path
+        """
+
+        parent, _, name = self.dataset_prefix.rstrip('/').rpartition('/')
+
+        return '/'.join(
+            part for part in [parent, season, f'{name}.parquet'] if part)
+
+
+def fan_out(data_frame: pd.DataFrame, season: str, sinks: list,
+            **options) -> dict:
+    """Encode a season's DataFrame to Parquet
+    once and write it to every sink
+
+    Args:
+    -----
+    data_frame : pd.DataFrame
+        The season's data
+    season : str
+        EPL season
+    sinks : list
+        ObjectSink destinations
+    options :
+        Passed on to `parquet_dataset.write_parquet`
+
+    Returns:
+    --------
+        Dictionary with `bytes` written per sink,
+        `encode_seconds` and per sink `write_seconds`
+    """
+
+    start = time.perf_counter()
+    buffer = parquet_dataset.encode_parquet(data_frame, **options)
+    encode_seconds = time.perf_counter() - start
+
+    write_seconds = {}
+    for sink in sinks:
+        start = time.perf_counter()
+        sink.write(season, buffer)
+        write_seconds[sink.name] = time.perf_counter() - start
+
+    print(
+        f'Encoded {season} once: {buffer.size} bytes in '
+        f'{encode_seconds * 1000:.1f} ms, written to '
+        + ', '.join(
+            f'{name} ({seconds * 1000:.1f} ms)'
+            for name, seconds in write_seconds.items())
+    )
+
+    return {
+        'bytes': buffer.size,
+        'encode_seconds': encode_seconds,
+        'write_seconds': write_seconds
+    }
+
+
+def fan_out_seasons(season_frames: dict, sinks: list,
+                    **options) -> dict:
+    """Encode several seasons' DataFrames to
+    Parquet once each and write them to every
+    sink, the seasons concurrently
+
+    Args:
+    -----
+    season_frames : dict
+        EPL season to the season's data
+    sinks : list
+        ObjectSink destinations
+    options :
+        Passed on to `parquet_dataset.write_parquet`
+
+    Returns:
+    --------
+        Dictionary with `bytes` written per sink,
+        `encode_seconds` and per sink `write_seconds`
+    """
+
+    start = time.perf_counter()
+    buffers = {
+        season: parquet_dataset.encode_parquet(data_frame, **options)
+        for season, data_frame in season_frames.items()
+    }
+    encode_seconds = time.perf_counter() - start
+    size = sum(buffer.size for buffer in buffers.values())
+
+    write_seconds = {}
+    for sink in sinks:
+        start = time.perf_counter()
+        sink.write_many(buffers)
+        write_seconds[sink.name] = time.perf_counter() - start
+
+    print(
+        f'Encoded {len(buffers)} seasons once: {size} bytes in '
+        f'{encode_seconds * 1000:.1f} ms, written to '
+        + ', '.join(
+            f'{name} ({seconds * 1000:.1f} ms)'
+            for name, seconds in write_seconds.items())
+    )
+
+    return {
+        'bytes': size,
+        'encode_seconds': encode_seconds,
+        'write_seconds': write_seconds
+    }
+
+
+def migrate_legacy_seasons(sink: ObjectSink, seasons: list,
+                           **options) -> list:
+    """Move seasons written before the season
+    partitions into the dataset, re-encoded with
+    its codec and row groups. The old file is only
+    deleted once its partition is written, and a
+    season that already has a partition keeps it
+
+    Args:
+    -----
+    sink : ObjectSink
+        Dataset to migrate into
+    seasons : list
+        EPL seasons to look for
+    options :
+        Passed on to `parquet_dataset.write_parquet`
+
+    Returns:
+    --------
+        List of the seasons moved
+    """
+
+    moved = []
+    for season in seasons:
+        legacy_path = sink.legacy_path(season)
+        if not sink.store.exists(legacy_path):
+            continue
+
+        partition = parquet_dataset.partition_path(sink.dataset_prefix, season)
+        if not sink.store.exists(partition):
+            table = pq.read_table(pa.BufferReader(sink.store.get(legacy_path)))
+            sink.write(season, parquet_dataset.encode_parquet(table, **options))
+            moved.append(season)
+        sink.store.delete(legacy_path)
+
+    return moved
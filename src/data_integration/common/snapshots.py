@@ -0,0 +1,179 @@
+""" Compressed, content-addressed store of raw
+fetched pages, so parsing can be rerun offline """
+
+import os
+import gzip
+import sqlite3
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from contextlib import closing
+
+
+def page_key(url: str, page: int) -> str:
+    """Snapshot key of one page of a paginated
+    table that is served from a single URL
+
+    Args:
+    -----
+    url : str
+        Page URL
+    page : int
+        Page number
+
+    Returns:
+    --------
+        Snapshot key
+    """
+
+    return f'{url}#page={page}'
+
+
+class SnapshotStore:
+    """Gzip-compressed pages stored once per content
+    hash, with a SQLite index keyed by URL and fetch
+    date. Safe to share between threads and processes
+
+    Args:
+    -----
+    root : str
+        Directory holding the objects and the index
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS snapshots ('
+            'url TEXT NOT NULL, '
+            'fetch_date TEXT NOT NULL, '
+            'digest TEXT NOT NULL, '
+            'fetched_at TEXT NOT NULL, '
+            'PRIMARY KEY (url, fetch_date))'
+        )
+
+    def _execute(self, sql: str, parameters: tuple = ()):
+        """Run one statement against the index
+        and return its first row"""
+
+        index_path = os.path.join(self.root, 'index.db')
+
+        with closing(sqlite3.connect(index_path, timeout=30)) as connection:
+            with connection:
+                return connection.execute(sql, parameters).fetchone()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(
+            self.root, 'objects', digest[:2], f'{digest}.html.gz')
+
+    def put(self, url: str, page_html: str,
+            fetched_at: datetime = None) -> str:
+        """Store a fetched page, writing its content
+        only if no identical page is stored yet
+
+        Args:
+        -----
+        url : str
+            Page URL or snapshot key
+        page_html : str
+            Page HTML
+        fetched_at : datetime
+            Fetch time, defaults to now (UTC)
+
+        Returns:
+        --------
+            Content digest of the page
+        """
+
+        fetched_at = fetched_at or datetime.utcnow()
+        content = page_html.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+
+        object_path = self._object_path(digest)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            # Write then rename, readers never see partial objects
+            handle, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(object_path))
+            with os.fdopen(handle, 'wb') as object_file:
+                object_file.write(gzip.compress(content, compresslevel=6))
+            os.replace(temp_path, object_path)
+
+        with self._lock:
+            self._execute(
+                'INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)',
+                (url, fetched_at.date().isoformat(), digest,
+                 fetched_at.isoformat())
+            )
+
+        return digest
+
+    def get(self, url: str, fetch_date: str = None) -> str:
+        """Return the latest snapshot of a URL fetched
+        on or before `fetch_date`
+
+        Args:
+        -----
+        url : str
+            Page URL or snapshot key
+        fetch_date : str
+            ISO date, e.g. `2023-08-01`, defaults to
+            the latest snapshot
+
+        Returns:
+        --------
+            Page HTML
+        """
+
+        row = self._execute(
+            'SELECT digest FROM snapshots '
+            'WHERE url = ? AND fetch_date <= ? '
+            'ORDER BY fetch_date DESC LIMIT 1',
+            (url, fetch_date or '9999-12-31')
+        )
+
+        if row is None:
+            raise KeyError(f'No snapshot of {url}')
+
+        with open(self._object_path(row[0]), 'rb') as object_file:
+            return gzip.decompress(object_file.read()).decode('utf-8')
+
+    def __contains__(self, url: str) -> bool:
+        return self._execute(
+            'SELECT 1 FROM snapshots WHERE url = ? LIMIT 1', (url,)
+        ) is not None
+
+
+class SnapshottingFetcher:
+    """Wrap a page fetcher so every page it
+    fetches is also stored in a snapshot store
+
+    Args:
+    -----
+    fetcher : HttpFetcher | FixtureFetcher
+        Fetcher to wrap
+    store : SnapshotStore
+        Store the fetched pages are saved to
+    """
+
+    def __init__(self, fetcher, store: SnapshotStore):
+        self.fetcher = fetcher
+        self.store = store
+
+    def fetch(self, url: str) -> str:
+        page_html = self.fetcher.fetch(url)
+        self.store.put(url, page_html)
+
+        return page_html
+
+    def close(self) -> None:
+        self.fetcher.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,181 @@
+""" Readiness conditions and latency tracking
+for Selenium waits """
+
+import time
+import threading
+from collections import defaultdict
+
+from selenium.common import exceptions
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+
+class WaitTimings:
+    """Collect how long each named wait took,
+    shared by every browser session in a run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record the latency of one wait
+
+        Args:
+        -----
+        name : str
+            Wait name
+        seconds : float
+            Time spent waiting
+
+        Returns:
+        --------
+            None
+        """
+
+        with self._lock:
+            self.latencies[name].append(seconds)
+
+    def summary(self) -> dict:
+        """Summarise the recorded latencies
+
+        Returns:
+        --------
+            Dictionary of wait name to count, total,
+            mean and max seconds
+        """
+
+        with self._lock:
+            return {
+                name: {
+                    'count': len(values),
+                    'total': sum(values),
+                    'mean': sum(values) / len(values),
+                    'max': max(values)
+                }
+                for name, values in self.latencies.items()
+            }
+
+    def report(self) -> None:
+        """Print the latency summary"""
+
+        for name, stats in sorted(self.summary().items()):
+            print(
+                f"Wait '{name}': {stats['count']} waits, "
+                f"mean {stats['mean']:.2f}s, max {stats['max']:.2f}s, "
+                f"total {stats['total']:.1f}s"
+            )
+
+    def reset(self) -> None:
+        """Drop the recorded latencies"""
+
+        with self._lock:
+            self.latencies.clear()
+
+
+# Process-wide wait timings
+wait_timings = WaitTimings()
+
+
+def wait_for(driver, condition, name: str, timeout: float = 10,
+             poll_frequency: float = 0.1):
+    """Wait until `condition` holds and record the
+    latency under `name`, whether it holds or not
+
+    Args:
+    -----
+    driver : WebDriver
+        Browser session
+    condition : callable
+        Condition taking the driver, truthy when ready
+    name : str
+        Name the latency is recorded under
+    timeout : float
+        Seconds to wait before raising TimeoutException
+    poll_frequency : float
+        Seconds between condition checks
+
+    Returns:
+    --------
+        The condition's return value
+    """
+
+    start = time.perf_counter()
+    try:
+        return WebDriverWait(
+            driver, timeout, poll_frequency=poll_frequency
+        ).until(condition)
+    finally:
+        wait_timings.record(name, time.perf_counter() - start)
+
+
+def rows_present(locator: tuple, minimum: int = 1):
+    """Condition: at least `minimum` elements
+    match `locator`
+
+    Args:
+    -----
+    locator : tuple
+        `(By, selector)` of the table rows
+    minimum : int
+        Minimum number of rows
+
+    Returns:
+    --------
+        Condition returning the rows once present
+    """
+
+    def _predicate(driver):
+        rows = driver.find_elements(*locator)
+        return rows if len(rows) >= minimum else False
+
+    return _predicate
+
+
+def page_replaced(previous_element, locator: tuple):
+    """Condition: `previous_element` from the old
+    page is stale and the new page has rows
+
+    Args:
+    -----
+    previous_element : WebElement
+        Element of the page being replaced
+    locator : tuple
+        `(By, selector)` of the new page's rows
+
+    Returns:
+    --------
+        Condition returning the new rows
+    """
+
+    is_stale = EC.staleness_of(previous_element)
+    has_rows = rows_present(locator)
+
+    def _predicate(driver):
+        try:
+            return is_stale(driver) and has_rows(driver)
+        except exceptions.StaleElementReferenceException:
+            return False
+
+    return _predicate
+
+
+def first_element(driver, locator: tuple):
+    """Return the first element matching `locator`,
+    or None when nothing matches
+
+    Args:
+    -----
+    driver : WebDriver
+        Browser session
+    locator : tuple
+        `(By, selector)` to look up
+
+    Returns:
+    --------
+        WebElement | None
+    """
+
+    elements = driver.find_elements(*locator)
+
+    return elements[0] if elements else None
@@ -0,0 +1,551 @@
+""" Load a season's Parquet file into a warehouse as
+one bulk job, BigQuery or a local DuckDB database,
+appended or merged on row keys """
+
+import os
+import time
+import uuid
+import hashlib
+import tempfile
+import threading
+
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+
+# Local database of the DuckDB backend
+DUCKDB_DATABASE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'Data', 'warehouse.duckdb')
+
+# Codec of the files submitted to a load job, read by every backend
+LOAD_CODEC = 'snappy'
+
+# Key and content hash of every loaded row, and the snapshots
+# of the last loaded hashes they are compared against
+KEY_COLUMN = 'RowKey'
+HASH_COLUMN = 'RowHash'
+SNAPSHOT_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'Cache', 'load_snapshots')
+
+# Set when a row is scraped, not part of its content: left out
+# of the hash, and `CreatedAt` is kept when a row is merged
+CREATED_COLUMN = 'CreatedAt'
+INGESTION_COLUMNS = [CREATED_COLUMN, 'UpdatedAt']
+
+# Stands for nulls in keys, as in dbt_utils.generate_surrogate_key
+NULL_TOKEN = '_dbt_utils_surrogate_key_null_'
+
+
+def _md5_strings(table: pa.Table, columns: list,
+                 separator: str) -> pa.Array:
+    """Hex md5 of the columns' string values
+    joined per row, nulls as `NULL_TOKEN`"""
+
+    parts = [
+        pc.fill_null(pc.cast(table.column(column), pa.string()), NULL_TOKEN)
+        for column in columns
+    ]
+    joined = pc.binary_join_element_wise(*parts, separator)
+
+    return pa.array(
+        [hashlib.md5(value.encode('utf-8')).hexdigest()
+         for value in joined.to_pylist()],
+        type=pa.string()
+    )
+
+
+def add_row_hashes(table: pa.Table, key_columns: list) -> pa.Table:
+    """Add the surrogate key of each row, the same
+    md5 dbt_utils builds, and a hash of its content.
+    `INGESTION_COLUMNS` are not hashed, a rescrape of
+    unchanged rows keeps their hashes
+
+    Args:
+    -----
+    table : pa.Table
+        Cleaned rows
+    key_columns : list
+        Columns identifying a row, e.g. player and season,
+        timestamps among them as their date
+
+    Returns:
+    --------
+        pa.Table with `KEY_COLUMN` and `HASH_COLUMN`
+    """
+
+    # Timestamps key as ISO dates, as `column_schema.backfill_query`
+    # builds them in BigQuery
+    keys = table.select(key_columns)
+    for index, field in enumerate(keys.schema):
+        if pa.types.is_timestamp(field.type):
+            keys = keys.set_column(index, field.name, pc.strftime(
+                keys.column(index), format='%Y-%m-%d'))
+    row_keys = _md5_strings(keys, key_columns, '-')
+    content_columns = [
+        column for column in table.column_names
+        if column not in INGESTION_COLUMNS
+    ]
+    # Unit separator, never part of a scraped value
+    row_hashes = _md5_strings(table, content_columns, '\x1f')
+
+    return (
+        table
+        .append_column(KEY_COLUMN, row_keys)
+        .append_column(HASH_COLUMN, row_hashes)
+    )
+
+
+class LoadSnapshot:
+    """Parquet file of the key and content hash of
+    every row last loaded into a table
+
+    Args:
+    -----
+    path : str
+        Snapshot file path
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hashes = {}
+        # Seasons of a table may be loaded concurrently
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            stored = pq.read_table(path)
+            self.hashes = dict(zip(
+                stored.column(KEY_COLUMN).to_pylist(),
+                stored.column(HASH_COLUMN).to_pylist()
+            ))
+
+    @classmethod
+    def for_table(cls, loader, table_id: str):
+        """Snapshot of a table on a warehouse backend
+
+        Args:
+        -----
+        loader : BigQueryLoader | DuckDBLoader
+            Warehouse backend
+        table_id : str
+            `dataset.table`
+
+        Returns:
+        --------
+            LoadSnapshot
+        """
+
+        return cls(os.path.join(
+            SNAPSHOT_DIR, loader.name, f'{table_id}.parquet'))
+
+    def changed(self, table: pa.Table) -> pa.Table:
+        """Rows that are new or whose content
+        changed since the snapshot
+
+        Args:
+        -----
+        table : pa.Table
+            Rows from `add_row_hashes`
+
+        Returns:
+        --------
+            pa.Table
+        """
+
+        # A hash covers the key columns too, so an unknown
+        # hash is either a new row or a changed one
+        with self._lock:
+            known = pa.array(list(self.hashes.values()), type=pa.string())
+        return table.filter(
+            pc.invert(pc.is_in(table.column(HASH_COLUMN), known)))
+
+    def clear(self) -> None:
+        """Forget every loaded row, the next load
+        merges all of them"""
+
+        with self._lock:
+            self.hashes = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def update(self, row_keys: list, row_hashes: list) -> None:
+        """Record loaded rows and save the snapshot
+
+        Args:
+        -----
+        row_keys : list
+            Keys of the loaded rows
+        row_hashes : list
+            Their content hashes
+
+        Returns:
+        --------
+            None
+        """
+
+        with self._lock:
+            self.hashes.update(zip(row_keys, row_hashes))
+
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            # Write then rename, a crash never leaves a partial file
+            handle, temp_path = tempfile.mkstemp(dir=directory)
+            stored = pa.table({
+                KEY_COLUMN: pa.array(list(self.hashes), pa.string()),
+                HASH_COLUMN: pa.array(list(self.hashes.values()), pa.string())
+            })
+            with os.fdopen(handle, 'wb') as snapshot_file:
+                pq.write_table(stored, snapshot_file)
+            os.replace(temp_path, self.path)
+
+
+class BigQueryLoader:
+    """Append and merge load jobs into BigQuery tables
+
+    Args:
+    -----
+    client : google.cloud.bigquery.Client
+        e.g. the shared `clients.bigquery_client()`
+    """
+
+    name = 'bigquery'
+
+    def __init__(self, client):
+        self.client = client
+
+    def load(self, buffer: pa.Buffer, table_id: str) -> int:
+        """Append a Parquet file to a table with a
+        single load job, streamed from the buffer
+
+        Args:
+        -----
+        buffer : pa.Buffer
+            Encoded Parquet file
+        table_id : str
+            `dataset.table`
+
+        Returns:
+        --------
+            Rows loaded
+        """
+
+        # Imported here, the DuckDB backend runs without GCP libraries
+        from google.cloud import bigquery
+
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND
+        )
+        job = self.client.load_table_from_file(
+            pa.BufferReader(buffer), table_id, job_config=job_config)
+
+        return job.result().output_rows
+
+    def upsert(self, buffer: pa.Buffer, table_id: str,
+               key: str = KEY_COLUMN) -> int:
+        """Merge a Parquet file into a table on a key
+        column: matched rows are updated, the others
+        inserted. The file is loaded to a staging table
+        first, dropped once merged
+
+        Args:
+        -----
+        buffer : pa.Buffer
+            Encoded Parquet file
+        table_id : str
+            `dataset.table`
+        key : str
+            Column identifying a row
+
+        Returns:
+        --------
+            Rows inserted or updated
+        """
+
+        from google.cloud import bigquery
+
+        # Unique, seasons of a table may be merged concurrently
+        staging_id = f'{table_id}_staging_{uuid.uuid4().hex[:8]}'
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE
+        )
+        self.client.load_table_from_file(
+            pa.BufferReader(buffer), staging_id,
+            job_config=job_config).result()
+
+        try:
+            staging_table = self.client.get_table(staging_id)
+            columns = [field.name for field in staging_table.schema]
+            # Tables loaded before keys existed get the new columns
+            self.client.query(
+                f'create table if not exists `{table_id}` '
+                f'like `{staging_id}`;\n'
+                f'alter table `{table_id}` '
+                f'add column if not exists {KEY_COLUMN} string, '
+                f'add column if not exists {HASH_COLUMN} string'
+            ).result()
+
+            assignments = ', '.join(
+                f'{column} = source.{column}' for column in columns
+                if column != CREATED_COLUMN)
+            # `insert row` fills columns by position, the file's
+            # column order need not be the table's
+            values = ', '.join(f'source.{column}' for column in columns)
+            job = self.client.query(
+                f'merge `{table_id}` as target '
+                f'using `{staging_id}` as source '
+                f'on target.{key} = source.{key} '
+                f'when matched then update set {assignments} '
+                f'when not matched then insert ({", ".join(columns)}) '
+                f'values ({values})'
+            )
+            job.result()
+        finally:
+            self.client.delete_table(staging_id, not_found_ok=True)
+
+        return job.num_dml_affected_rows
+
+
+class DuckDBLoader:
+    """Append and merge loads into a local DuckDB
+    database, same tables as BigQuery, for offline runs
+
+    Args:
+    -----
+    database : str
+        Database file, `:memory:` for an in-memory one
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, database: str = DUCKDB_DATABASE):
+        if database != ':memory:':
+            os.makedirs(os.path.dirname(database), exist_ok=True)
+        self.connection = duckdb.connect(database)
+        # One writer at a time on the shared connection
+        self._lock = threading.Lock()
+
+    def _stage(self, buffer: pa.Buffer, table_id: str) -> pa.Table:
+        """Register the file as the `staged` view and
+        create the table from its schema if missing"""
+
+        staged = pq.read_table(pa.BufferReader(buffer))
+        if '.' in table_id:
+            schema = table_id.split('.')[0]
+            self.connection.execute(f'create schema if not exists {schema}')
+
+        self.connection.register('staged', staged)
+        self.connection.execute(
+            f'create table if not exists {table_id} as '
+            'select * from staged limit 0')
+
+        return staged
+
+    def load(self, buffer: pa.Buffer, table_id: str) -> int:
+        """Append a Parquet file to a table, created
+        from the file's schema on first load
+
+        Args:
+        -----
+        buffer : pa.Buffer
+            Encoded Parquet file
+        table_id : str
+            `dataset.table`, the dataset as schema
+
+        Returns:
+        --------
+            Rows loaded
+        """
+
+        with self._lock:
+            try:
+                staged = self._stage(buffer, table_id)
+                self.connection.execute(
+                    f'insert into {table_id} by name select * from staged')
+            finally:
+                self.connection.unregister('staged')
+
+        return staged.num_rows
+
+    def upsert(self, buffer: pa.Buffer, table_id: str,
+               key: str = KEY_COLUMN) -> int:
+        """Update the rows of a table matching the
+        file's keys, except their `CREATED_COLUMN`, and
+        insert the rest, in one transaction
+
+        Args:
+        -----
+        buffer : pa.Buffer
+            Encoded Parquet file
+        table_id : str
+            `dataset.table`, the dataset as schema
+        key : str
+            Column identifying a row
+
+        Returns:
+        --------
+            Rows inserted or updated
+        """
+
+        with self._lock:
+            try:
+                staged = self._stage(buffer, table_id)
+                assignments = ', '.join(
+                    f'{column} = staged.{column}'
+                    for column in staged.column_names
+                    if column not in (key, CREATED_COLUMN))
+                self.connection.begin()
+                try:
+                    self.connection.execute(
+                        f'update {table_id} set {assignments} from staged '
+                        f'where {table_id}.{key} = staged.{key}')
+                    self.connection.execute(
+                        f'insert into {table_id} by name select * from staged '
+                        f'where {key} not in (select {key} from {table_id})')
+                except duckdb.Error:
+                    self.connection.rollback()
+                    raise
+                self.connection.commit()
+            finally:
+                self.connection.unregister('staged')
+
+        return staged.num_rows
+
+
+def _drop_seen_keys(table: pa.Table, seen_keys: set) -> pa.Table:
+    """Rows whose key is not in `seen_keys`, the first
+    of each key in the table, adding the kept keys"""
+
+    keep = []
+    for row_key in table.column(KEY_COLUMN).to_pylist():
+        keep.append(row_key not in seen_keys)
+        seen_keys.add(row_key)
+
+    return table.filter(pa.array(keep, pa.bool_()))
+
+
+def load_batches(batches, table_id: str, loader,
+                 transform=None, snapshot: LoadSnapshot = None) -> dict:
+    """Clean record batches one at a time, encode
+    them into a single Parquet file and submit it
+    as one load job. Only one decoded batch is held
+    at once, the encoded file is compressed.
+
+    With a snapshot, only rows new or changed since
+    the last load are kept and merged on their key,
+    a rerun of unchanged data moves no rows. A merge
+    fails when two rows share a key, only the first
+    row of each key is kept
+
+    Args:
+    -----
+    batches : iterable
+        pa.RecordBatch, e.g. from `parquet_stream.iter_batches`
+    table_id : str
+        Destination `dataset.table`
+    loader : BigQueryLoader | DuckDBLoader
+        Warehouse backend
+    transform : callable
+        Batch to cleaned pa.Table, none when None
+    snapshot : LoadSnapshot
+        Hashes of the last loaded rows, the
+        transformed rows must be from `add_row_hashes`
+
+    Returns:
+    --------
+        Dictionary with `rows` loaded, `unchanged`
+        rows skipped, `duplicates` dropped, `bytes`,
+        `encode_seconds` and `load_seconds`
+    """
+
+    start = time.perf_counter()
+    sink = pa.BufferOutputStream()
+    writer = None
+    unchanged = duplicates = 0
+    seen_keys = set()
+    row_keys, row_hashes = [], []
+    for batch in batches:
+        if transform:
+            table = transform(batch)
+        else:
+            table = pa.Table.from_batches([batch])
+
+        if snapshot is not None:
+            unique = _drop_seen_keys(table, seen_keys)
+            duplicates += table.num_rows - unique.num_rows
+            table = unique
+            changed = snapshot.changed(table)
+            unchanged += table.num_rows - changed.num_rows
+            table = changed
+            if not table.num_rows:
+                continue
+            row_keys.extend(table.column(KEY_COLUMN).to_pylist())
+            row_hashes.extend(table.column(HASH_COLUMN).to_pylist())
+
+        if writer is None:
+            writer = pq.ParquetWriter(
+                sink, table.schema, compression=LOAD_CODEC)
+        writer.write_table(table)
+
+    if duplicates:
+        print(f'Dropped {duplicates} rows of {table_id} '
+              f'with an already seen {KEY_COLUMN}')
+
+    if writer is None:
+        print(f'Nothing to load into {table_id}, '
+              f'{unchanged} rows unchanged')
+        return {'rows': 0, 'unchanged': unchanged,
+                'duplicates': duplicates, 'bytes': 0,
+                'encode_seconds': time.perf_counter() - start,
+                'load_seconds': 0.0}
+
+    writer.close()
+    buffer = sink.getvalue()
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if snapshot is not None:
+        rows = loader.upsert(buffer, table_id)
+        # Only once the merge succeeded
+        snapshot.update(row_keys, row_hashes)
+    else:
+        rows = loader.load(buffer, table_id)
+    load_seconds = time.perf_counter() - start
+
+    print(
+        f'Loaded {rows} rows ({buffer.size} bytes) into {table_id} '
+        f'on {loader.name} in {load_seconds * 1000:.1f} ms, '
+        f'{unchanged} rows unchanged'
+    )
+
+    return {
+        'rows': rows,
+        'unchanged': unchanged,
+        'duplicates': duplicates,
+        'bytes': buffer.size,
+        'encode_seconds': encode_seconds,
+        'load_seconds': load_seconds
+    }
+
+
+def load_season(table: pa.Table, table_id: str, loader) -> dict:
+    """Encode a season's table to Parquet and
+    submit it as one load job
+
+    Args:
+    -----
+    table : pa.Table
+        Cleaned season's data
+    table_id : str
+        Destination `dataset.table`
+    loader : BigQueryLoader | DuckDBLoader
+        Warehouse backend
+
+    Returns:
+    --------
+        Dictionary with `rows`, `unchanged`, `duplicates`,
+        `bytes`, `encode_seconds` and `load_seconds`
+    """
+
+    return load_batches(table.to_batches(), table_id, loader)
@@ -0,0 +1,151 @@
+"""Benchmark building the player info DataFrame
+from profile details, the previous dict-of-lists
+builder against player records"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Make the shared `common` package importable when run as a script
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import utils
+
+
+LEGACY_COLUMNS = {
+    'Club:': 'Club',
+    'Nationality:': 'Nationality',
+    'Age:': 'Age',
+    'Position:': 'Position',
+    'Prefered foot:': 'Prefered Foot',
+    'Height:': 'Height',
+    'Weight:': 'Weight',
+    'Previous teams:': 'Previous Teams'
+}
+
+
+def synthetic_profiles(count: int, seed: int = 7) -> list:
+    """Generate `(player_name, details)` pairs shaped
+    like parsed profiles, some with missing details
+
+    Args:
+    -----
+    count : int
+        Number of profiles
+    seed : int
+        Random seed
+
+    Returns:
+    --------
+        List of `(player_name, details)` tuples
+    """
+
+    rng = random.Random(seed)
+    profiles = []
+
+    for number in range(count):
+        details = []
+        for label in utils.DETAIL_FIELDS:
+            if rng.random() < 0.9:
+                details.extend([label, f'{label[:-1]} {number}'])
+        profiles.append((f'Player {number}', details))
+
+    return profiles
+
+
+def legacy_build(profiles: list) -> pd.DataFrame:
+    """The dict-of-lists builder player records replaced:
+    an if-chain per detail, a length check per player
+    and a timestamp per row"""
+
+    info_dict = {'Player Names': []}
+    info_dict.update({column: [] for column in LEGACY_COLUMNS.values()})
+    info_dict.update({'CreatedAt': [], 'UpdatedAt': []})
+
+    for player_name, details in profiles:
+        info_dict['Player Names'].append(player_name)
+        for index, detail in enumerate(details):
+            for label, column in LEGACY_COLUMNS.items():
+                if detail == label:
+                    info_dict[column].append(details[index + 1])
+
+        cur_datetime = datetime.utcnow()
+        info_dict['CreatedAt'].append(cur_datetime)
+        info_dict['UpdatedAt'].append(cur_datetime)
+
+        for column in LEGACY_COLUMNS.values():
+            if len(info_dict['Player Names']) != len(info_dict[column]):
+                info_dict[column].append(np.nan)
+
+    return pd.DataFrame(info_dict)
+
+
+def record_build(profiles: list) -> pd.DataFrame:
+    """Build the DataFrame through player records"""
+
+    records = [
+        utils.PlayerRecord.from_details(player_name, details)
+        for player_name, details in profiles
+    ]
+
+    return utils.records_to_frame(records)
+
+
+def best_of(builder, profiles: list, repeats: int) -> tuple:
+    """Time a builder, keeping the fastest run
+
+    Args:
+    -----
+    builder : callable
+        DataFrame builder
+    profiles : list
+        Synthetic profiles
+    repeats : int
+        Number of timed runs
+
+    Returns:
+    --------
+        Tuple of (fastest seconds, built DataFrame)
+    """
+
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        data_frame = builder(profiles)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), data_frame
+
+
+if __name__ == '__main__':
+
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark player DataFrame builders'
+    )
+    arg_parser.add_argument('--profiles', type=int, default=100_000)
+    arg_parser.add_argument('--repeats', type=int, default=3)
+
+    args = arg_parser.parse_args()
+
+    profiles = synthetic_profiles(args.profiles)
+
+    legacy_seconds, legacy_df = best_of(legacy_build, profiles, args.repeats)
+    record_seconds, record_df = best_of(record_build, profiles, args.repeats)
+
+    # Both builders must agree on the extracted values
+    columns = list(utils.COLUMNS.values())
+    pd.testing.assert_frame_equal(
+        legacy_df[columns].fillna(np.nan), record_df[columns].fillna(np.nan))
+
+    print(
+        f'{args.profiles} profiles: dict-of-lists {legacy_seconds:.2f}s, '
+        f'records {record_seconds:.2f}s '
+        f'({legacy_seconds / record_seconds:.1f}x faster)'
+    )
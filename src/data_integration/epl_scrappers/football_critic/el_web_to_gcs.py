@@ -1,78 +1,155 @@
 """ EL to extract EPL data and load it to GCS """
 
+import os
+import sys
 import time
+import queue
 import argparse
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 
+# Make the shared `common` package importable when run as a script
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
 import utils
+from profile_cache import ProfileCache
+from common import browser_pool, http_engine, sinks, waits
+from common.checkpoint import CrawlCheckpoint
+from common.object_store import LocalObjectStore, bucket_store
+from common.snapshots import SnapshotStore, SnapshottingFetcher, page_key
+from common.cache_keys import cache_expiration, fingerprint_input_hash
 
 from prefect import flow, task
-from prefect.tasks import task_input_hash
-from prefect_gcp.cloud_storage import GcsBucket
 
-from selenium import webdriver
 from selenium.common import exceptions
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
-@task(name='Extract Player Data', retries=2,
-      cache_expiration=timedelta(days=1),
-      cache_key_fn=task_input_hash)
-def extract_player_data(crawl_url: str):
-    """Crawl FootballCritic website, extract players
-    data, and load it into a Pandas DataFrame
+# Number of player listing pages for a season
+PAGE_COUNT = 22
+
+# Browser sessions are prepared on the home page
+HOME_URL = 'https://www.footballcritic.com/'
+
+# Completed profiles of interrupted crawls are kept here
+CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), 'Checkpoints')
+
+# Raw pages of every crawl are kept here for reparsing
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'Snapshots')
+
+# Player profiles shared across seasons are cached here
+PROFILE_CACHE_PATH = os.path.join(
+    os.path.dirname(__file__), 'Cache', 'profiles.db')
+
+# Local dataset directory and GCS dataset prefix
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'Data')
+GCS_DATASET_PREFIX = 'epl_player_data_repository'
+
+# Low-cardinality columns, dictionary encoded in Parquet
+DICTIONARY_COLUMNS = ['Club', 'Nationality', 'Position', 'Prefered Foot',
+                      'Season']
+
+# Locators used to tell when a page is ready
+PLAYER_LINK_LOCATOR = (By.XPATH, '//a[@class="only_desktop"]')
+ADD_INFO_LOCATOR = (By.XPATH, '//ul[@class="add-info"]')
+NEXT_PAGE_LOCATOR = (
+    By.XPATH, '//a[@class="paginate_button next" and contains(., "Next")]')
+
+
+def _accept_dialogs(driver) -> None:
+    """Open the home page and dismiss the cookie
+    consent and push notification dialogs, once
+    per pooled browser session
+
+    Args:
+    -----
+    driver : webdriver.Chrome
+        New browser session
+
+    Returns:
+    --------
+        None
+    """
+
+    driver.get(HOME_URL)
+
+    try:
+        # Find `Accept All Cookies` btn and click it
+        accept_cookies_btn = waits.wait_for(
+            driver,
+            EC.element_to_be_clickable(
+                (By.XPATH, "//button[@class=' css-47sehv' and \
+                 contains(., 'AGREE')]")),
+            'cookie dialog'
+        )
+        accept_cookies_btn.click()
+
+        # Cancel `Push Notifications` message
+        accept_cookies_btn = waits.wait_for(
+            driver,
+            EC.element_to_be_clickable(
+                (By.XPATH,
+                 "//button[@id='onesignal-slidedown-cancel-button' \
+                    and contains(., 'Later')]")),
+            'notifications dialog'
+        )
+        accept_cookies_btn.click()
+
+    except exceptions.TimeoutException:
+        print('Consent dialogs not shown, continuing')
+
+
+def get_browser_pool() -> browser_pool.BrowserPool:
+    """Return this process's pool of Chrome
+    sessions with the consent dialogs dismissed
+
+    Returns:
+    --------
+        BrowserPool
+    """
+
+    return browser_pool.get_pool(
+        'football_critic',
+        browser_pool.driver_factory('Chrome'),
+        prepare=_accept_dialogs
+    )
+
+
+def collect_profile_links(session: browser_pool.PooledSession,
+                          crawl_url: str, snapshots: SnapshotStore,
+                          page_count: int = PAGE_COUNT) -> list:
+    """Walk the listing pages and collect each
+    player's name, profile href and club, in
+    listing order
 
     Args:
     -----
+    session : browser_pool.PooledSession
+        Leased browser session used for the listing pages
     crawl_url : str
         EPL website
+    snapshots : SnapshotStore
+        Store each listing page is saved to
+    page_count : int
+        Number of listing pages to walk
 
     Returns:
     --------
-        Pandas DataFrame with EPL Demographic Data
+        List of `(player_name, profile_href, club)` tuples
     """
-    # Dictionary to store player info
-    player_info = {
-        'Player Names': [],
-        'Club': [],
-        'Nationality': [],
-        'Age': [],
-        'Position': [],
-        'Prefered Foot': [],
-        'Height': [],
-        'Weight': [],
-        'Previous Teams': [],
-        'CreatedAt': [],
-        'UpdatedAt': []
-    }
-
-    driver = webdriver.Chrome()
+
+    profile_links = []
+    driver = session.driver
+
     # Open web browser
     driver.get(url=crawl_url)
 
-    # Find `Accept All Cookies` btn and click it
-    accept_cookies_btn = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located(
-            (By.XPATH, "//button[@class=' css-47sehv' and \
-             contains(., 'AGREE')]"))
-    )
-    accept_cookies_btn.click()
-
-    # Cancel `Push Notifications` message
-    accept_cookies_btn = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located(
-            (By.XPATH,
-             "//button[@id='onesignal-slidedown-cancel-button' \
-                and contains(., 'Later')]"))
-    )
-    accept_cookies_btn.click()
-
-    # Wait for `10` secs
-    time.sleep(10)
+    # Wait for the player table to render
+    waits.wait_for(driver, waits.rows_present(PLAYER_LINK_LOCATOR),
+                   'player table')
 
     # Find the total height of the page
     total_height = driver.execute_script(
@@ -86,64 +163,419 @@ def extract_player_data(crawl_url: str):
     # Scroll to the middle of the page
     middle_position = total_height // 4
     driver.execute_script(f"window.scrollTo(0, {middle_position});")
-    time.sleep(5)
 
     try:
         page_num = 1
-        while page_num <= 22:
+        while page_num <= page_count:
             # Find element with player name
-            players = driver.find_elements(
-                By.XPATH, '//a[@class="only_desktop"]')
+            players = waits.wait_for(
+                driver, waits.rows_present(PLAYER_LINK_LOCATOR),
+                'player table')
 
-            # Loop through all player's information
-            for player in players:
-                # Find player name
-                player_info['Player Names'].append(player.text)
-                print(player.text)
+            # Read the rendered rows once, like the `http` engine
+            page_source = driver.page_source
+            snapshots.put(page_key(crawl_url, page_num), page_source)
+            session.page_loaded()
 
-                # Get href attribute from `player` element
-                href = player.get_attribute('href')
+            profile_links.extend(
+                utils.parse_listing_page(page_source, crawl_url))
 
-                # Open player info page in a new window
-                driver.execute_script(f"window.open('{href}', '_blank');")
-                # Switch to the newly opened window
-                driver.switch_to.window(driver.window_handles[1])
-                # # Navigate to player info page
-                time.sleep(5)
-
-                # Find elements with player information
-                information = driver.find_element(
-                    By.XPATH, '//ul[@class="add-info"]')
-                information_list = information.text.split("\n")
-                player_info = utils.add_player_details(
-                    information_list, player_info)
-
-                # Close the player info window
-                driver.close()
-                # Switch back to the main window
-                driver.switch_to.window(driver.window_handles[0])
-                time.sleep(3)
-
-            next_page_btn = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable(
-                    (By.XPATH, '//a[@class="paginate_button next" and \
-                     contains(., "Next")]'))
-            )
+            next_page_btn = waits.wait_for(
+                driver, EC.element_to_be_clickable(NEXT_PAGE_LOCATOR),
+                'next button', timeout=5)
             # Scroll to the element using JavaScript
             driver.execute_script(
                 "arguments[0].scrollIntoView(true);", next_page_btn)
             # Click the "Next" button using JavaScript
             driver.execute_script("arguments[0].click();", next_page_btn)
-            time.sleep(2)
+            # Wait for the next page of players to replace this one
+            waits.wait_for(
+                driver, waits.page_replaced(players[0], PLAYER_LINK_LOCATOR),
+                'next page')
 
             page_num += 1
 
     except exceptions.TimeoutException:
         pass
 
-    return pd.DataFrame(
-        data=player_info
-    )
+    return profile_links
+
+
+def _profile_worker(href_queue: queue.Queue, on_profile, failures: list,
+                    snapshots: SnapshotStore) -> None:
+    """Consume profile hrefs from the queue with a
+    browser session leased from the pool, handing
+    each profile's `add-info` lines to `on_profile`.
+    The session's browser is restarted between
+    profiles once it has loaded the pool's `max_pages`
+
+    Args:
+    -----
+    href_queue : queue.Queue
+        Queue of `(position, profile_href)` tuples
+    on_profile : callable
+        Called with the listing position and details
+    failures : list
+        Shared list of positions that could not be read
+    snapshots : SnapshotStore
+        Store each profile page is saved to
+
+    Returns:
+    --------
+        None
+    """
+
+    pool = get_browser_pool()
+
+    with pool.lease() as session:
+        while True:
+            try:
+                position, href = href_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                pool.recycle_if_worn(session)
+                driver = session.driver
+                driver.get(href)
+                session.page_loaded()
+                # Find elements with player information
+                information = waits.wait_for(
+                    driver, EC.presence_of_element_located(ADD_INFO_LOCATOR),
+                    'profile add-info')
+                snapshots.put(href, driver.page_source)
+                on_profile(position, information.text.split("\n"))
+            except exceptions.WebDriverException as error:
+                print(f'Failed to read profile {href}: {error.msg}')
+                failures.append(position)
+
+
+def crawl_profiles(profile_links: list, positions: list, workers: int,
+                   on_profile, snapshots: SnapshotStore) -> list:
+    """Fetch player profiles with pooled browser
+    sessions consuming a shared queue of hrefs
+
+    Args:
+    -----
+    profile_links : list
+        List of `(player_name, profile_href, club)` tuples
+    positions : list
+        Listing positions of the profiles to fetch
+    workers : int
+        Number of parallel browser sessions
+    on_profile : callable
+        Called with the listing position and details
+    snapshots : SnapshotStore
+        Store each profile page is saved to
+
+    Returns:
+    --------
+        List of positions that could not be read
+    """
+
+    href_queue = queue.Queue()
+    for position in positions:
+        href_queue.put((position, profile_links[position][1]))
+
+    if not positions:
+        return []
+
+    failures = []
+    pool = get_browser_pool()
+    workers = max(1, min(workers, len(positions), pool.max_sessions))
+    pool.warm(workers)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                _profile_worker, href_queue, on_profile, failures, snapshots)
+            for _ in range(workers)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    crawled = len(positions) - len(failures)
+    if elapsed > 0:
+        print(
+            f'Crawled {crawled} profiles with {workers} workers in '
+            f'{elapsed:.1f}s ({crawled / elapsed * 60:.1f} profiles/min)'
+        )
+
+    return failures
+
+
+def fetch_profiles(fetcher, profile_links: list, positions: list,
+                   workers: int, on_profile, snapshots: SnapshotStore) -> list:
+    """Fetch and parse player profiles over pooled
+    HTTP connections, falling back to browser
+    sessions for profiles that need JavaScript
+
+    Args:
+    -----
+    fetcher : SnapshottingFetcher
+        Page fetcher
+    profile_links : list
+        List of `(player_name, profile_href, club)` tuples
+    positions : list
+        Listing positions of the profiles to fetch
+    workers : int
+        Number of parallel requests
+    on_profile : callable
+        Called with the listing position and details
+    snapshots : SnapshotStore
+        Store pages rendered in the browser are saved to
+
+    Returns:
+    --------
+        List of positions that could not be read
+    """
+
+    def fetch_profile(position):
+        try:
+            details = utils.parse_profile_page(
+                fetcher.fetch(profile_links[position][1]))
+        except http_engine.JavaScriptRequired:
+            return position
+
+        on_profile(position, details)
+        return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        pending = [
+            position for position in executor.map(fetch_profile, positions)
+            if position is not None
+        ]
+
+    # Render the remaining profiles in a browser
+    if pending:
+        print(f'{len(pending)} profiles need JavaScript, using the browser')
+        return crawl_profiles(
+            profile_links, pending, workers, on_profile, snapshots)
+
+    return []
+
+
+def browse_listing(crawl_url: str, snapshots: SnapshotStore) -> list:
+    """Walk the listing pages in a pooled browser session
+
+    Args:
+    -----
+    crawl_url : str
+        EPL website
+    snapshots : SnapshotStore
+        Store each listing page is saved to
+
+    Returns:
+    --------
+        List of `(player_name, profile_href, club)` tuples
+    """
+
+    with get_browser_pool().lease() as session:
+        return collect_profile_links(session, crawl_url, snapshots)
+
+
+def list_profiles(crawl_url: str, snapshots: SnapshotStore,
+                  fetcher=None) -> list:
+    """List the season's player profiles, over HTTP
+    when a fetcher is given and the listing is served
+    without JavaScript, otherwise in the browser
+
+    Args:
+    -----
+    crawl_url : str
+        EPL website
+    snapshots : SnapshotStore
+        Store each listing page is saved to
+    fetcher : SnapshottingFetcher
+        Page fetcher of the `http` engine
+
+    Returns:
+    --------
+        List of `(player_name, profile_href, club)` tuples
+    """
+
+    if fetcher is not None:
+        try:
+            return utils.parse_listing_page(
+                fetcher.fetch(crawl_url), crawl_url)
+        except http_engine.JavaScriptRequired as error:
+            print(f'{error}, walking the listing in the browser')
+
+    return browse_listing(crawl_url, snapshots)
+
+
+@task(name='Extract Player Data', retries=2,
+      cache_expiration=cache_expiration('extract'),
+      cache_key_fn=fingerprint_input_hash)
+def extract_player_data(crawl_url: str, workers: int = 1,
+                        engine: str = 'browser', fixture_dir: str = None,
+                        resume: bool = True, use_cache: bool = True):
+    """Crawl FootballCritic website, extract players
+    data, and load it into a Pandas DataFrame. The
+    listing and each profile are checkpointed as they
+    are read, so a retry or rerun only reads the rest
+
+    Args:
+    -----
+    crawl_url : str
+        EPL website
+    workers : int
+        Number of sessions fetching profiles
+    engine : str
+        `browser` to crawl with Selenium, `http` to
+        fetch pages over HTTP and parse them with lxml
+    fixture_dir : str
+        Directory with saved HTML pages, `http` engine only
+    resume : bool
+        Resume from the checkpointed profiles,
+        otherwise crawl the whole season again
+    use_cache : bool
+        Reuse profiles cached by earlier seasons
+        that have not expired
+
+    Returns:
+    --------
+        Pandas DataFrame with EPL Demographic Data
+    """
+    checkpoint = CrawlCheckpoint.for_url(CHECKPOINT_DIR, crawl_url)
+    if not resume:
+        checkpoint.clear()
+
+    # Restore the listing and profiles read by earlier attempts
+    profile_links = None
+    profile_details = {}
+    for record in checkpoint.load():
+        if 'links' in record:
+            # Listings checkpointed before clubs were read have none
+            profile_links = [
+                (tuple(link) + (None,))[:3] for link in record['links']
+            ]
+        else:
+            profile_details[record['position']] = record['details']
+
+    cache = ProfileCache(PROFILE_CACHE_PATH) if use_cache else None
+
+    def on_profile(position, details):
+        profile_details[position] = details
+        checkpoint.append({'position': position, 'details': details})
+        if cache is not None:
+            cache.put(profile_links[position][1], details)
+
+    snapshots = SnapshotStore(SNAPSHOT_DIR)
+
+    fetcher = None
+    if engine == 'http':
+        fetcher = SnapshottingFetcher(
+            http_engine.get_fetcher(fixture_dir, workers), snapshots)
+
+    try:
+        if profile_links is None:
+            profile_links = list_profiles(crawl_url, snapshots, fetcher)
+            checkpoint.append({'links': profile_links})
+        else:
+            print(
+                f'Resuming with {len(profile_details)} of '
+                f'{len(profile_links)} profiles read'
+            )
+
+        # Take unexpired profiles from the cache
+        if cache is not None:
+            for position, (_, href, club) in enumerate(profile_links):
+                if position not in profile_details:
+                    details = cache.get(href, club)
+                    if details is not None:
+                        profile_details[position] = details
+
+        pending = [
+            position for position in range(len(profile_links))
+            if position not in profile_details
+        ]
+
+        if fetcher is not None:
+            failures = fetch_profiles(
+                fetcher, profile_links, pending, workers, on_profile,
+                snapshots)
+        else:
+            failures = crawl_profiles(
+                profile_links, pending, workers, on_profile, snapshots)
+
+    finally:
+        if fetcher is not None:
+            fetcher.close()
+
+    if failures:
+        raise RuntimeError(
+            f'{len(failures)} profiles could not be read, '
+            f'the next attempt resumes from the checkpoint'
+        )
+
+    # Merge results back in listing order, with the listing's club
+    records = [
+        utils.PlayerRecord.from_details(
+            player_name, profile_details[position], club)
+        for position, (player_name, _, club) in enumerate(profile_links)
+    ]
+
+    waits.wait_timings.report()
+    get_browser_pool().report()
+    if cache is not None:
+        cache.evict()
+        cache.report()
+
+    player_info_df = utils.records_to_frame(records)
+
+    # The season is complete, the next run starts afresh
+    checkpoint.clear()
+
+    return player_info_df
+
+
+@task(name='Reparse Player Data', retries=2)
+def reparse_player_data(crawl_url: str, snapshot_date: str = None):
+    """Rebuild a season's player data from the
+    stored listing and profile snapshots, without
+    a browser
+
+    Args:
+    -----
+    crawl_url : str
+        EPL website the snapshots were taken from
+    snapshot_date : str
+        Use snapshots taken on or before this ISO
+        date, defaults to the latest
+
+    Returns:
+    --------
+        Pandas DataFrame with EPL Demographic Data
+    """
+
+    snapshots = SnapshotStore(SNAPSHOT_DIR)
+
+    # The listing is stored whole by the `http` engine,
+    # and page by page by the browser
+    if crawl_url in snapshots:
+        profile_links = utils.parse_listing_page(
+            snapshots.get(crawl_url, snapshot_date), crawl_url)
+    else:
+        profile_links = []
+        page_num = 1
+        while page_key(crawl_url, page_num) in snapshots:
+            profile_links.extend(utils.parse_listing_page(
+                snapshots.get(page_key(crawl_url, page_num), snapshot_date),
+                crawl_url))
+            page_num += 1
+
+    records = [
+        utils.PlayerRecord.from_details(
+            player_name,
+            utils.parse_profile_page(snapshots.get(href, snapshot_date)),
+            club)
+        for player_name, href, club in profile_links
+    ]
+
+    return utils.records_to_frame(records)
 
 
 @task(name='Transformation Extract Data', retries=2)
@@ -184,12 +616,14 @@ def transform_data(df: pd.DataFrame, season_year: str):
     return df
 
 
-@task(name='Load data to GCS', retries=2, cache_key_fn=task_input_hash,
-      cache_expiration=timedelta(hours=1))
-def load_to_gcs(player_stats_df: pd.DataFrame, epl_season: str,
-                data_file_name: str):
-    """Load transformed data into Google
-    Cloud Storage Bucket
+@task(name='Load data to sinks', retries=2,
+      cache_key_fn=fingerprint_input_hash,
+      cache_expiration=cache_expiration('load'))
+def load_to_sinks(player_stats_df: pd.DataFrame, epl_season: str,
+                  data_file_name: str):
+    """Load transformed data as the season's
+    partition of the local and GCS datasets
+
     Args:
     -----
     player_stats_df : pd.DataFrame
@@ -204,17 +638,24 @@ def load_to_gcs(player_stats_df: pd.DataFrame, epl_season: str,
         None
     """
 
-    gcp_cloud_storage_bucket_block = GcsBucket.load("epl-gcs-bucket")
-
-    gcp_cloud_storage_bucket_block.upload_from_dataframe(
-        df=player_stats_df,
-        to_path=f'epl_player_data_repository/{epl_season}/{data_file_name}.parquet',
-        serialization_format='parquet_gzip'
+    sinks.fan_out(
+        player_stats_df,
+        epl_season,
+        [
+            sinks.ObjectSink(LocalObjectStore(DATA_DIR), data_file_name),
+            sinks.ObjectSink(bucket_store(),
+                             f'{GCS_DATASET_PREFIX}/{data_file_name}',
+                             name='bucket')
+        ],
+        dictionary_columns=DICTIONARY_COLUMNS
     )
 
 
 @flow(name='Get Premier League Data')
-def etl(url: str, season: str, dataset_file_name: str) -> None:
+def etl(url: str, season: str, dataset_file_name: str,
+        workers: int = 1, engine: str = 'browser',
+        resume: bool = True, reparse: bool = False,
+        snapshot_date: str = None, use_cache: bool = True) -> None:
     """ETL function to extract, transform, and
     load data it into GCS
 
@@ -226,17 +667,37 @@ def etl(url: str, season: str, dataset_file_name: str) -> None:
         EPL Season
     dataset_file_name : str
         EPL dataset file name
+    workers : int
+        Number of sessions fetching profiles
+    engine : str
+        Crawl engine, `browser` or `http`
+    resume : bool
+        Resume from the checkpointed profiles
+    reparse : bool
+        Rebuild the season from stored page snapshots
+        instead of crawling the website
+    snapshot_date : str
+        Reparse snapshots taken on or before this ISO date
+    use_cache : bool
+        Reuse unexpired profiles cached by earlier seasons
 
     Returns:
         None
     """
 
-    # Extract data
-    data_frame = extract_player_data(crawl_url=url)
+    if reparse:
+        # Rebuild data from snapshots
+        data_frame = reparse_player_data(crawl_url=url,
+                                         snapshot_date=snapshot_date)
+    else:
+        # Extract data
+        data_frame = extract_player_data(crawl_url=url, workers=workers,
+                                         engine=engine, resume=resume,
+                                         use_cache=use_cache)
     # Transform data
     data_frame = transform_data(data_frame, season)
-    # Load to GCS
-    load_to_gcs(data_frame, season, dataset_file_name)
+    # Load to local and GCS
+    load_to_sinks(data_frame, season, dataset_file_name)
 
 
 if __name__ == '__main__':
@@ -246,13 +707,27 @@ if __name__ == '__main__':
     )
     arg_parser.add_argument('--season_year', type=str, required=True)
     arg_parser.add_argument('--season_tag', type=str, required=True)
-
-    season = arg_parser.parse_args().season_year
-    tag = arg_parser.parse_args().season_tag
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--engine', type=str, default='browser',
+                            choices=['browser', 'http'])
+    arg_parser.add_argument('--fresh', action='store_true',
+                            help='Ignore checkpoints and crawl everything')
+    arg_parser.add_argument('--reparse', action='store_true',
+                            help='Rebuild the season from stored snapshots')
+    arg_parser.add_argument('--snapshot_date', type=str, default=None)
+    arg_parser.add_argument('--no_cache', action='store_true',
+                            help='Re-crawl every profile of the season')
+
+    args = arg_parser.parse_args()
+    season = args.season_year
+    tag = args.season_tag
 
     DATASET_FILE_NAME = 'epl_player_data'
 
     # Construct URL
     web_url = f'https://www.footballcritic.com/premier-league/season-{season}/player-stats/all/2/{tag}'
 
-    etl(url=web_url, season=season, dataset_file_name=DATASET_FILE_NAME)
+    etl(url=web_url, season=season, dataset_file_name=DATASET_FILE_NAME,
+        workers=args.workers, engine=args.engine, resume=not args.fresh,
+        reparse=args.reparse, snapshot_date=args.snapshot_date,
+        use_cache=not args.no_cache)
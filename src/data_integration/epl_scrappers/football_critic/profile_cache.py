@@ -0,0 +1,262 @@
+""" Cross-season cache of FootballCritic player
+profiles, so unchanged profiles are not re-crawled """
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import date, datetime
+from contextlib import closing
+
+
+DAY = 24 * 60 * 60
+
+# How long each profile detail stays fresh, in seconds.
+# `Age:` is recomputed from the date of birth instead
+FIELD_TTLS = {
+    'Club:': 30 * DAY,
+    'Position:': 180 * DAY,
+    'Previous teams:': 180 * DAY,
+    'Weight:': 365 * DAY,
+    'Height:': 3 * 365 * DAY,
+    'Nationality:': 10 * 365 * DAY,
+    'Prefered foot:': 10 * 365 * DAY
+}
+
+# Profiles kept before the least recently used are evicted
+MAX_ENTRIES = 10_000
+
+
+def refresh_age(age_text: str, today: date = None) -> str:
+    """Recompute an `Age:` value such as
+    `30 years (28-07-1993)` from its date of birth
+
+    Args:
+    -----
+    age_text : str
+        Age value shown on the profile
+    today : date
+        Date to compute the age at, defaults to today
+
+    Returns:
+    --------
+        Age value with the age as of `today`
+    """
+
+    today = today or date.today()
+
+    try:
+        dob_text = age_text[age_text.index('(') + 1:age_text.index(')')]
+        dob = datetime.strptime(dob_text, '%d-%m-%Y').date()
+    except ValueError:
+        return age_text
+
+    years = today.year - dob.year - (
+        (today.month, today.day) < (dob.month, dob.day))
+
+    return f'{years} years ({dob_text})'
+
+
+def set_detail(details: list, label: str, value: str) -> None:
+    """Set the value following `label` in profile
+    details, appending the pair when it is missing
+
+    Args:
+    -----
+    details : list
+        List of player details, changed in place
+    label : str
+        Profile label, e.g. `Club:`
+    value : str
+        New value
+
+    Returns:
+    --------
+        None
+    """
+
+    for index in range(len(details) - 1):
+        if details[index] == label:
+            details[index + 1] = value
+            return
+
+    details.extend([label, value])
+
+
+class ProfileCache:
+    """Persistent profile details keyed by profile
+    href, with a fetch time and TTL per detail and
+    least recently used eviction
+
+    Args:
+    -----
+    path : str
+        SQLite database file
+    field_ttls : dict
+        Seconds each profile label stays fresh
+    max_entries : int
+        Profiles kept after `evict`
+    """
+
+    def __init__(self, path: str, field_ttls: dict = None,
+                 max_entries: int = MAX_ENTRIES):
+        self.path = path
+        self.field_ttls = field_ttls or FIELD_TTLS
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.refreshed = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # `fetched_at` maps each label to when it was fetched
+        self._execute(
+            'CREATE TABLE IF NOT EXISTS profiles ('
+            'href TEXT PRIMARY KEY, '
+            'details TEXT NOT NULL, '
+            'fetched_at TEXT NOT NULL, '
+            'last_used REAL NOT NULL)'
+        )
+
+    def _execute(self, sql: str, parameters: tuple = ()):
+        """Run one statement and return its first row"""
+
+        with closing(sqlite3.connect(self.path, timeout=30)) as connection:
+            with connection:
+                return connection.execute(sql, parameters).fetchone()
+
+    def _label_times(self, details: list, fetched_at) -> dict:
+        """Fetch time of each label, profiles cached
+        with one time for all labels are read too"""
+
+        if isinstance(fetched_at, str):
+            fetched_at = json.loads(fetched_at)
+        if isinstance(fetched_at, dict):
+            return fetched_at
+
+        return {
+            label: fetched_at
+            for label in details if label in self.field_ttls
+        }
+
+    def _stale_labels(self, label_times: dict, now: float) -> list:
+        return [
+            label for label, fetched_at in label_times.items()
+            if now - fetched_at >= self.field_ttls.get(label, float('inf'))
+        ]
+
+    def get(self, href: str, club: str = None):
+        """Return the cached details of a profile,
+        or None when it is missing or one of its
+        details has expired. A club read from the
+        listing replaces the cached one, so the
+        short-lived `Club:` never expires a profile
+
+        Args:
+        -----
+        href : str
+            Profile href
+        club : str
+            Club shown on the listing row, if any
+
+        Returns:
+        --------
+            List of player details | None
+        """
+
+        now = time.time()
+        row = self._execute(
+            'SELECT details, fetched_at FROM profiles WHERE href = ?',
+            (href,))
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        details = json.loads(row[0])
+        label_times = self._label_times(details, row[1])
+
+        if club is not None:
+            set_detail(details, 'Club:', club)
+            label_times['Club:'] = now
+
+        if self._stale_labels(label_times, now):
+            with self._lock:
+                self.expired += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if club is not None:
+                self.refreshed += 1
+            self._execute(
+                'UPDATE profiles SET details = ?, fetched_at = ?, '
+                'last_used = ? WHERE href = ?',
+                (json.dumps(details), json.dumps(label_times), now, href))
+
+        # Age moves on without re-fetching the profile
+        for index in range(len(details) - 1):
+            if details[index] == 'Age:':
+                details[index + 1] = refresh_age(details[index + 1])
+
+        return details
+
+    def put(self, href: str, details: list) -> None:
+        """Store freshly fetched profile details
+
+        Args:
+        -----
+        href : str
+            Profile href
+        details : list
+            List of player details
+
+        Returns:
+        --------
+            None
+        """
+
+        now = time.time()
+        label_times = {
+            label: now for label in details if label in self.field_ttls
+        }
+
+        with self._lock:
+            self._execute(
+                'INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?)',
+                (href, json.dumps(details), json.dumps(label_times), now))
+
+    def evict(self) -> int:
+        """Drop the least recently used profiles
+        beyond `max_entries`
+
+        Returns:
+        --------
+            Number of profiles evicted
+        """
+
+        with self._lock:
+            count = self._execute('SELECT COUNT(*) FROM profiles')[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self._execute(
+                    'DELETE FROM profiles WHERE href IN ('
+                    'SELECT href FROM profiles '
+                    'ORDER BY last_used LIMIT ?)', (excess,))
+
+        return max(excess, 0)
+
+    def report(self) -> None:
+        """Print the hit rate of this run"""
+
+        lookups = self.hits + self.misses + self.expired
+        if lookups:
+            print(
+                f'Profile cache: {self.hits}/{lookups} hits '
+                f'({self.hits / lookups:.0%}), {self.misses} new, '
+                f'{self.expired} expired, {self.refreshed} clubs '
+                f'refreshed from the listing'
+            )
@@ -1,76 +1,227 @@
 """ Utility functions for the ELT """
 
 from datetime import datetime
+from urllib.parse import urljoin
 import numpy as np
+import pandas as pd
+import pyarrow as pa
+from lxml import etree, html
 
+from common.http_engine import JavaScriptRequired
+
+
+# Compiled selectors for listing and profile pages
+PLAYER_LINK_XPATH = etree.XPath('//a[@class="only_desktop"]')
+ADD_INFO_ITEM_XPATH = etree.XPath('//ul[@class="add-info"]/li')
+# Team link on a player's listing row, relative to the player link
+ROW_CLUB_XPATH = etree.XPath('ancestor::tr[1]//a[contains(@href, "/team/")]')
+
+
+# Profile labels mapped to the player record field they fill
+DETAIL_FIELDS = {
+    'Club:': 'club',
+    'Nationality:': 'nationality',
+    'Age:': 'age',
+    'Position:': 'position',
+    'Prefered foot:': 'prefered_foot',
+    'Height:': 'height',
+    'Weight:': 'weight',
+    'Previous teams:': 'previous_teams'
+}
+
+# Player record fields mapped to DataFrame columns
+COLUMNS = {
+    'player_name': 'Player Names',
+    'club': 'Club',
+    'nationality': 'Nationality',
+    'age': 'Age',
+    'position': 'Position',
+    'prefered_foot': 'Prefered Foot',
+    'height': 'Height',
+    'weight': 'Weight',
+    'previous_teams': 'Previous Teams'
+}
+
+PLAYER_SCHEMA = pa.schema(
+    [(column, pa.string()) for column in COLUMNS.values()]
+    + [('CreatedAt', pa.timestamp('us')), ('UpdatedAt', pa.timestamp('us'))]
+)
+
+
+class PlayerRecord:
+    """One player's profile details, missing
+    details are left as None
 
-def fill_missing_attribute_with_nan(info_dict: str) -> dict:
-    """Compare the length of `Player Names` with that
-    of other attributes, and fill in attributes with
-    not matching length with NaN values.
-    
     Args:
     -----
-    info_dict : dict
-        Dictionary with player information
+    player_name : str
+        Player full name
+    """
+
+    __slots__ = tuple(COLUMNS)
+
+    def __init__(self, player_name: str):
+        self.player_name = player_name
+        self.club = None
+        self.nationality = None
+        self.age = None
+        self.position = None
+        self.prefered_foot = None
+        self.height = None
+        self.weight = None
+        self.previous_teams = None
+
+    @classmethod
+    def from_details(cls, player_name: str, details: list,
+                     club: str = None):
+        """Build a record from a profile's `add-info`
+        lines, where each label is followed by its value
+
+        Args:
+        -----
+        player_name : str
+            Player full name
+        details : list
+            List of player details
+        club : str
+            Club on the season's listing row, replaces
+            the profile's current club when given
+
+        Returns:
+        --------
+            PlayerRecord
+        """
+
+        record = cls(player_name)
+        field_for = DETAIL_FIELDS.get
+
+        for index in range(len(details) - 1):
+            field = field_for(details[index])
+            # Keep the first value when a label repeats
+            if field is not None and getattr(record, field) is None:
+                setattr(record, field, details[index + 1])
+
+        # The listing is the season's, the profile shows today's club
+        if club is not None:
+            record.club = club
+
+        return record
+
+
+def records_to_table(records: list, created_at: datetime = None) -> pa.Table:
+    """Build a typed Arrow table from player records
+    in one step, with one ingestion timestamp
+
+    Args:
+    -----
+    records : list
+        List of PlayerRecord
+    created_at : datetime
+        Ingestion timestamp, defaults to now (UTC)
 
     Returns:
-        info_dict : dict
+    --------
+        pa.Table with the `PLAYER_SCHEMA` columns
     """
 
-    player_atts = [
-        'Club', 'Nationality', 'Age', 'Position', 'Prefered Foot',
-        'Height', 'Weight', 'Previous Teams'
-        ]
+    created_at = created_at or datetime.utcnow()
 
-    for att in player_atts:
-        if len(info_dict['Player Names']) != len(info_dict[att]):
-            info_dict[att].append(np.nan)
+    arrays = [
+        pa.array([getattr(record, field) for record in records], pa.string())
+        for field in COLUMNS
+    ]
+    timestamps = pa.array(
+        np.full(len(records), np.datetime64(created_at, 'us')),
+        pa.timestamp('us'))
 
-    return info_dict
+    return pa.Table.from_arrays(
+        arrays + [timestamps, timestamps], schema=PLAYER_SCHEMA)
 
 
-def add_player_details(details: list, info_dict: dict) -> dict:
-    """Takes a list of player details, extracts
-    the relevant player details from it, add it's to
-    the `info_dict` dictionary. In the case that
-    a detail is missing, if fills it in with NaN
+def records_to_frame(records: list,
+                     created_at: datetime = None) -> pd.DataFrame:
+    """Build the player info DataFrame from
+    player records
 
     Args:
     -----
-    details : list
-        List of player details
-    info_dict : list
-        Dictionary with player information
+    records : list
+        List of PlayerRecord
+    created_at : datetime
+        Ingestion timestamp, defaults to now (UTC)
+
+    Returns:
+    --------
+        Pandas DataFrame with EPL Demographic Data
+    """
+
+    return records_to_table(records, created_at).to_pandas()
+
+
+def parse_listing_page(page_html: str, base_url: str) -> list:
+    """Extract player names, profile hrefs and
+    clubs from a player stats listing page
+
+    Args:
+    -----
+    page_html : str
+        Listing page HTML
+    base_url : str
+        URL the page was fetched from
 
     Returns:
     --------
-        info_dict : dict
+        List of `(player_name, profile_href, club)`
+        tuples, club is None when the row shows none
     """
 
-    # Add player details available
-    for index, detail in enumerate(details, start=0):
-        if detail == 'Club:':
-            info_dict['Club'].append(details[index + 1])
-        if detail == 'Nationality:':
-            info_dict['Nationality'].append(details[index + 1])
-        if detail == 'Age:':
-            info_dict['Age'].append(details[index + 1])
-        if detail == 'Position:':
-            info_dict['Position'].append(details[index + 1])
-        if detail == 'Prefered foot:':
-            info_dict['Prefered Foot'].append(details[index + 1])
-        if detail == 'Height:':
-            info_dict['Height'].append(details[index + 1])
-        if detail == 'Weight:':
-            info_dict['Weight'].append(details[index + 1])
-        if detail == 'Previous teams:':
-            info_dict['Previous Teams'].append(details[index + 1])
-
-    # Update `CreatedAt` and `UpdatedAt`
-    cur_datetime = datetime.utcnow()
-    info_dict['CreatedAt'].append(cur_datetime)
-    info_dict['UpdatedAt'].append(cur_datetime)
-
-    # Fill in player details missing
-    return fill_missing_attribute_with_nan(info_dict)
+    tree = html.fromstring(page_html)
+    players = PLAYER_LINK_XPATH(tree)
+
+    if not players:
+        raise JavaScriptRequired(f'No player rows served at {base_url}')
+
+    profile_links = []
+    for player in players:
+        clubs = ROW_CLUB_XPATH(player)
+        profile_links.append((
+            player.text_content().strip(),
+            urljoin(base_url, player.get('href')),
+            ' '.join(clubs[0].text_content().split()) if clubs else None
+        ))
+
+    return profile_links
+
+
+def parse_profile_page(page_html: str) -> list:
+    """Extract the `add-info` lines of a player
+    profile page, label followed by value, the
+    same way the browser renders them
+
+    Args:
+    -----
+    page_html : str
+        Profile page HTML
+
+    Returns:
+    --------
+        List of player details
+    """
+
+    tree = html.fromstring(page_html)
+    items = ADD_INFO_ITEM_XPATH(tree)
+
+    if not items:
+        raise JavaScriptRequired('No `add-info` list served')
+
+    details = []
+    for item in items:
+        texts = [
+            ' '.join(text.split()) for text in item.itertext() if text.strip()
+        ]
+        if texts:
+            # Missing values are shown as `-` on the website
+            details.append(texts[0])
+            details.append(' '.join(texts[1:]) or '-')
+
+    return details
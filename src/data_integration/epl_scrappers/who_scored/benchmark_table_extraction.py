@@ -0,0 +1,122 @@
+"""Benchmark per-page stats table extraction,
+cell by cell against the single-call modes"""
+
+import time
+import argparse
+import statistics
+
+from selenium.webdriver.support import expected_conditions as EC
+
+from etl_web_to_gcs import get_driver, open_stats_page, EXTRACTION_MODES, \
+    STATS_ROW_LOCATOR, NEXT_PAGE_LOCATOR, waits
+
+
+def time_extraction(driver, mode: str, repeats: int) -> tuple:
+    """Time one extraction mode on the current page
+
+    Args:
+    -----
+    driver : webdriver.Chrome | webdriver.Firefox
+        Browser session on a stats page
+    mode : str
+        Extraction mode to time
+    repeats : int
+        Number of timed runs
+
+    Returns:
+    --------
+        Tuple of (timings in seconds, last extracted stats)
+    """
+
+    extract_stats = EXTRACTION_MODES[mode]
+    timings = []
+    page_stats = None
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        page_stats = extract_stats(driver)
+        timings.append(time.perf_counter() - start)
+
+    return timings, page_stats
+
+
+def run_benchmark(web_url: str, pages: int, repeats: int) -> None:
+    """Compare extraction modes over the first
+    `pages` pages of a season's stats table
+
+    Args:
+    -----
+    web_url : str
+        WhoScored player statistics URL
+    pages : int
+        Number of pages to benchmark
+    repeats : int
+        Number of timed runs per mode and page
+
+    Returns:
+    --------
+        None
+    """
+
+    driver = get_driver()
+    totals = {mode: [] for mode in EXTRACTION_MODES}
+
+    try:
+        open_stats_page(driver, web_url)
+        waits.wait_for(driver, waits.rows_present(STATS_ROW_LOCATOR),
+                       'stats table')
+
+        for page in range(1, pages + 1):
+            results = {}
+            for mode in EXTRACTION_MODES:
+                timings, page_stats = time_extraction(driver, mode, repeats)
+                totals[mode].extend(timings)
+                results[mode] = page_stats
+
+            for mode, page_stats in results.items():
+                if page_stats != results['elements']:
+                    print(f'Page {page}: {mode} disagrees with elements')
+
+            print(
+                f'Page {page}: ' + ', '.join(
+                    f'{mode} {statistics.mean(totals[mode][-repeats:]) * 1000:.1f} ms'
+                    for mode in EXTRACTION_MODES
+                )
+            )
+
+            if page == pages:
+                break
+
+            next_page_btn = waits.wait_for(
+                driver, EC.element_to_be_clickable(NEXT_PAGE_LOCATOR),
+                'next button')
+            previous_row = waits.first_element(driver, STATS_ROW_LOCATOR)
+            next_page_btn.click()
+            waits.wait_for(
+                driver, waits.page_replaced(previous_row, STATS_ROW_LOCATOR),
+                'next page')
+
+    finally:
+        driver.close()
+
+    elements_mean = statistics.mean(totals['elements'])
+    for mode, timings in totals.items():
+        mode_mean = statistics.mean(timings)
+        print(
+            f'Mean per page: {mode} {mode_mean * 1000:.1f} ms '
+            f'({elements_mean / mode_mean:.1f}x elements)'
+        )
+
+
+if __name__ == '__main__':
+
+    arg_parser = argparse.ArgumentParser(
+        description='Benchmark stats table extraction'
+    )
+    arg_parser.add_argument('--web_url', type=str, required=True)
+    arg_parser.add_argument('--pages', type=int, default=3)
+    arg_parser.add_argument('--repeats', type=int, default=5)
+
+    args = arg_parser.parse_args()
+
+    run_benchmark(args.web_url, args.pages, args.repeats)
@@ -1,14 +1,20 @@
 import os
+import sys
 import argparse
-import numpy as np
-import pandas as pd
-from datetime import timedelta
+import pyarrow as pa
 from dotenv import load_dotenv
 
 from prefect import flow, task
-from prefect_gcp import GcpCredentials
-from prefect.tasks import task_input_hash
-from prefect_gcp.cloud_storage import GcsBucket
+
+# Make the shared `common` package importable when run as a script
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from common import column_schema
+from common import object_store
+from common import parquet_dataset
+from common import parquet_stream
+from common import warehouse
 
 
 # Take env variables from .env
@@ -17,112 +23,148 @@ load_dotenv()
 # Catch env variables
 project_id = os.getenv('PROJECT_ID')
 player_stats_table = os.getenv('PLAYER_STATS_TABLE')
+warehouse_backend = os.getenv('WAREHOUSE', 'bigquery')
+
+# Columns identifying a row, the key of dbt's `player_stats_id`
+KEY_COLUMNS = ['Player', 'Season']
+
+# Dataset of the season objects in the bucket
+GCS_DATASET_PATH = 'epl_player_stats_repository/epl_player_stats_data'
+
+# Types of the BigQuery table, from its Terraform schema
+TABLE_SCHEMA = column_schema.read_schema('player_stats_data.json')
+
+
+def get_object_source(local_dir: str = None):
+    """Store the season's object is streamed from,
+    the bucket unless a local directory mirroring
+    it is given"""
 
+    if local_dir:
+        return object_store.LocalObjectStore(local_dir)
 
-@task(name='extract from GCS', retries=2,
-      cache_expiration=timedelta(microseconds=1),
-      cache_key_fn=task_input_hash)
-def extract_from_gcs_to_local(gcs_file_path: str) -> str:
-    """Download objects within a folder
-    from the bucket
+    return object_store.bucket_store()
+
+
+def transform_batch(batch: pa.RecordBatch) -> pa.Table:
+    """Clean and type a batch of rows column-wise
+    in Arrow, as the BigQuery table schema declares
 
     Args:
     -----
-    gcs_file_path : str
-        Folder path in GCS
+    batch : pa.RecordBatch
+        Rows of the season's file
 
     Returns:
-        local file path to data
+    --------
+        table : pa.Table with `RowKey` and `RowHash`
     """
 
-    gcp_cloud_storage_bucket = GcsBucket.load("epl-gcs-bucket")
+    # `-` where there is no record becomes null, `PS%`
+    # is renamed to the valid BigQuery name `PS_`
+    table = column_schema.clean_and_cast(
+        pa.Table.from_batches([batch]), TABLE_SCHEMA)
 
-    gcp_cloud_storage_bucket.get_directory(
-        from_path=gcs_file_path,
-        local_path='./'
-    )
+    # Key and content hash, compared with the last load
+    return warehouse.add_row_hashes(table, KEY_COLUMNS)
+
+
+def get_warehouse_loader():
+    """Loader of the `WAREHOUSE` backend, BigQuery
+    unless set to `duckdb`"""
 
-    return f'./{gcs_file_path}'
+    if warehouse_backend == 'duckdb':
+        return warehouse.DuckDBLoader()
 
+    # Imported here, the DuckDB backend runs without GCP libraries
+    from common import clients
 
-@task(name='Transform to DataFrame', retries=2)
-def transform_to_df(data_file_path: str):
-    """Load data into Pandas DataFrame
+    # Built once per process, shared by every load
+    return warehouse.BigQueryLoader(clients.bigquery_client(project_id))
+
+
+def load_object(object_path: str, source, loader,
+                snapshot: warehouse.LoadSnapshot) -> dict:
+    """Stream a season's Parquet object batch by
+    batch through the clean stage and merge the rows
+    new or changed since the last load into the
+    warehouse, in a single load job
 
     Args:
     -----
-    data_file_path : str
-        file path to data
+    object_path : str
+        Path of the season's object
+    source : ObjectStore
+        Where the object is read from
+    loader : BigQueryLoader | DuckDBLoader
+        Warehouse backend
+    snapshot : LoadSnapshot
+        Hashes of the rows last loaded
 
     Returns:
     --------
-        df : pd.DataFrame
+        Report of `warehouse.load_batches`
     """
 
-    df = pd.read_parquet(data_file_path)
-
-    # Filter values with NaN where there is no record
-    df['Goals'] = df['Goals'].replace('-', np.nan)
-    df['Assists'] = df['Assists'].replace('-', np.nan)
-    df['Yel'] = df['Yel'].replace('-', np.nan)
-    df['Red'] = df['Red'].replace('-', np.nan)
-    df['SpG'] = df['SpG'].replace('-', np.nan)
-    df['PS_'] = df['PS%'].replace('-', np.nan)
-    df['AerialsWon'] = df['AerialsWon'].replace('-', np.nan)
-    df['MotM'] = df['MotM'].replace('-', np.nan)
-
-    # Remove `PS%` field
-    df.drop(columns='PS%', inplace=True)
+    batches = parquet_stream.iter_batches(source, object_path)
 
-    return df
+    return warehouse.load_batches(
+        batches, player_stats_table, loader,
+        transform=transform_batch, snapshot=snapshot)
 
 
+# Not cached: the arguments only name the object, which is
+# rewritten in place when a season is scraped again. The
+# load snapshot already skips the rows that did not change
 @task(name='load to BigQuery', retries=2)
-def load_to_bq(df: pd.DataFrame) -> None:
-    """Load DataFrame to BigQuery
+def load_to_bq(gcs_file_path: str, local_dir: str = None,
+               force: bool = False) -> None:
+    """Load a season's object from GCS, only the
+    rows new or changed since the last load
 
     Args:
-    df : pd.DataFrame
-        A pandas DataFrame with EPL stats data
+    -----
+    gcs_file_path : str
+        Object path in GCS
+    local_dir : str
+        Local directory standing in for the bucket
+    force : bool
+        Merge every row, even if unchanged
 
     Returns:
+    --------
         None
     """
 
-    gcp_credentials = GcpCredentials.load("epl-analytics-gcs-credentials")
+    loader = get_warehouse_loader()
+    snapshot = warehouse.LoadSnapshot.for_table(loader, player_stats_table)
+    if force:
+        snapshot.clear()
 
-    df.to_gbq(
-        project_id=project_id,
-        destination_table=player_stats_table,
-        credentials=gcp_credentials.get_credentials_from_service_account(),
-        chunksize=300,
-        if_exists="append"
-    )
+    load_object(gcs_file_path, get_object_source(local_dir), loader, snapshot)
 
 
 @flow(name='GCS to BigQuery')
-def etl(gcs_file_path: str):
+def etl(gcs_file_path: str, local_dir: str = None, force: bool = False):
     """Flow responsible for call func
     to get data from GCS to BigQuery
 
     Args:
     -----
-    gcs_folder_path : str
-        Folder path in GCS
+    gcs_file_path : str
+        Object path in GCS
+    local_dir : str
+        Local directory standing in for the bucket
+    force : bool
+        Merge every row, even if unchanged
 
     Returns:
     --------
         None
     """
 
-    # Load data to BigQuery
-    file_path = extract_from_gcs_to_local(gcs_file_path)
-
-    # Load data into Pandas DataFrame
-    df = transform_to_df(file_path)
-
-    # Load data to BigQuery
-    load_to_bq(df)
+    # Stream, clean and load data to BigQuery
+    load_to_bq(gcs_file_path, local_dir, force)
 
 
 if __name__ == '__main__':
@@ -130,15 +172,15 @@ if __name__ == '__main__':
         description='Pass Season Year'
     )
     arg_parser.add_argument('--season_year', type=str, required=True)
+    arg_parser.add_argument('--local_dir', type=str, default=None,
+                            help='Read from a local copy of the bucket')
+    arg_parser.add_argument('--force', action='store_true',
+                            help='Merge every row, even if unchanged')
 
-    season = arg_parser.parse_args().season_year
-
-    current_local_path = os.path.dirname(__file__)
+    args = arg_parser.parse_args()
+    season = args.season_year
 
-    GCS_PATH = (
-        f'epl_player_stats_repository/{season}/'
-        f'epl_player_stats_data.gz.parquet'
-    )
+    GCS_PATH = parquet_dataset.partition_path(GCS_DATASET_PATH, season)
 
     # Extract data from GCS to BigQuery
-    etl(GCS_PATH)
+    etl(GCS_PATH, args.local_dir, args.force)
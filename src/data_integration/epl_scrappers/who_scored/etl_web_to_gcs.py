@@ -1,23 +1,32 @@
 """Module implementing ETL Pipeline"""
 
 import os
+import sys
 import ssl
 import time
 import argparse
-from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from dotenv import load_dotenv
 import pandas as pd
 
+# Make the shared `common` package importable when run as a script
+sys.path.append(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import utils
+from common import browser_pool, sinks, waits
+from common.checkpoint import CrawlCheckpoint
+from common.object_store import LocalObjectStore, bucket_store
+from common.snapshots import SnapshotStore, page_key
+from common.http_engine import JavaScriptRequired
+from common.cache_keys import cache_expiration, fingerprint_input_hash
+
 # Import Prefect
 from prefect import flow, task
-from prefect.tasks import task_input_hash
-from prefect_gcp.cloud_storage import GcsBucket
 
 # Selenium Imports
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, \
     ElementClickInterceptedException
@@ -32,14 +41,329 @@ driver_name = os.getenv('DRIVER_NAME')
 # Disabling SSL Certificate verification on my machine - not related to code
 ssl._create_default_https_context = ssl._create_unverified_context
 
+DATASET_FILE_NAME = 'epl_player_stats_data'
+
+# Local dataset directory and GCS dataset prefix
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'Data')
+GCS_DATASET_PREFIX = 'epl_player_stats_repository'
+
+# Low-cardinality columns, dictionary encoded in Parquet
+DICTIONARY_COLUMNS = ['Player', 'Season']
+
+# Completed pages of interrupted crawls are kept here
+CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), 'Checkpoints')
+
+# Raw pages of every crawl are kept here for reparsing
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'Snapshots')
+
+# Attempts at reading or leaving a page before giving up
+MAX_PAGE_ATTEMPTS = 3
+
+# WhoScored URL tags and number of stats pages per season
+season_url_details = {
+    '2012-2013': {'url_first_tag': '3389', 'url_second_tag': '6531', 'page_size': 54},
+    '2013-2014': {'url_first_tag': '3853', 'url_second_tag': '7794', 'page_size': 57},
+    '2014-2015': {'url_first_tag': '4311', 'url_second_tag': '9155', 'page_size': 55},
+    '2015-2016': {'url_first_tag': '5826', 'url_second_tag': '12496', 'page_size': 57},
+    '2016-2017': {'url_first_tag': '6335', 'url_second_tag': '13796', 'page_size': 55},
+    '2017-2018': {'url_first_tag': '6829', 'url_second_tag': '15151', 'page_size': 53},
+    '2018-2019': {'url_first_tag': '7361', 'url_second_tag': '16368', 'page_size': 51},
+    '2019-2020': {'url_first_tag': '7811', 'url_second_tag': '17590', 'page_size': 53},
+    '2020-2021': {'url_first_tag': '8228', 'url_second_tag': '18685', 'page_size': 54},
+    '2021-2022': {'url_first_tag': '8618', 'url_second_tag': '19793', 'page_size': 55},
+    '2022-2023': {'url_first_tag': '9075', 'url_second_tag': '20934', 'page_size': 57}
+}
+
+# Locators used to tell when a stats page is ready
+STATS_ROW_LOCATOR = (By.XPATH, utils.STAT_XPATHS['Mins'])
+NEXT_PAGE_LOCATOR = (By.ID, 'next')
+ALL_PLAYERS_LOCATOR = (
+    By.XPATH, "//a[@class='option ' and contains(., 'All players')]")
+
+
+def get_driver():
+    """Start the browser selected by the
+    `DRIVER_NAME` env variable
+
+    Returns:
+    --------
+        webdriver.Chrome | webdriver.Firefox
+    """
+
+    return browser_pool.driver_factory(driver_name)()
+
+
+def get_browser_pool() -> browser_pool.BrowserPool:
+    """Return this process's pool of sessions
+    of the `DRIVER_NAME` browser
+
+    Returns:
+    --------
+        BrowserPool
+    """
+
+    return browser_pool.get_pool(
+        'who_scored', browser_pool.driver_factory(driver_name))
+
+
+def open_stats_page(driver, web_url: str) -> None:
+    """Open the player statistics page and
+    switch the table to `All players`
+
+    Args:
+    -----
+    driver : webdriver.Chrome | webdriver.Firefox
+        Browser session
+    web_url : str
+        web_url to extract data from
+
+    Returns:
+    --------
+        None
+    """
+
+    # Open web browser and wait for it to load
+    driver.get(web_url)
+
+    # Click `All players` button
+    all_players_btn = waits.wait_for(
+        driver, EC.element_to_be_clickable(ALL_PLAYERS_LOCATOR),
+        'all players button')
+    previous_row = waits.first_element(driver, STATS_ROW_LOCATOR)
+    all_players_btn.click()
+
+    # Wait for the table to switch to all players
+    if previous_row is not None:
+        waits.wait_for(
+            driver, waits.page_replaced(previous_row, STATS_ROW_LOCATOR),
+            'all players table')
+
+
+# Evaluates every stat XPATH in the browser and returns
+# the text of the matched cells, column by column
+STATS_TABLE_SCRIPT = """
+const xpaths = arguments[0];
+const table = {};
+for (const [statName, xpath] of Object.entries(xpaths)) {
+    const nodes = document.evaluate(
+        xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const values = [];
+    for (let i = 0; i < nodes.snapshotLength; i++) {
+        values.push(nodes.snapshotItem(i).innerText.trim());
+    }
+    table[statName] = values;
+}
+return table;
+"""
+
+
+def extract_stats_by_element(driver, page_source: str = None) -> dict:
+    """Read the stats table on the current page
+    one WebDriver call per cell
+
+    Args:
+    -----
+    driver : webdriver.Chrome | webdriver.Firefox
+        Browser session on a stats page
+    page_source : str
+        Not used, the cells are read from the browser
+
+    Returns:
+    --------
+        Dictionary of stat name to cell values
+    """
+
+    page_stats = {}
+    for stat_name, xpath in utils.STAT_XPATHS.items():
+        elements = driver.find_elements(By.XPATH, xpath)
+        page_stats[stat_name] = [element.text for element in elements]
+
+    return utils.drop_region_labels(page_stats)
+
+
+def extract_stats_bulk(driver, page_source: str = None) -> dict:
+    """Read the whole stats table on the current
+    page in a single `execute_script` call
+
+    Args:
+    -----
+    driver : webdriver.Chrome | webdriver.Firefox
+        Browser session on a stats page
+    page_source : str
+        Not used, the table is read from the browser
+
+    Returns:
+    --------
+        Dictionary of stat name to cell values
+    """
+
+    page_stats = driver.execute_script(STATS_TABLE_SCRIPT, utils.STAT_XPATHS)
+
+    return utils.drop_region_labels(page_stats)
+
+
+def extract_stats_from_source(driver, page_source: str = None) -> dict:
+    """Read the rendered page source in a single
+    call and parse the stats table locally with lxml
+
+    Args:
+    -----
+    driver : webdriver.Chrome | webdriver.Firefox
+        Browser session on a stats page
+    page_source : str
+        Source already read from the browser, read
+        from `driver` when None
+
+    Returns:
+    --------
+        Dictionary of stat name to cell values
+    """
+
+    if page_source is None:
+        page_source = driver.page_source
+
+    return utils.parse_stats_table(page_source)
+
+
+EXTRACTION_MODES = {
+    'bulk': extract_stats_bulk,
+    'elements': extract_stats_by_element,
+    'html': extract_stats_from_source
+}
+
+
+def read_page(driver, extract_stats, data_page: int) -> tuple:
+    """Read the stats table and source of the
+    current page, retrying up to `MAX_PAGE_ATTEMPTS`
+    times. The source is read once, for the
+    snapshot and the `html` mode to share
+
+    Args:
+    -----
+    driver : webdriver.Chrome | webdriver.Firefox
+        Browser session on a stats page
+    extract_stats : callable
+        Extraction mode function
+    data_page : int
+        Current page number
+
+    Returns:
+    --------
+        Tuple of the stat name to cell values
+        dictionary and the page source
+    """
+
+    for attempt in range(1, MAX_PAGE_ATTEMPTS + 1):
+        try:
+            waits.wait_for(
+                driver, waits.rows_present(STATS_ROW_LOCATOR), 'stats table')
+
+            # Find elements with player stats on the current page
+            page_source = driver.page_source
+            return extract_stats(driver, page_source), page_source
+
+        except (TimeoutException, JavaScriptRequired):
+            print(
+                f'TimeoutException occurred on page {data_page}, '
+                f'attempt {attempt} of {MAX_PAGE_ATTEMPTS}'
+            )
+
+    raise TimeoutException(f'Stats table on page {data_page} did not load')
+
+
+def go_to_next_page(driver, data_page: int) -> None:
+    """Click the `Next` button and wait for the
+    next page of the stats table, retrying up to
+    `MAX_PAGE_ATTEMPTS` times
+
+    Args:
+    -----
+    driver : webdriver.Chrome | webdriver.Firefox
+        Browser session on a stats page
+    data_page : int
+        Current page number
+
+    Returns:
+    --------
+        None
+    """
+
+    for attempt in range(1, MAX_PAGE_ATTEMPTS + 1):
+        next_page_btn = waits.wait_for(
+            driver, EC.presence_of_element_located(NEXT_PAGE_LOCATOR),
+            'next button')
+
+        try:
+            # Scroll to the next page button to ensure it's clickable
+            driver.execute_script(
+                "arguments[0].scrollIntoView();", next_page_btn)
+            waits.wait_for(
+                driver, EC.element_to_be_clickable(next_page_btn),
+                'next button clickable')
+
+            # Click the "Next" button
+            previous_row = waits.first_element(driver, STATS_ROW_LOCATOR)
+            next_page_btn.click()
+
+            # Wait for the new page to load before continuing
+            waits.wait_for(
+                driver,
+                waits.page_replaced(previous_row, STATS_ROW_LOCATOR)
+                if previous_row is not None
+                else EC.staleness_of(next_page_btn),
+                'next page')
+
+            return
+
+        except ElementClickInterceptedException:
+            print(
+                f'ElementClickInterceptedException occurred on page '
+                f'{data_page}, attempt {attempt} of {MAX_PAGE_ATTEMPTS}'
+            )
+
+    raise ElementClickInterceptedException(
+        f'Could not leave page {data_page}')
+
+
+def build_stats_frame(players_details: dict,
+                      epl_season: str) -> pd.DataFrame:
+    """Build the season DataFrame from the
+    extracted stats columns
+
+    Args:
+    -----
+    players_details : dict
+        Stat name to cell values for the season
+    epl_season : str
+        EPL season
+
+    Returns:
+        Pandas DataFrame with EPL data
+    """
+
+    data_len = len(players_details['Player'])
+
+    # Update EPL season
+    players_details['Season'] = [epl_season] * data_len
+
+    # Take note of time data is ingested
+    players_details['CreatedAt'] = [datetime.utcnow()] * data_len
+    players_details['UpdatedAt'] = [datetime.utcnow()] * data_len
+
+    return pd.DataFrame(players_details)
 
-@task(name='Extract Player Stats', retries=2, cache_key_fn=task_input_hash,
-      cache_expiration=timedelta(days=1))
+
+@task(name='Extract Player Stats', retries=2, cache_key_fn=fingerprint_input_hash,
+      cache_expiration=cache_expiration('extract'))
 def extract_player_data(web_url: str,
                         epl_season: str,
-                        page_size: int
+                        page_size: int,
+                        extraction_mode: str = 'bulk',
+                        resume: bool = True
                         ) -> pd.DataFrame:
-    """Extract player data from the web
+    """Extract player data from the web. Each page
+    is checkpointed as it is read, so a retry or
+    rerun only reads the remaining pages
 
     Args:
     -----
@@ -49,206 +373,151 @@ def extract_player_data(web_url: str,
         EPL season
     page_size : int
         Number of windows on the page
+    extraction_mode : str
+        `bulk` to read each stats table in one call,
+        `html` to parse the page source with lxml,
+        `elements` to read it cell by cell
+    resume : bool
+        Resume from the last checkpointed page,
+        otherwise start again from page 1
 
     Returns:
         Pandas DataFrame with EPL data
     """
 
+    extract_stats = EXTRACTION_MODES[extraction_mode]
+
     # Lists to keep player information
-    players_details = {
-        'Player': [],
-        'Mins': [],
-        'Goals': [],
-        'Assists': [],
-        'Yel': [],
-        'Red': [],
-        'SpG': [],
-        'PS%': [],
-        'AerialsWon': [],
-        'MotM': []
-    }
+    players_details = {stat_name: [] for stat_name in utils.STAT_XPATHS}
+    snapshots = SnapshotStore(SNAPSHOT_DIR)
 
-    # Get webdriver
-    driver = None
-    if driver_name == 'Chrome':
-        driver = webdriver.Chrome()
-    else:
-        driver = webdriver.Firefox()
-
-    try:
-        # Open web browser and wait for it to load
-        driver.get(web_url)
-        time.sleep(5)
-
-        # Click `All players` button
-        all_players_btn = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located(
-                (By.XPATH,
-                 "//a[@class='option ' and contains(., 'All players')]"))
-        )
-        all_players_btn.click()
-
-        def find_stat(xpath, stat_name):
-            """Find elements related to a stat
-            and appends it to the stats details
-
-            Args:
-            -----
-            xpath : str:
-                XPATH with elements
-            stat_name : str:
-                Stat name for players
-
-            Return:
-            -------
-                None
-            """
-
-            elements = driver.find_elements(By.XPATH, xpath)
-            for element in elements:
-                if stat_name == 'Player' and element.text == 'England':
-                    pass
-                else:
-                    players_details[stat_name].append(element.text)
-
-        data_page = 1
-
-        while data_page <= page_size:
-            try:
-                time.sleep(5)
-
-                # Find elements with player stats on the current page
-                find_stat(
-                    '//span[@class="iconize iconize-icon-left"]', 'Player')
-                find_stat('//td[@class="minsPlayed   "]', 'Mins')
-                find_stat('//td[@class="goal   "]', 'Goals')
-                find_stat('//td[@class="assistTotal   "]', 'Assists')
-                find_stat('//td[@class="yellowCard   "]', 'Yel')
-                find_stat('//td[@class="redCard   "]', 'Red')
-                find_stat('//td[@class="shotsPerGame   "]', 'SpG')
-                find_stat('//td[@class="passSuccess   "]', 'PS%')
-                find_stat('//td[@class="aerialWonPerGame   "]', 'AerialsWon')
-                find_stat('//td[@class="manOfTheMatch   "]', 'MotM')
-
-            except TimeoutException:
-                print(
-                    f'TimeoutException occurred on page'
-                    f'{data_page}. Retrying...'
-                )
-                continue
+    checkpoint = CrawlCheckpoint.for_url(CHECKPOINT_DIR, web_url)
+    if not resume:
+        checkpoint.clear()
 
-            # # Break loop at this point
-            if data_page == page_size:
-                break
+    # Restore pages read by earlier attempts
+    completed_pages = 0
+    for record in checkpoint.load():
+        for stat_name, values in record['stats'].items():
+            players_details[stat_name].extend(values)
+        completed_pages = record['page']
 
-            next_page_btn = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.ID, "next"))
-            )
+    if completed_pages:
+        print(f'Resuming after page {completed_pages} of {page_size}')
 
-            try:
-                # Scroll to the next page button to ensure it's clickable
-                driver.execute_script(
-                    "arguments[0].scrollIntoView();", next_page_btn)
-                time.sleep(1)  # A small pause to ensure the page loads
-
-                # Click the "Next" button
-                next_page_btn.click()
-
-                # Wait for the new page to load before continuing
-                WebDriverWait(driver, 10).until(
-                    EC.staleness_of(next_page_btn)
-                )
-
-                data_page += 1
-
-            except ElementClickInterceptedException:
-                print(
-                    f'ElementClickInterceptedException occurred '
-                    f'on page {data_page}. Retrying...'
-                )
-                continue
+    if completed_pages < page_size:
+        pool = get_browser_pool()
 
-        data_len = len(players_details['Player'])
+        # Lease a warm browser session, kept open for the next season
+        with pool.lease() as session:
+            driver = session.driver
+            open_stats_page(driver, web_url)
+            session.page_loaded()
 
-        # Update EPL season
-        players_details['Season'] = [epl_season] * data_len
+            # Skip pages already checkpointed
+            for data_page in range(1, completed_pages + 1):
+                go_to_next_page(driver, data_page)
 
-        # Take note of time data is ingested
-        players_details['CreatedAt'] = [datetime.utcnow()] * data_len
-        players_details['UpdatedAt'] = [datetime.utcnow()] * data_len
+            for data_page in range(completed_pages + 1, page_size + 1):
+                page_stats, page_source = read_page(
+                    driver, extract_stats, data_page)
+                snapshots.put(page_key(web_url, data_page), page_source)
+                session.page_loaded()
+                checkpoint.append({'page': data_page, 'stats': page_stats})
 
-        return pd.DataFrame(players_details)
+                for stat_name, values in page_stats.items():
+                    players_details[stat_name].extend(values)
 
-    finally:
-        # Close web browser
-        driver.close()
+                if data_page < page_size:
+                    go_to_next_page(driver, data_page)
 
+        pool.report()
 
-@task(name='Load data to local', retries=2, cache_key_fn=task_input_hash,
-      cache_expiration=timedelta(hours=1))
-def load_to_local(player_stats_df: pd.DataFrame, epl_season: str,
-                  dataset_file_name: str):
-    """Save transformed dataset to local
-    file path
+    waits.wait_timings.report()
+
+    player_stats_df = build_stats_frame(players_details, epl_season)
+
+    # The season is complete, the next run starts afresh
+    checkpoint.clear()
+
+    return player_stats_df
+
+
+@task(name='Reparse Player Stats', retries=2)
+def reparse_player_data(web_url: str, epl_season: str, page_size: int,
+                        snapshot_date: str = None) -> pd.DataFrame:
+    """Rebuild a season's player stats from the
+    stored page snapshots, without a browser
 
     Args:
     -----
-    player_stats_df : pd.DataFrame
-        Pandas DataFrame with EPL data
-    epl_season : str:
+    web_url : str
+        web_url the snapshots were taken from
+    epl_season : str
         EPL season
-    data_file : str
-        EPL file name
+    page_size : int
+        Number of windows on the page
+    snapshot_date : str
+        Use snapshots taken on or before this ISO
+        date, defaults to the latest
 
     Returns:
-        None
+        Pandas DataFrame with EPL data
     """
 
-    current_path = os.path.dirname(__file__)
-    data_path = os.path.join(
-        current_path,
-        'Data',
-        f'{epl_season}')
-    # Check if directory already exits
-    if not os.path.exists(data_path):
-        os.makedirs(data_path)
-
-    file_path = os.path.join(data_path, f'{dataset_file_name}.parquet')
-    player_stats_df.to_parquet(file_path, compression='gzip')
-
-
-@task(name='Load data to GCS', retries=2, cache_key_fn=task_input_hash,
-      cache_expiration=timedelta(hours=1))
-def load_to_gcs(player_stats_df: pd.DataFrame, epl_season: str,
-                data_file_name: str):
-    """Load transformed data into Google
-    Cloud Storage Bucket
+    snapshots = SnapshotStore(SNAPSHOT_DIR)
+    players_details = {stat_name: [] for stat_name in utils.STAT_XPATHS}
+
+    for data_page in range(1, page_size + 1):
+        page_stats = utils.parse_stats_table(
+            snapshots.get(page_key(web_url, data_page), snapshot_date))
+
+        for stat_name, values in page_stats.items():
+            players_details[stat_name].extend(values)
+
+    return build_stats_frame(players_details, epl_season)
+
+
+@task(name='Load data to sinks', retries=2, cache_key_fn=fingerprint_input_hash,
+      cache_expiration=cache_expiration('load'))
+def load_to_sinks(player_stats_df: pd.DataFrame, epl_season: str,
+                  data_file_name: str) -> dict:
+    """Encode the transformed dataset to Parquet
+    once and write it as the season's partition
+    of the local and GCS datasets
+
     Args:
     -----
     player_stats_df : pd.DataFrame
         EPL player stats dataframe
     epl_season : str
         EPL Season
-    dataset_file_name : str
+    data_file_name : str
         EPL dataset file name
 
     Returns:
     --------
-        None
+        Dictionary with bytes written and encode time
     """
 
-    gcp_cloud_storage_bucket_block = GcsBucket.load("epl-gcs-bucket")
-
-    gcp_cloud_storage_bucket_block.upload_from_dataframe(
-        df=player_stats_df,
-        to_path=f'epl_player_stats_repository/{epl_season}/{data_file_name}.parquet',
-        serialization_format='parquet_gzip'
+    return sinks.fan_out(
+        player_stats_df,
+        epl_season,
+        [
+            sinks.ObjectSink(LocalObjectStore(DATA_DIR), data_file_name),
+            sinks.ObjectSink(bucket_store(),
+                             f'{GCS_DATASET_PREFIX}/{data_file_name}',
+                             name='bucket')
+        ],
+        dictionary_columns=DICTIONARY_COLUMNS
     )
 
 
 @flow(name='EPL Player Stats Pipeline')
 def el(web_url: str, data_file_name: str,
-        season: str, page_size: int) -> None:
+        season: str, page_size: int,
+        extraction_mode: str = 'bulk', resume: bool = True,
+        reparse: bool = False, snapshot_date: str = None) -> int:
     """Extract EPL player stats from the web,
     transform it, and load it into Cloud Storage
 
@@ -262,61 +531,214 @@ def el(web_url: str, data_file_name: str,
         league season
     page_size : int
         Number of windows on the page
+    extraction_mode : str
+        How each stats table is read, `bulk`, `html`
+        or `elements`
+    resume : bool
+        Resume from the last checkpointed page
+    reparse : bool
+        Rebuild the season from stored page snapshots
+        instead of crawling the website
+    snapshot_date : str
+        Reparse snapshots taken on or before this ISO date
 
     Returns:
     --------
-        None
+        Number of player rows extracted
     """
 
-    # Extract player stats data
-    player_stats_df = extract_player_data(
-        web_url=web_url,
-        epl_season=season,
-        page_size=page_size
-    )
-
-    # Load to local
-    load_to_local(player_stats_df, season, data_file_name)
-
-    # Load to GCS
-    load_to_gcs(player_stats_df, season, data_file_name)
+    if reparse:
+        # Rebuild player stats data from snapshots
+        player_stats_df = reparse_player_data(
+            web_url=web_url,
+            epl_season=season,
+            page_size=page_size,
+            snapshot_date=snapshot_date
+        )
+    else:
+        # Extract player stats data
+        player_stats_df = extract_player_data(
+            web_url=web_url,
+            epl_season=season,
+            page_size=page_size,
+            extraction_mode=extraction_mode,
+            resume=resume
+        )
 
+    # Load to local and GCS
+    load_to_sinks(player_stats_df, season, data_file_name)
 
-if __name__ == '__main__':
+    return len(player_stats_df)
 
-    season_url_details = {
-        '2012-2013': {'url_first_tag': '3389', 'url_second_tag': '6531', 'page_size': 54},
-        '2013-2014': {'url_first_tag': '3853', 'url_second_tag': '7794', 'page_size': 57},
-        '2014-2015': {'url_first_tag': '4311', 'url_second_tag': '9155', 'page_size': 55},
-        '2015-2016': {'url_first_tag': '5826', 'url_second_tag': '12496', 'page_size': 57},
-        '2016-2017': {'url_first_tag': '6335', 'url_second_tag': '13796', 'page_size': 55},
-        '2017-2018': {'url_first_tag': '6829', 'url_second_tag': '15151', 'page_size': 53},
-        '2018-2019': {'url_first_tag': '7361', 'url_second_tag': '16368', 'page_size': 51},
-        '2019-2020': {'url_first_tag': '7811', 'url_second_tag': '17590', 'page_size': 53},
-        '2020-2021': {'url_first_tag': '8228', 'url_second_tag': '18685', 'page_size': 54},
-        '2021-2022': {'url_first_tag': '8618', 'url_second_tag': '19793', 'page_size': 55},
-        '2022-2023': {'url_first_tag': '9075', 'url_second_tag': '20934', 'page_size': 57}
-    }
 
-    DATASET_FILE_NAME = 'epl_player_stats_data'
+def season_url(season: str) -> str:
+    """Build the player statistics URL of a season
 
-    arg_parser = argparse.ArgumentParser(
-        description='Pass Season Year'
-    )
-    arg_parser.add_argument('--season_year', type=str, required=True)
+    Args:
+    -----
+    season : str
+        league season, e.g. `2022-2023`
 
-    season = arg_parser.parse_args().season_year
+    Returns:
+    --------
+        WhoScored player statistics URL
+    """
 
     # Extract URL details
     url_tag_one = season_url_details[season]['url_first_tag']
     url_tag_two = season_url_details[season]['url_second_tag']
-    page_size = season_url_details[season]['page_size']
 
     # Build URL
-    url = (
+    return (
         f'https://www.whoscored.com/Regions/252/Tournaments/2/Seasons/{url_tag_one}/'
         f'Stages/{url_tag_two}/PlayerStatistics/England-Premier-League-{season}'
     )
 
-    el(web_url=url, data_file_name=DATASET_FILE_NAME,
-        season=season, page_size=page_size)
+
+def seasons_in_range(first_season: str, last_season: str) -> list:
+    """List the known seasons from `first_season`
+    to `last_season`, inclusive
+
+    Args:
+    -----
+    first_season : str
+        First league season, e.g. `2012-2013`
+    last_season : str
+        Last league season, e.g. `2022-2023`
+
+    Returns:
+    --------
+        List of seasons
+    """
+
+    return [
+        season for season in sorted(season_url_details)
+        if first_season <= season <= last_season
+    ]
+
+
+def run_season(season: str, **el_options) -> dict:
+    """Run the `el` flow for one season and
+    time it
+
+    Args:
+    -----
+    season : str
+        league season
+    el_options :
+        Options passed on to the `el` flow
+
+    Returns:
+    --------
+        Dictionary with the season, rows and seconds taken
+    """
+
+    start = time.perf_counter()
+
+    rows = el(web_url=season_url(season), data_file_name=DATASET_FILE_NAME,
+              season=season,
+              page_size=season_url_details[season]['page_size'],
+              **el_options)
+
+    return {
+        'season': season,
+        'rows': rows,
+        'seconds': time.perf_counter() - start
+    }
+
+
+def backfill(seasons: list, max_parallel: int, **el_options) -> list:
+    """Run the `el` flow for several seasons at
+    once, each season in its own process with its
+    own browser, at most `max_parallel` at a time
+
+    Args:
+    -----
+    seasons : list
+        league seasons to extract
+    max_parallel : int
+        Maximum number of seasons extracted at once
+    el_options :
+        Options passed on to the `el` flow
+
+    Returns:
+    --------
+        List of per-season results, in completion order
+
+    Raises:
+    -------
+        RuntimeError when any season failed, once
+        the other seasons are done
+    """
+
+    results = []
+    failed = []
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=max_parallel) as executor:
+        futures = {
+            executor.submit(run_season, season, **el_options): season
+            for season in seasons
+        }
+
+        for done, future in enumerate(as_completed(futures), start=1):
+            season = futures[future]
+            try:
+                result = future.result()
+            except Exception as error:
+                print(f'[{done}/{len(seasons)}] {season} failed: {error}')
+                failed.append(season)
+                continue
+
+            results.append(result)
+            print(
+                f"[{done}/{len(seasons)}] {season}: {result['rows']} rows "
+                f"in {result['seconds']:.0f}s"
+            )
+
+    print(
+        f'Backfilled {len(results)}/{len(seasons)} seasons in '
+        f'{time.perf_counter() - start:.0f}s'
+    )
+
+    if failed:
+        raise RuntimeError(f'{len(failed)} season loads failed: {failed}')
+
+    return results
+
+
+if __name__ == '__main__':
+
+    arg_parser = argparse.ArgumentParser(
+        description='Pass Season Year'
+    )
+    season_args = arg_parser.add_mutually_exclusive_group(required=True)
+    season_args.add_argument('--season_year', type=str)
+    season_args.add_argument('--seasons', type=str, nargs='+')
+    season_args.add_argument('--season_range', type=str, nargs=2,
+                             metavar=('FIRST_SEASON', 'LAST_SEASON'))
+    arg_parser.add_argument('--max_parallel', type=int, default=3)
+    arg_parser.add_argument('--extraction_mode', type=str, default='bulk',
+                            choices=['bulk', 'html', 'elements'])
+    arg_parser.add_argument('--fresh', action='store_true',
+                            help='Ignore checkpoints and start from page 1')
+    arg_parser.add_argument('--reparse', action='store_true',
+                            help='Rebuild seasons from stored page snapshots')
+    arg_parser.add_argument('--snapshot_date', type=str, default=None)
+
+    args = arg_parser.parse_args()
+
+    el_options = {
+        'extraction_mode': args.extraction_mode,
+        'resume': not args.fresh,
+        'reparse': args.reparse,
+        'snapshot_date': args.snapshot_date
+    }
+
+    if args.season_year:
+        run_season(args.season_year, **el_options)
+    else:
+        backfill_seasons = (
+            args.seasons or seasons_in_range(*args.season_range)
+        )
+        backfill(backfill_seasons, args.max_parallel, **el_options)
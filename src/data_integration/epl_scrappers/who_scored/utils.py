@@ -0,0 +1,75 @@
+""" Utility functions for the EL """
+
+from lxml import etree, html
+
+from common.http_engine import JavaScriptRequired
+
+
+# XPATHs of the stats table columns, keyed by stat name
+STAT_XPATHS = {
+    'Player': '//span[@class="iconize iconize-icon-left"]',
+    'Mins': '//td[@class="minsPlayed   "]',
+    'Goals': '//td[@class="goal   "]',
+    'Assists': '//td[@class="assistTotal   "]',
+    'Yel': '//td[@class="yellowCard   "]',
+    'Red': '//td[@class="redCard   "]',
+    'SpG': '//td[@class="shotsPerGame   "]',
+    'PS%': '//td[@class="passSuccess   "]',
+    'AerialsWon': '//td[@class="aerialWonPerGame   "]',
+    'MotM': '//td[@class="manOfTheMatch   "]'
+}
+
+# Compiled selectors for parsing saved or fetched pages
+COMPILED_STAT_XPATHS = {
+    stat_name: etree.XPath(xpath) for stat_name, xpath in STAT_XPATHS.items()
+}
+
+
+def drop_region_labels(page_stats: dict) -> dict:
+    """Remove the `England` region label, which
+    shares its markup with the player names
+
+    Args:
+    -----
+    page_stats : dict
+        Stat name to cell values for a page
+
+    Returns:
+    --------
+        page_stats : dict
+    """
+
+    page_stats['Player'] = [
+        player for player in page_stats['Player'] if player != 'England'
+    ]
+
+    return page_stats
+
+
+def parse_stats_table(page_html: str) -> dict:
+    """Parse the player stats table out of a
+    rendered page with compiled XPATHs
+
+    Args:
+    -----
+    page_html : str
+        Rendered stats page HTML
+
+    Returns:
+    --------
+        Dictionary of stat name to cell values
+    """
+
+    tree = html.fromstring(page_html)
+
+    page_stats = {}
+    for stat_name, xpath in COMPILED_STAT_XPATHS.items():
+        page_stats[stat_name] = [
+            ' '.join(element.text_content().split())
+            for element in xpath(tree)
+        ]
+
+    if not page_stats['Mins']:
+        raise JavaScriptRequired('Stats table has not been rendered')
+
+    return drop_region_labels(page_stats)
@@ -1,43 +1,194 @@
+import io
 import os
 import ssl
-from pathlib import Path
-from datetime import timedelta
+import argparse
+import httpx
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import csv
 
 from prefect import flow, task
-from prefect.tasks import task_input_hash
-from prefect_gcp.cloud_storage import GcsBucket
+
+from analytics import league_table
+from analytics.elo import EloEngine
+from common import parquet_dataset, sinks
+from common.object_store import (
+    LocalObjectStore, bucket_store, object_store_backend)
+from common.conditional_get import ValidatorStore, download_changed
+from common.cache_keys import cache_expiration, fingerprint_input_hash
 
 
 # Disabling SSL Certificate verification on my machine - not related to code
 ssl._create_default_https_context = ssl._create_unverified_context
 
+SEASONS = ['1516', '1617', '1718', '1819', '1920', '2021', '2122', '2223']
+BASE_URL = 'https://www.football-data.co.uk/mmz4281'
+DATASET_FILE_NAME = 'epl_match_data'
+STANDINGS_FILE_NAME = 'epl_standings'
+
+# ETag and Last-Modified of the last processed download of each season
+VALIDATORS_PATH = os.path.join(
+    os.path.dirname(__file__), 'Cache', 'season_validators.json')
+
+# Elo rating state, one checkpoint per season
+ELO_CHECKPOINT_DIR = os.path.join(
+    os.path.dirname(__file__), 'Checkpoints', 'elo')
+
+# Columns the ratings are computed from
+ELO_FIELDS = ['Season Year', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG']
+
+# Local dataset directory and GCS dataset prefix
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'Data')
+GCS_DATASET_PREFIX = 'epl_match_repository'
+
+# Low-cardinality fields, dictionary encoded in Parquet
+DICTIONARY_FIELDS = ['Div', 'HomeTeam', 'AwayTeam', 'FTR', 'HTR',
+                     'Season Year']
+
+# Fields of interest
+STATS_FIELDS = ['Div', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG',
+                'FTR', 'HTHG', 'HTAG', 'HTR']
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+# Types of the fields of interest, declared up front so the
+# CSV is never type-inferred. Goals fit in int8
+STATS_FIELD_TYPES = {
+    'Div': CATEGORY,
+    'Date': pa.timestamp('s'),
+    'HomeTeam': CATEGORY,
+    'AwayTeam': CATEGORY,
+    'FTHG': pa.int8(),
+    'FTAG': pa.int8(),
+    'FTR': CATEGORY,
+    'HTHG': pa.int8(),
+    'HTAG': pa.int8(),
+    'HTR': CATEGORY
+}
+
+# Seasons up to 2017-18 use two-digit years. `%y` must come
+# first, `%Y` would read `23` as the year 23
+DATE_FORMATS = ['%d/%m/%y', '%d/%m/%Y']
+
+
+def read_epl_csv(source) -> pd.DataFrame:
+    """Parse a football-data CSV with pyarrow,
+    reading only the fields of interest with
+    their declared types
+
+    Args:
+    -----
+    source : str | bytes
+        CSV file path or content
+
+    Returns:
+    --------
+        Pandas DataFrame of the fields of interest,
+        with `Date` parsed and teams and results
+        as categoricals
+    """
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    table = csv.read_csv(
+        source,
+        convert_options=csv.ConvertOptions(
+            include_columns=STATS_FIELDS,
+            column_types=STATS_FIELD_TYPES,
+            timestamp_parsers=DATE_FORMATS,
+            strings_can_be_null=True
+        )
+    )
+
+    # Drop the blank lines some seasons end with
+    table = table.filter(pc.is_valid(table['Div']))
+
+    return table.to_pandas()
+
+
+def season_url(season: str, base_url: str = BASE_URL) -> str:
+    """URL of a season's EPL results CSV
+
+    Args:
+    -----
+    season : str
+        EPL season, e.g. `2223`
+    base_url : str
+        Server the seasons are downloaded from
+
+    Returns:
+    --------
+        CSV URL
+    """
+
+    return f'{base_url}/{season}/E0.csv'
+
 
-@task(name='Extract EPL Data', retries=2, cache_key_fn=task_input_hash,
-      cache_expiration=timedelta(days=1))
-def extract_epl_data(dataset_url: str) -> pd.DataFrame:
+@task(name='Extract EPL Data', retries=2, cache_key_fn=fingerprint_input_hash,
+      cache_expiration=cache_expiration('extract'))
+def extract_epl_data(dataset_url: str,
+                     csv_content: bytes = None) -> pd.DataFrame:
     """Loads data from the web into a pandas DataFrame
 
     Args:
     -----
     data_urls : str
         URL to a CSV dataset
+    csv_content : bytes
+        CSV already downloaded from `dataset_url`
 
     Returns:
     --------
     epl_df : pd.DataFrame
     """
 
-    # Load CSV data from URL
-    epl_df = pd.read_csv(dataset_url)
+    # Load CSV data from URL, unless already downloaded
+    if csv_content is None:
+        response = httpx.get(dataset_url, follow_redirects=True, timeout=30)
+        response.raise_for_status()
+        csv_content = response.content
 
-    # Fields of interest
-    stats_fields = ['Div', 'Date', 'HomeTeam', 'AwayTeam', 'FTHG', 'FTAG',
-                    'FTR', 'HTHG', 'HTAG', 'HTR']
+    return read_epl_csv(csv_content)
 
-    epl_df = epl_df[stats_fields]
 
-    return epl_df
+@task(name='Download Changed Seasons', retries=2)
+def download_seasons(seasons: list, base_url: str = BASE_URL,
+                     max_connections: int = 8, force: bool = False) -> dict:
+    """Download the seasons' CSVs concurrently,
+    skipping seasons unchanged since the last run
+
+    Args:
+    -----
+    seasons : list
+        EPL seasons, e.g. `['2122', '2223']`
+    base_url : str
+        Server the seasons are downloaded from
+    max_connections : int
+        Size of the connection pool
+    force : bool
+        Download every season, changed or not
+
+    Returns:
+    --------
+        Dictionary of season to Download, changed seasons only
+    """
+
+    store = ValidatorStore(VALIDATORS_PATH)
+    if force:
+        store.clear()
+
+    urls = {season_url(season, base_url): season for season in seasons}
+    downloads = download_changed(list(urls), store, max_connections)
+
+    print(
+        f'{len(downloads)} of {len(seasons)} seasons changed: '
+        f'{", ".join(urls[url] for url in downloads) or "none"}'
+    )
+
+    return {urls[url]: download for url, download in downloads.items()}
 
 
 @task(name='Transform Data', retries=2)
@@ -56,8 +207,9 @@ def transform_epl_data(epl_df: pd.DataFrame, epl_season: str) -> pd.DataFrame:
     epl_df: pd.DataFrame
     """
 
-    # Convert `Date` col type to datetime
-    epl_df['Date'] = pd.to_datetime(epl_df['Date'], dayfirst=True)
+    # Convert `Date` col type to datetime, unless parsed on read
+    if not pd.api.types.is_datetime64_any_dtype(epl_df['Date']):
+        epl_df['Date'] = pd.to_datetime(epl_df['Date'], dayfirst=True)
 
     # Add tag for EPL season
     prev_yr = epl_season[:2]
@@ -68,66 +220,165 @@ def transform_epl_data(epl_df: pd.DataFrame, epl_season: str) -> pd.DataFrame:
     return epl_df, epl_season
 
 
-@task(name='Write to local', retries=2, cache_key_fn=task_input_hash,
-      cache_expiration=timedelta(days=1))
-def write_local(data_frame: pd.DataFrame, epl_season: str,
-                dataset_file_name: str) -> None:
-    """Save transformed dataset to local
-    file path
+def dataset_sinks(dataset_file_name: str) -> list:
+    """The local dataset and the bucket's copy of
+    it, in the store `OBJECT_STORE` selects"""
+
+    return [
+        sinks.ObjectSink(LocalObjectStore(DATA_DIR), dataset_file_name),
+        sinks.ObjectSink(bucket_store(),
+                         f'{GCS_DATASET_PREFIX}/{dataset_file_name}',
+                         name='bucket')
+    ]
+
+
+@task(name='Write to sinks', retries=2, cache_key_fn=fingerprint_input_hash,
+      cache_expiration=cache_expiration('load'))
+def write_sinks(data_frame: pd.DataFrame, epl_season: str,
+                dataset_file_name: str) -> dict:
+    """Encode the transformed dataset to Parquet
+    once and write it as the season's partition
+    of the local and GCS datasets
 
     Args:
     -----
-    df : pd.DataFrame
+    data_frame : pd.DataFrame
         Pandas DataFrame with EPL data
     epl_season : str:
         EPL season
-    data_file : str
-        EPL file name
+    dataset_file_name : str
+        EPL dataset file name
+
+    Returns:
+    --------
+        Dictionary with bytes written and encode time
+    """
+
+    return sinks.fan_out(
+        data_frame,
+        epl_season,
+        dataset_sinks(dataset_file_name),
+        dictionary_columns=DICTIONARY_FIELDS
+    )
+
+
+def load_season(epl_df: pd.DataFrame, season: str,
+                dataset_file_name: str) -> tuple:
+    """Transform a season and write it locally and
+    to GCS, returning the cleaned data and the
+    sink report"""
+
+    # Transform data
+    cleaned_epl_df, epl_season = transform_epl_data(
+        epl_df=epl_df, epl_season=season)
+    # Write data to the local repository and GCS
+    report = write_sinks(data_frame=cleaned_epl_df, epl_season=epl_season,
+                         dataset_file_name=dataset_file_name)
+
+    return cleaned_epl_df, report
+
+
+def stored_standings(seasons: list,
+                     dataset_path: str) -> pd.DataFrame:
+    """Standings of the local dataset's `seasons`,
+    None before they were first written"""
+
+    if not os.path.isdir(dataset_path):
+        return None
+
+    standings = parquet_dataset.read_dataset(dataset_path, seasons=seasons)
+
+    return None if standings.empty else standings
+
+
+@task(name='Write standings', retries=2)
+def write_standings(epl_df: pd.DataFrame,
+                    standings_file_name: str) -> pd.DataFrame:
+    """Apply the given seasons' new matches to their
+    stored standings and write each season's
+    standings locally and to GCS. Seasons without
+    stored standings, or with a corrected result,
+    are computed in full
+
+    Args:
+    -----
+    epl_df : pd.DataFrame
+        Cleaned match data of one or more seasons
+    standings_file_name : str
+        Standings dataset file name
 
     Returns:
-        None
+    --------
+        Pandas DataFrame with the standings
     """
 
-    current_path = os.path.dirname(__file__)
-    data_path = os.path.join(current_path, 'Data', f'{epl_season}')
-    # Check if directory already exits
-    if not os.path.exists(data_path):
-        os.makedirs(data_path)
+    seasons = list(epl_df['Season Year'].astype(str).unique())
+    stored = stored_standings(
+        seasons, os.path.join(DATA_DIR, standings_file_name))
+
+    if stored is None:
+        table = league_table.LeagueTable(epl_df)
+    else:
+        table = league_table.LeagueTable.from_standings(stored)
+        applied = table.sync(epl_df)
+        print(f'{len(applied)} standings rows updated')
+    standings = table.standings
 
-    file_path = os.path.join(data_path, f'{dataset_file_name}.parquet')
-    data_frame.to_parquet(file_path, compression='gzip')
+    # Every season's standings are transferred at once
+    sinks.fan_out_seasons(
+        dict(tuple(standings.groupby('season'))),
+        dataset_sinks(standings_file_name),
+        dictionary_columns=['team', 'opponent', 'venue'])
 
+    return standings
 
-@task(name='Upload EPL data to GCS', retries=2, cache_key_fn=task_input_hash,
-      cache_expiration=timedelta(days=1))
-def upload_to_gcs(data_frame: str, epl_season: str,
-                  dataset_file_name: str) -> None:
-    """Upload EPL data from DataFrame
-    to GCS EPL Data Lake
+
+def stored_matches(excluded_seasons: list,
+                   dataset_path: str = None) -> pd.DataFrame:
+    """Matches of the local dataset's seasons other
+    than `excluded_seasons`, the columns of `ELO_FIELDS`"""
+
+    dataset_path = dataset_path or os.path.join(DATA_DIR, DATASET_FILE_NAME)
+    if not os.path.isdir(dataset_path):
+        return pd.DataFrame(columns=ELO_FIELDS)
+
+    return parquet_dataset.read_dataset(
+        dataset_path, columns=ELO_FIELDS,
+        filter=~ds.field(parquet_dataset.PARTITION_COLUMN).isin(
+            list(excluded_seasons)))
+
+
+@task(name='Update team ratings', retries=2)
+def update_ratings(epl_df: pd.DataFrame,
+                   dataset_path: str = None) -> pd.DataFrame:
+    """Apply matches played since the last run to
+    the checkpointed Elo ratings. A corrected past
+    season replays every later one, the seasons not
+    in `epl_df` are read from the local dataset
 
     Args:
     -----
-    data_frame : str
-        EPL dataset
-    epl_season : str
-        EPL Season
-    dataset_file_name : str
-        EPL dataset file name
+    epl_df : pd.DataFrame
+        Cleaned match data of one or more seasons
+    dataset_path : str
+        Local match dataset, defaults to the one
+        under `DATA_DIR`
 
     Returns:
     --------
-        None
+        Pandas DataFrame of the current ratings
     """
 
-    gcp_cloud_storage_bucket_block = GcsBucket.load("epl-gcs-bucket")
+    seasons = epl_df['Season Year'].astype(str).unique()
+    matches = pd.concat(
+        [epl_df[ELO_FIELDS], stored_matches(seasons, dataset_path)],
+        ignore_index=True)
 
-    # Upload to GCS
-    gcp_cloud_storage_bucket_block.upload_from_dataframe(
-        df=data_frame,
-        to_path=Path(
-            f'epl_match_repository/{epl_season}/{dataset_file_name}.parquet'),
-        serialization_format='parquet_gzip'
-    )
+    engine = EloEngine.restore(ELO_CHECKPOINT_DIR)
+    processed = engine.update(matches)
+    print(f'Ratings updated with {processed} new matches')
+
+    return engine.table()
 
 
 @flow(name='EPL Data Pipeline')
@@ -136,24 +387,86 @@ def etl(url: str, season: str, dataset_file_name: str):
 
     # Load EPL data from web to DataFrame
     epl_df = extract_epl_data(dataset_url=url)
-    # Transform data
-    cleaned_epl_df, epl_season = transform_epl_data(
-        epl_df=epl_df, epl_season=season)
-    # Write data to local repository
-    write_local(data_frame=cleaned_epl_df, epl_season=epl_season,
-                dataset_file_name=dataset_file_name)
-    # Load data from DataFrame to GCS
-    upload_to_gcs(data_frame=cleaned_epl_df, epl_season=epl_season,
-                  dataset_file_name=dataset_file_name)
+    cleaned_epl_df, _ = load_season(epl_df, season, dataset_file_name)
+    write_standings(cleaned_epl_df, STANDINGS_FILE_NAME)
 
 
-if __name__ == "__main__":
-    seasons = ['1516', '1617', '1718', '1819', '1920', '2021', '2122', '2223']
-    DATASET_FILE_NAME = 'epl_match_data'
+@flow(name='EPL Seasons Pipeline')
+def etl_seasons(seasons: list, dataset_file_name: str,
+                base_url: str = BASE_URL, max_connections: int = 8,
+                force: bool = False) -> list:
+    """Download all seasons at once and load
+    only those that changed since the last run
+
+    Args:
+    -----
+    seasons : list
+        EPL seasons, e.g. `['2122', '2223']`
+    dataset_file_name : str
+        EPL dataset file name
+    base_url : str
+        Server the seasons are downloaded from
+    max_connections : int
+        Size of the connection pool
+    force : bool
+        Reload every season, changed or not
+
+    Returns:
+    --------
+        List of the seasons loaded
+    """
 
-    for season in seasons:
-        epl_data_url = (
-            f'https://www.football-data.co.uk/mmz4281/{season}/E0.csv'
+    downloads = download_seasons(seasons, base_url, max_connections, force)
+    store = ValidatorStore(VALIDATORS_PATH)
+
+    loaded = []
+    bytes_written = 0
+    encode_seconds = 0.0
+    for season, download in sorted(downloads.items()):
+        epl_df = extract_epl_data(
+            dataset_url=download.url, csv_content=download.content)
+        cleaned_epl_df, report = load_season(
+            epl_df, season, dataset_file_name)
+        loaded.append(cleaned_epl_df)
+        bytes_written += report['bytes']
+        encode_seconds += report['encode_seconds']
+
+    if downloads:
+        print(
+            f'Run encoded {bytes_written} bytes in '
+            f'{encode_seconds * 1000:.1f} ms'
         )
+        # Standings and ratings of all changed seasons in one pass
+        loaded_df = pd.concat(loaded, ignore_index=True)
+        write_standings(loaded_df, STANDINGS_FILE_NAME)
+        update_ratings(loaded_df)
+        # The GCP clients are only built for the bucket
+        if object_store_backend != 'local':
+            from common import clients
+
+            clients.report()
+
+    # Only skip the seasons next time once they are loaded
+    for download in downloads.values():
+        store.set(download.url, download.validators)
 
-        etl(epl_data_url, season, DATASET_FILE_NAME)
+    return sorted(downloads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Load EPL match results from football-data.co.uk')
+    parser.add_argument('--seasons', nargs='+', default=SEASONS,
+                        help='EPL seasons, e.g. 2122 2223')
+    parser.add_argument('--base_url', default=BASE_URL,
+                        help='Server to download from, e.g. a local '
+                        '`python -m http.server` mirroring '
+                        '<season>/E0.csv')
+    parser.add_argument('--max_connections', type=int, default=8,
+                        help='Concurrent downloads')
+    parser.add_argument('--force', action='store_true',
+                        help='Reload seasons even if unchanged')
+    args = parser.parse_args()
+
+    etl_seasons(args.seasons, DATASET_FILE_NAME, args.base_url,
+                args.max_connections, args.force)
@@ -0,0 +1,98 @@
+"""Move the season files written before the datasets
+were partitioned, `Data/<season>/<name>.parquet` and
+`<repository>/<season>/<name>.parquet` in the bucket,
+into the `season=` partitions the pipelines now
+write and read"""
+
+import os
+import argparse
+
+from common import sinks
+from common.object_store import LocalObjectStore, bucket_store
+
+
+SCRAPERS_DIR = os.path.join(os.path.dirname(__file__), 'epl_scrappers')
+
+# Local data directory, bucket prefix, file name and
+# dictionary encoded columns, as each pipeline writes them
+DATASETS = {
+    'matches': (
+        os.path.join(os.path.dirname(__file__), 'Data'),
+        'epl_match_repository', 'epl_match_data',
+        ['Div', 'HomeTeam', 'AwayTeam', 'FTR', 'HTR', 'Season Year']),
+    'stats': (
+        os.path.join(SCRAPERS_DIR, 'who_scored', 'Data'),
+        'epl_player_stats_repository', 'epl_player_stats_data',
+        ['Player', 'Season']),
+    'demographics': (
+        os.path.join(SCRAPERS_DIR, 'football_critic', 'Data'),
+        'epl_player_data_repository', 'epl_player_data',
+        ['Club', 'Nationality', 'Position', 'Prefered Foot', 'Season'])
+}
+
+
+def local_seasons(data_dir: str, file_name: str) -> list:
+    """Seasons with a file left in the old layout"""
+
+    if not os.path.isdir(data_dir):
+        return []
+
+    return sorted(
+        entry for entry in os.listdir(data_dir)
+        if os.path.isfile(
+            os.path.join(data_dir, entry, f'{file_name}.parquet'))
+    )
+
+
+def migrate(dataset: str, seasons: list = None,
+            bucket: bool = False) -> list:
+    """Move a dataset's old season files into its
+    partitions, locally and optionally in the bucket
+
+    Args:
+    -----
+    dataset : str
+        Key of `DATASETS`
+    seasons : list
+        Seasons to move, those left in the local
+        data directory when None
+    bucket : bool
+        Also move the bucket's copies
+
+    Returns:
+    --------
+        List of `(store, season)` moved
+    """
+
+    data_dir, prefix, file_name, dictionary_columns = DATASETS[dataset]
+    seasons = seasons or local_seasons(data_dir, file_name)
+
+    dataset_sinks = [sinks.ObjectSink(LocalObjectStore(data_dir), file_name)]
+    if bucket:
+        dataset_sinks.append(sinks.ObjectSink(
+            bucket_store(), f'{prefix}/{file_name}', name='bucket'))
+
+    moved = []
+    for sink in dataset_sinks:
+        for season in sinks.migrate_legacy_seasons(
+                sink, seasons, dictionary_columns=dictionary_columns):
+            print(f'{dataset}: moved {season} into '
+                  f'{sink.name} {sink.dataset_prefix}')
+            moved.append((sink.name, season))
+
+    return moved
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Move old season files into the dataset partitions')
+    parser.add_argument('--datasets', nargs='+', choices=sorted(DATASETS),
+                        default=sorted(DATASETS))
+    parser.add_argument('--seasons', nargs='+', default=None,
+                        help='e.g. 2021-2022, defaults to the local ones')
+    parser.add_argument('--bucket', action='store_true',
+                        help='Also move the bucket copies')
+    args = parser.parse_args()
+
+    for dataset in args.datasets:
+        migrate(dataset, args.seasons, args.bucket)
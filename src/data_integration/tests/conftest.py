@@ -0,0 +1,67 @@
+""" Shared test setup: `common` and `analytics` importable
+as they are for the scripts, and scraper modules loaded
+by path since each scraper has its own `utils` """
+
+import os
+import sys
+import importlib.util
+
+import pytest
+
+
+DATA_INTEGRATION_DIR = os.path.dirname(os.path.dirname(__file__))
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+sys.path.insert(0, DATA_INTEGRATION_DIR)
+
+
+def load_module(relative_path: str, module_name: str):
+    """Import a script module by its path under
+    `src/data_integration`, with its directory
+    importable like when it is run
+
+    Args:
+    -----
+    relative_path : str
+        e.g. `epl_scrappers/who_scored/utils.py`
+    module_name : str
+        Unique name to register the module under
+
+    Returns:
+    --------
+        The imported module
+    """
+
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    path = os.path.join(DATA_INTEGRATION_DIR, relative_path)
+    script_dir = os.path.dirname(path)
+    sys.path.insert(0, script_dir)
+    # Scrapers import their own `utils`, each must see its own
+    previous_utils = sys.modules.pop('utils', None)
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(script_dir)
+        sys.modules.pop('utils', None)
+        if previous_utils is not None:
+            sys.modules['utils'] = previous_utils
+
+    return module
+
+
+def read_fixture(file_name: str) -> str:
+    """HTML of a saved page"""
+
+    with open(os.path.join(FIXTURE_DIR, file_name),
+              encoding='utf-8') as fixture_file:
+        return fixture_file.read()
+
+
+@pytest.fixture
+def fixture_dir() -> str:
+    return FIXTURE_DIR
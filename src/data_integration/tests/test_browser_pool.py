@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+pytest.importorskip('selenium')
+
+from common.browser_pool import BrowserPool
+
+
+class FakeDriver:
+    """Stands in for a WebDriver, counts live browsers"""
+
+    live = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self):
+        with FakeDriver.lock:
+            FakeDriver.live += 1
+            FakeDriver.peak = max(FakeDriver.peak, FakeDriver.live)
+        self.quit_called = False
+
+    def execute_script(self, script):
+        return 'complete'
+
+    def quit(self):
+        self.quit_called = True
+        with FakeDriver.lock:
+            FakeDriver.live -= 1
+
+
+@pytest.fixture(autouse=True)
+def reset_drivers():
+    FakeDriver.live = FakeDriver.peak = 0
+
+
+def test_worn_session_is_recycled_within_a_lease():
+    pool = BrowserPool(FakeDriver, max_pages=3)
+
+    with pool.lease() as session:
+        first_driver = session.driver
+        for _ in range(7):
+            pool.recycle_if_worn(session)
+            session.page_loaded()
+
+    assert first_driver.quit_called
+    assert pool.recycled == 2
+    assert pool.started == 3
+
+
+def test_fresh_session_is_not_recycled():
+    pool = BrowserPool(FakeDriver, max_pages=3)
+
+    with pool.lease() as session:
+        session.page_loaded(2)
+        assert not pool.recycle_if_worn(session)
+
+
+def test_warm_respects_max_sessions_while_leased():
+    pool = BrowserPool(FakeDriver, max_sessions=2)
+    leased = threading.Event()
+    release = threading.Event()
+
+    def hold_lease():
+        with pool.lease():
+            leased.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_lease)
+    holder.start()
+    leased.wait()
+
+    warmer = threading.Thread(target=pool.warm, args=(2,))
+    warmer.start()
+    warmer.join(timeout=5)
+    release.set()
+    holder.join()
+
+    # The leased session counts, one more is started
+    assert FakeDriver.peak == 2
+    assert pool._idle.qsize() == 2
+
+
+def test_warm_raises_start_failures():
+    def failing_factory():
+        raise RuntimeError('browser did not start')
+
+    pool = BrowserPool(failing_factory)
+
+    with pytest.raises(RuntimeError, match='did not start'):
+        pool.warm(2)
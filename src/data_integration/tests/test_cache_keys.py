@@ -0,0 +1,79 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+pytest.importorskip('prefect')
+
+from common import cache_keys
+from common.cache_keys import fingerprint
+
+
+def player_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Player': ['Bukayo Saka', 'Erling Haaland', 'Aaron Ramsdale'],
+        'Goals': [14, 36, 0],
+        'SpG': [2.1, 3.6, None],
+        'Season': ['2022-2023'] * 3
+    })
+
+
+def test_equal_frames_share_a_key():
+    assert fingerprint(player_frame()) == fingerprint(player_frame())
+
+
+def test_a_changed_value_changes_the_key():
+    changed = player_frame()
+    changed.loc[2, 'Player'] = 'David Raya'
+
+    assert fingerprint(changed) != fingerprint(player_frame())
+
+
+def test_categories_are_part_of_the_frame_key():
+    frame = player_frame().astype({'Season': 'category'})
+    renamed = frame.copy()
+    renamed['Season'] = renamed['Season'].cat.rename_categories(
+        ['2021-2022'])
+
+    assert fingerprint(frame) != fingerprint(renamed)
+
+
+def test_equal_tables_share_a_key():
+    assert fingerprint(pa.Table.from_pandas(player_frame())) == (
+        fingerprint(pa.Table.from_pandas(player_frame())))
+
+
+def test_dictionaries_are_part_of_the_table_key():
+    indices = pa.array([0, 0, 1], pa.int32())
+    arsenal = pa.DictionaryArray.from_arrays(
+        indices, pa.array(['Arsenal', 'Fulham']))
+    chelsea = pa.DictionaryArray.from_arrays(
+        indices, pa.array(['Chelsea', 'Fulham']))
+
+    assert fingerprint(pa.table({'Club': arsenal})) != (
+        fingerprint(pa.table({'Club': chelsea})))
+
+
+def test_every_chunk_is_part_of_the_table_key():
+    table = pa.Table.from_pandas(player_frame())
+    first, last = table.slice(0, 2), table.slice(2)
+    changed = pa.concat_tables([
+        first, last.set_column(
+            1, 'Goals', pa.array([1], pa.int64()))])
+
+    assert fingerprint(pa.concat_tables([first, last])) == (
+        fingerprint(pa.concat_tables([first, last])))
+    assert fingerprint(pa.concat_tables([first, last])) != (
+        fingerprint(changed))
+
+
+def test_large_frames_are_hashed_in_blocks(monkeypatch):
+    monkeypatch.setattr(cache_keys, 'BLOCK_ROWS', 2)
+    changed = player_frame()
+    changed.loc[2, 'Goals'] = 1
+
+    assert fingerprint(player_frame()) == fingerprint(player_frame())
+    assert fingerprint(changed) != fingerprint(player_frame())
+
+
+def test_other_arguments_are_unchanged():
+    assert fingerprint('2022-2023') == '2022-2023'
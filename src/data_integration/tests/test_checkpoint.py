@@ -0,0 +1,129 @@
+import json
+import os
+
+import pytest
+
+from common.checkpoint import CrawlCheckpoint
+from conftest import load_module
+
+
+CRAWL_URL = 'https://www.whoscored.com/Regions/252/Tournaments/2/Seasons/9075'
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return CrawlCheckpoint.for_url(str(tmp_path / 'checkpoints'), CRAWL_URL)
+
+
+@pytest.fixture
+def who_scored():
+    for dependency in ['prefect', 'dotenv', 'selenium']:
+        pytest.importorskip(dependency)
+
+    return load_module('epl_scrappers/who_scored/etl_web_to_gcs.py',
+                       'who_scored_web_to_gcs')
+
+
+def test_partial_crawl_resumes_after_the_last_page(checkpoint, tmp_path):
+    for page in [1, 2]:
+        checkpoint.append({'page': page, 'stats': {'Player': [f'p{page}']}})
+
+    # A rerun of the same crawl finds the completed pages
+    resumed = CrawlCheckpoint.for_url(str(tmp_path / 'checkpoints'), CRAWL_URL)
+    assert [record['page'] for record in resumed.load()] == [1, 2]
+
+    resumed.append({'page': 3, 'stats': {'Player': ['p3']}})
+    assert [record['page'] for record in resumed.load()] == [1, 2, 3]
+
+
+def test_crawls_of_other_urls_do_not_share_a_checkpoint(checkpoint, tmp_path):
+    checkpoint.append({'page': 1})
+
+    other = CrawlCheckpoint.for_url(
+        str(tmp_path / 'checkpoints'), f'{CRAWL_URL}/Stages/20934')
+    assert other.path != checkpoint.path
+    assert other.load() == []
+
+
+@pytest.mark.parametrize('cut_line', [b'{"page": 3, "st', b'{"page": 3}'])
+def test_line_cut_short_by_a_crash_is_dropped(checkpoint, cut_line):
+    checkpoint.append({'page': 1})
+    checkpoint.append({'page': 2})
+    with open(checkpoint.path, 'ab') as checkpoint_file:
+        checkpoint_file.write(cut_line)
+
+    assert checkpoint.load() == [{'page': 1}, {'page': 2}]
+
+    # The next record starts on a line of its own
+    checkpoint.append({'page': 3})
+    assert checkpoint.load() == [{'page': 1}, {'page': 2}, {'page': 3}]
+
+
+def test_corrupt_line_ends_the_records(checkpoint):
+    checkpoint.append({'page': 1})
+    with open(checkpoint.path, 'ab') as checkpoint_file:
+        checkpoint_file.write(b'not json\n')
+
+    assert checkpoint.load() == [{'page': 1}]
+
+
+def test_append_is_synced_before_returning(checkpoint, monkeypatch):
+    synced = []
+
+    def fsync(descriptor):
+        # The line is written by the time it is synced
+        with open(checkpoint.path, encoding='utf-8') as checkpoint_file:
+            synced.append(checkpoint_file.read())
+
+    monkeypatch.setattr(os, 'fsync', fsync)
+    checkpoint.append({'page': 1})
+
+    assert synced == [json.dumps({'page': 1}) + '\n']
+
+
+def test_clear_removes_the_checkpoint(checkpoint):
+    checkpoint.append({'page': 1})
+    checkpoint.clear()
+    checkpoint.clear()
+
+    assert not os.path.exists(checkpoint.path)
+    assert checkpoint.load() == []
+
+
+def test_page_read_is_retried_a_bounded_number_of_times(who_scored,
+                                                        monkeypatch):
+    attempts = []
+
+    def wait_for(driver, condition, name):
+        attempts.append(name)
+        raise who_scored.TimeoutException(name)
+
+    monkeypatch.setattr(who_scored.waits, 'wait_for', wait_for)
+
+    with pytest.raises(who_scored.TimeoutException, match='page 7'):
+        who_scored.read_page(object(), who_scored.extract_stats_bulk, 7)
+    assert len(attempts) == who_scored.MAX_PAGE_ATTEMPTS
+
+
+def test_intercepted_click_is_retried_a_bounded_number_of_times(
+        who_scored, monkeypatch):
+    class Button:
+        clicks = 0
+
+        def click(self):
+            Button.clicks += 1
+            raise who_scored.ElementClickInterceptedException('overlay')
+
+    class Driver:
+        def execute_script(self, script, *args):
+            return None
+
+    monkeypatch.setattr(who_scored.waits, 'wait_for',
+                        lambda driver, condition, name: Button())
+    monkeypatch.setattr(who_scored.waits, 'first_element',
+                        lambda driver, locator: None)
+
+    with pytest.raises(who_scored.ElementClickInterceptedException,
+                       match='page 4'):
+        who_scored.go_to_next_page(Driver(), 4)
+    assert Button.clicks == who_scored.MAX_PAGE_ATTEMPTS
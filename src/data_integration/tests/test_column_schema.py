@@ -0,0 +1,74 @@
+import pyarrow as pa
+import pytest
+
+from common import column_schema
+from common.warehouse import KEY_COLUMN, NULL_TOKEN
+
+
+SCHEMA = pa.schema([('Goals', pa.int64()), ('PS_', pa.float64())])
+
+
+def test_bad_values_are_nulled_and_counted(capsys):
+    table = pa.table({
+        'Goals': pa.chunked_array([['14', '-', 'n/a'], ['36', None, 'n/a']]),
+        'PS%': ['80.4', '64.1', '', '75.6', '70', '71.5']
+    })
+
+    cleaned = column_schema.clean_and_cast(table, SCHEMA)
+
+    assert cleaned.schema.equals(SCHEMA)
+    assert cleaned.column('Goals').to_pylist() == [14, None, None, 36,
+                                                   None, None]
+    assert cleaned.column('PS_').to_pylist() == [80.4, 64.1, None, 75.6,
+                                                 70.0, 71.5]
+    assert capsys.readouterr().out == (
+        'Goals: 2 values are not int64, loaded as null\n')
+
+
+def test_clean_columns_cast_without_counting():
+    values = pa.chunked_array([['1', '2', None]])
+
+    cast, nulled = column_schema.safe_cast(values, pa.int64())
+
+    assert (cast.to_pylist(), nulled) == ([1, 2, None], 0)
+
+
+def test_lossy_casts_of_typed_columns_still_fail():
+    values = pa.chunked_array([pa.array([1.5], pa.float64())])
+
+    with pytest.raises(pa.ArrowInvalid):
+        column_schema.safe_cast(values, pa.int64())
+
+
+def test_typed_tables_are_new_versions():
+    first = column_schema.read_fields('player_stats_data_v1.json')
+    typed = column_schema.read_fields('player_stats_data.json')
+
+    assert (first['Goals'], typed['Goals']) == ('STRING', 'INTEGER')
+    assert KEY_COLUMN not in first and KEY_COLUMN in typed
+
+
+def test_backfill_casts_keys_and_keeps_the_last_row():
+    source = column_schema.read_fields('player_data_football_critic_v1.json')
+    target = column_schema.read_fields('player_data_football_critic.json')
+
+    sql = column_schema.backfill_query(
+        'epl.player_demo_data', 'epl.player_demo_data_v2', source, target,
+        ['Player_Names', 'DOB', 'Season'], KEY_COLUMN, NULL_TOKEN)
+
+    assert 'safe_cast(Age as INT64) as Age' in sql
+    assert 'safe_cast(Club' not in sql
+    assert f"coalesce(cast(date(DOB) as string), '{NULL_TOKEN}')" in sql
+    assert 'RowHash' not in sql
+    assert 'partition by RowKey order by UpdatedAt desc' in sql
+
+
+def test_nulled_values_are_counted_for_retyped_columns_only():
+    source = column_schema.read_fields('player_stats_data_v1.json')
+    target = column_schema.read_fields('player_stats_data.json')
+
+    sql = column_schema.nulled_values_query(
+        'epl.player_stats_data', source, target)
+
+    assert 'safe_cast(SpG as FLOAT64) is null) as SpG' in sql
+    assert 'Player' not in sql
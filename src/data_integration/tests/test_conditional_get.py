@@ -0,0 +1,99 @@
+import httpx
+import pytest
+
+from common.conditional_get import ValidatorStore, download_changed
+
+
+URL = 'https://www.football-data.co.uk/mmz4281/2223/E0.csv'
+ETAG = '"5f1-2223"'
+LAST_MODIFIED = 'Sun, 28 May 2023 18:00:00 GMT'
+CSV = b'Div,Date,HomeTeam,AwayTeam\nE0,05/08/2022,Crystal Palace,Arsenal\n'
+
+
+class Server:
+    """Serves one file, answering `304` to requests
+    whose validators match it"""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if (request.headers.get('If-None-Match') == ETAG
+                or request.headers.get('If-Modified-Since') == LAST_MODIFIED):
+            return httpx.Response(304)
+
+        return httpx.Response(200, content=CSV, headers={
+            'ETag': ETAG, 'Last-Modified': LAST_MODIFIED})
+
+
+@pytest.fixture
+def server():
+    return Server()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ValidatorStore(str(tmp_path / 'validators.json'))
+
+
+def test_first_download_returns_body_and_validators(server, store):
+    downloads = download_changed(
+        [URL], store, transport=httpx.MockTransport(server))
+
+    assert downloads[URL].content == CSV
+    assert downloads[URL].validators == {
+        'etag': ETAG, 'last_modified': LAST_MODIFIED}
+    assert 'If-None-Match' not in server.requests[0].headers
+
+
+def test_stored_validators_turn_unchanged_files_into_304(server, store):
+    first = download_changed(
+        [URL], store, transport=httpx.MockTransport(server))
+    store.set(URL, first[URL].validators)
+
+    # Stored validators survive a new store on the same file
+    reread = ValidatorStore(store.path)
+    assert reread.get(URL) == {'etag': ETAG, 'last_modified': LAST_MODIFIED}
+
+    assert download_changed(
+        [URL], reread, transport=httpx.MockTransport(server)) == {}
+    assert server.requests[-1].headers['If-None-Match'] == ETAG
+    assert server.requests[-1].headers['If-Modified-Since'] == LAST_MODIFIED
+
+
+def test_if_modified_since_alone_is_sent(server, store):
+    store.set(URL, {'etag': None, 'last_modified': LAST_MODIFIED})
+
+    assert download_changed(
+        [URL], store, transport=httpx.MockTransport(server)) == {}
+    assert 'If-None-Match' not in server.requests[0].headers
+
+
+def test_changed_file_is_downloaded_again(server, store):
+    store.set(URL, {'etag': '"old"', 'last_modified': None})
+
+    downloads = download_changed(
+        [URL], store, transport=httpx.MockTransport(server))
+
+    assert downloads[URL].content == CSV
+
+
+def test_validators_are_not_stored_until_processed(server, store):
+    download_changed([URL], store, transport=httpx.MockTransport(server))
+
+    assert store.get(URL) == {}
+
+
+def test_server_errors_are_raised(store):
+    transport = httpx.MockTransport(lambda request: httpx.Response(500))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        download_changed([URL], store, transport=transport)
+
+
+def test_clear_forgets_validators(store):
+    store.set(URL, {'etag': ETAG, 'last_modified': None})
+    store.clear()
+
+    assert store.get(URL) == {}
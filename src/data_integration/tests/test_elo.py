@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics.elo import EloEngine
+
+
+def season(label: str, start: str, results: list) -> pd.DataFrame:
+    """One match a week from `start`, results as
+    `(home, away, home_goals, away_goals)`"""
+
+    return pd.DataFrame({
+        'Season Year': label,
+        'Date': pd.date_range(start, periods=len(results), freq='7D'),
+        'HomeTeam': [home for home, _, _, _ in results],
+        'AwayTeam': [away for _, away, _, _ in results],
+        'FTHG': [home_goals for _, _, home_goals, _ in results],
+        'FTAG': [away_goals for _, _, _, away_goals in results]
+    })
+
+
+FIRST = season('2021-2022', '2021-08-14', [
+    ('Arsenal', 'Chelsea', 2, 0), ('Chelsea', 'Everton', 1, 1),
+    ('Everton', 'Arsenal', 0, 3), ('Chelsea', 'Arsenal', 2, 1)
+])
+SECOND = season('2022-2023', '2022-08-06', [
+    ('Everton', 'Chelsea', 0, 1), ('Arsenal', 'Everton', 4, 0),
+    ('Chelsea', 'Arsenal', 0, 0)
+])
+
+
+def ratings(engine: EloEngine) -> dict:
+    return dict(zip(engine.teams, engine.ratings.tolist()))
+
+
+def fresh_ratings(matches: pd.DataFrame) -> dict:
+    engine = EloEngine()
+    engine.update(matches)
+    return ratings(engine)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = EloEngine(str(tmp_path))
+    engine.update(pd.concat([FIRST, SECOND], ignore_index=True))
+    return engine
+
+
+def test_reloading_unchanged_seasons_processes_nothing(engine):
+    before = ratings(engine)
+
+    assert engine.update(SECOND) == 0
+    assert engine.update(pd.concat([FIRST, SECOND])) == 0
+    assert ratings(engine) == before
+
+
+def test_new_matches_are_applied_incrementally(engine, tmp_path):
+    matchday = season('2022-2023', '2022-08-27', [
+        ('Everton', 'Arsenal', 1, 2)])
+    whole_season = pd.concat([SECOND, matchday], ignore_index=True)
+
+    restored = EloEngine.restore(str(tmp_path))
+    assert restored.update(whole_season) == 1
+    assert ratings(restored) == pytest.approx(
+        fresh_ratings(pd.concat([FIRST, whole_season])))
+
+
+def test_late_match_on_last_processed_day_is_replayed(engine):
+    late = SECOND.iloc[[-1]].assign(HomeTeam='Everton', AwayTeam='Arsenal',
+                                    FTHG=2, FTAG=2)
+    whole_season = pd.concat([SECOND, late], ignore_index=True)
+
+    assert engine.update(whole_season) == len(whole_season)
+    assert ratings(engine) == pytest.approx(
+        fresh_ratings(pd.concat([FIRST, whole_season])))
+
+
+def test_corrected_past_result_replays_later_seasons(engine, tmp_path):
+    corrected = FIRST.copy()
+    corrected.loc[1, 'FTHG'] = 3
+
+    matches = pd.concat([corrected, SECOND], ignore_index=True)
+    assert engine.update(matches) == len(matches)
+    assert ratings(engine) == pytest.approx(fresh_ratings(matches))
+
+    # The replayed checkpoints restore the corrected ratings
+    assert ratings(EloEngine.restore(str(tmp_path))) == pytest.approx(
+        ratings(engine))
+
+
+def test_corrected_past_result_needs_the_later_seasons(engine):
+    corrected = FIRST.copy()
+    corrected.loc[1, 'FTHG'] = 3
+    before = ratings(engine)
+
+    with pytest.raises(ValueError, match='2022-2023'):
+        engine.update(corrected)
+    assert ratings(engine) == before
+
+
+def test_replay_needs_checkpoints():
+    engine = EloEngine()
+    engine.update(FIRST)
+    corrected = FIRST.copy()
+    corrected.loc[0, 'FTAG'] = 5
+
+    with pytest.raises(ValueError, match='checkpoint'):
+        engine.update(corrected)
+
+
+def test_ratings_at_reads_the_history(engine):
+    after_first = engine.ratings_at(['Arsenal'], [FIRST['Date'].max()])
+
+    assert after_first[0] != engine.initial_rating
+    assert np.isclose(
+        engine.ratings_at(['Unknown FC'], [FIRST['Date'].max()])[0],
+        engine.initial_rating)
+
+
+def test_ratings_at_reads_matches_before_1970():
+    engine = EloEngine()
+    engine.update(season('1968-1969', '1968-08-10', [
+        ('Leeds United', 'Arsenal', 2, 0), ('Arsenal', 'Leeds United', 1, 1)
+    ]))
+
+    leeds, arsenal = engine.ratings_at(
+        ['Leeds United', 'Arsenal'], pd.to_datetime(['1968-08-12'] * 2))
+
+    assert leeds > engine.initial_rating > arsenal
+    assert engine.ratings_at(
+        ['Arsenal'], pd.to_datetime(['1968-08-01']))[0] == (
+        engine.initial_rating)
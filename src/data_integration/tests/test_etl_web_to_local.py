@@ -0,0 +1,108 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('prefect')
+
+import etl_web_to_local
+from analytics.elo import EloEngine
+from analytics.league_table import compute_standings
+from common import parquet_dataset, sinks
+from common.object_store import LocalObjectStore
+from test_elo import FIRST, SECOND, fresh_ratings, ratings
+from test_league_table import WHOLE_SECOND, assert_same_standings
+
+
+def run(task, *args, **kwargs):
+    """Call a task's function outside of a flow"""
+
+    return getattr(task, 'fn', task)(*args, **kwargs)
+
+
+def write_dataset(root: str, matches: pd.DataFrame) -> str:
+    for season, season_matches in matches.groupby('Season Year'):
+        path = parquet_dataset.partition_path(root, season)
+        os.makedirs(os.path.dirname(path))
+        parquet_dataset.write_parquet(season_matches, path)
+
+    return root
+
+
+def test_corrected_season_replays_stored_seasons(tmp_path, monkeypatch):
+    checkpoint_dir = str(tmp_path / 'elo')
+    monkeypatch.setattr(etl_web_to_local, 'ELO_CHECKPOINT_DIR',
+                        checkpoint_dir)
+    both = pd.concat([FIRST, SECOND], ignore_index=True)
+    dataset_path = write_dataset(str(tmp_path / 'epl_match_data'), both)
+    run(etl_web_to_local.update_ratings, both, dataset_path)
+
+    corrected = FIRST.copy()
+    corrected.loc[1, 'FTHG'] = 3
+    run(etl_web_to_local.update_ratings, corrected, dataset_path)
+
+    assert ratings(EloEngine.restore(checkpoint_dir)) == pytest.approx(
+        fresh_ratings(pd.concat([corrected, SECOND], ignore_index=True)))
+
+
+def test_first_run_has_no_stored_matches(tmp_path):
+    stored = etl_web_to_local.stored_matches(
+        ['2022-2023'], str(tmp_path / 'missing'))
+
+    assert stored.empty
+    assert list(stored.columns) == etl_web_to_local.ELO_FIELDS
+
+
+def test_standings_are_updated_from_the_stored_ones(tmp_path, monkeypatch):
+    store = LocalObjectStore(str(tmp_path))
+    monkeypatch.setattr(etl_web_to_local, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(etl_web_to_local, 'dataset_sinks',
+                        lambda name: [sinks.ObjectSink(store, name)])
+
+    run(etl_web_to_local.write_standings, SECOND, 'standings')
+    run(etl_web_to_local.write_standings, WHOLE_SECOND, 'standings')
+
+    assert_same_standings(
+        parquet_dataset.read_dataset(str(tmp_path / 'standings')),
+        compute_standings(WHOLE_SECOND))
+
+
+def season_csv(dates: list, trailer: str = '') -> bytes:
+    """football-data CSV with betting columns the
+    parser must skip"""
+
+    header = ('Div,Date,HomeTeam,AwayTeam,FTHG,FTAG,FTR,HTHG,HTAG,HTR,'
+              'Referee,B365H,B365D,B365A')
+    rows = [
+        f'E0,{date},Arsenal,Chelsea,2,1,H,1,0,H,M Oliver,1.9,3.5,4.2'
+        for date in dates
+    ]
+
+    return '\n'.join([header] + rows).encode('utf-8') + trailer.encode()
+
+
+@pytest.mark.parametrize('dates', [
+    ['13/08/16', '01/05/17'], ['13/08/2016', '01/05/2017']])
+def test_csv_dates_parse_with_two_and_four_digit_years(dates):
+    epl_df = etl_web_to_local.read_epl_csv(season_csv(dates))
+
+    assert list(epl_df.columns) == etl_web_to_local.STATS_FIELDS
+    assert epl_df['Date'].tolist() == [
+        pd.Timestamp('2016-08-13'), pd.Timestamp('2017-05-01')]
+
+
+def test_csv_with_a_byte_order_mark_keeps_the_first_column():
+    epl_df = etl_web_to_local.read_epl_csv(
+        b'\xef\xbb\xbf' + season_csv(['13/08/2022']))
+
+    assert epl_df['Div'].tolist() == ['E0']
+
+
+@pytest.mark.parametrize('trailer', ['\n\n', '\n,,,,,,,,,,,,,\n' * 2])
+def test_csv_trailing_blank_lines_are_dropped(trailer):
+    epl_df = etl_web_to_local.read_epl_csv(
+        season_csv(['13/08/2022', '20/08/2022'], trailer))
+
+    assert len(epl_df) == 2
+    assert epl_df['FTHG'].dtype == 'int8'
+    assert isinstance(epl_df['HomeTeam'].dtype, pd.CategoricalDtype)
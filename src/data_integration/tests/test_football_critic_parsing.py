@@ -0,0 +1,109 @@
+from datetime import datetime
+
+import pyarrow as pa
+import pytest
+
+from common.http_engine import FixtureFetcher, JavaScriptRequired
+from conftest import load_module
+
+
+utils = load_module('epl_scrappers/football_critic/utils.py',
+                    'football_critic_utils')
+
+LISTING_URL = ('https://www.footballcritic.com/premier-league/'
+               'season-2022-2023/player-stats/all/2/66955')
+SAKA_URL = 'https://www.footballcritic.com/bukayo-saka/profile/65412'
+RAMSDALE_URL = 'https://www.footballcritic.com/aaron-ramsdale/profile/61712'
+
+
+def test_listing_page_yields_names_profile_urls_and_clubs(fixture_dir):
+    page_html = FixtureFetcher(fixture_dir).fetch(LISTING_URL)
+
+    assert utils.parse_listing_page(page_html, LISTING_URL) == [
+        ('Bukayo Saka', SAKA_URL, 'Arsenal'),
+        ('Aaron Ramsdale', RAMSDALE_URL, None)
+    ]
+
+
+def test_listing_page_without_rows_requires_javascript():
+    with pytest.raises(JavaScriptRequired):
+        utils.parse_listing_page('<html><body></body></html>', LISTING_URL)
+
+
+def test_profile_page_pairs_labels_with_values(fixture_dir):
+    page_html = FixtureFetcher(fixture_dir).fetch(SAKA_URL)
+
+    assert utils.parse_profile_page(page_html) == [
+        'Club:', 'Arsenal',
+        'Nationality:', 'England',
+        'Age:', '21',
+        'Position:', 'Right Winger',
+        'Prefered foot:', 'Left',
+        'Height:', '178cm',
+        'Weight:', '-',
+        'Previous teams:', 'Arsenal U21 Arsenal U18'
+    ]
+
+
+def test_profile_details_fill_a_player_record(fixture_dir):
+    details = utils.parse_profile_page(
+        FixtureFetcher(fixture_dir).fetch(SAKA_URL))
+    record = utils.PlayerRecord.from_details('Bukayo Saka', details)
+
+    assert record.club == 'Arsenal'
+    assert record.position == 'Right Winger'
+    assert record.weight == '-'
+    assert record.previous_teams == 'Arsenal U21 Arsenal U18'
+
+
+def test_listing_club_replaces_the_profile_club():
+    details = ['Club:', 'Chelsea', 'Age:', '30']
+
+    record = utils.PlayerRecord.from_details(
+        'Jorginho', details, club='Arsenal')
+
+    assert (record.club, record.age) == ('Arsenal', '30')
+    assert utils.PlayerRecord.from_details(
+        'Jorginho', details).club == 'Chelsea'
+
+
+def test_repeated_label_keeps_the_first_value():
+    record = utils.PlayerRecord.from_details('Bukayo Saka', [
+        'Position:', 'Right Winger', 'Position:', 'Left Winger',
+        'Age:', '21'])
+
+    assert (record.position, record.age) == ('Right Winger', '21')
+
+
+def test_records_build_a_typed_table_with_missing_fields_null():
+    created_at = datetime(2023, 5, 28, 18, 30)
+    records = [
+        utils.PlayerRecord.from_details(
+            'Bukayo Saka', ['Club:', 'Arsenal', 'Age:', '21']),
+        utils.PlayerRecord.from_details('Aaron Ramsdale', [])
+    ]
+
+    table = utils.records_to_table(records, created_at)
+
+    assert table.schema == utils.PLAYER_SCHEMA
+    assert table.schema.field('Age').type == pa.string()
+    assert table.schema.field('CreatedAt').type == pa.timestamp('us')
+    assert table.column('Player Names').to_pylist() == [
+        'Bukayo Saka', 'Aaron Ramsdale']
+    assert table.column('Club').to_pylist() == ['Arsenal', None]
+    assert table.column('Previous Teams').null_count == 2
+    assert table.column('UpdatedAt').to_pylist() == [created_at] * 2
+
+
+def test_no_records_build_an_empty_table():
+    table = utils.records_to_table([])
+
+    assert table.num_rows == 0
+    assert table.schema == utils.PLAYER_SCHEMA
+
+
+def test_unrendered_profile_requires_javascript(fixture_dir):
+    page_html = FixtureFetcher(fixture_dir).fetch(RAMSDALE_URL)
+
+    with pytest.raises(JavaScriptRequired):
+        utils.parse_profile_page(page_html)
@@ -0,0 +1,101 @@
+import hashlib
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from conftest import load_module
+
+pytest.importorskip('prefect')
+pytest.importorskip('dotenv')
+
+from common import warehouse
+from common.object_store import LocalObjectStore
+
+
+who_scored = load_module(
+    'epl_scrappers/who_scored/etl_gcs_to_bigquery.py',
+    'who_scored_gcs_to_bigquery')
+football_critic = load_module(
+    'epl_scrappers/football_critic/el_gcs_to_bigquery.py',
+    'football_critic_gcs_to_bigquery')
+
+OBJECT_PATH = 'epl_player_stats_data/season=2022-2023/part-0.parquet'
+INGESTED_AT = datetime(2023, 5, 28, 18, 30)
+
+
+def player_stats() -> pa.Table:
+    """Who Scored rows as the scraper writes them"""
+
+    return pa.table({
+        'Player': ['Bukayo Saka', 'Aaron Ramsdale', 'Erling Haaland'],
+        'Mins': ['3183', '3420', '2769'],
+        'Goals': ['14', '-', '36'],
+        'Assists': ['11', '-', '8'],
+        'Yel': ['6', '3', '5'],
+        'Red': ['-', '-', '-'],
+        'SpG': ['2.1', '-', '3.6'],
+        'PS%': ['80.4', '64.1', '75.6'],
+        'AerialsWon': ['0.3', '0.2', '1.1'],
+        'MotM': ['6', '1', '10'],
+        'Season': ['2022-2023'] * 3,
+        'CreatedAt': pa.array([INGESTED_AT] * 3, pa.timestamp('us')),
+        'UpdatedAt': pa.array([INGESTED_AT] * 3, pa.timestamp('us'))
+    })
+
+
+def test_who_scored_batch_takes_the_table_schema():
+    table = who_scored.transform_batch(player_stats().to_batches()[0])
+
+    assert table.schema.equals(who_scored.TABLE_SCHEMA)
+    assert table.column('Goals').to_pylist() == [14, None, 36]
+    assert table.column('PS_').to_pylist() == [80.4, 64.1, 75.6]
+
+
+def test_row_keys_match_dbt_surrogate_keys():
+    table = who_scored.transform_batch(player_stats().to_batches()[0])
+
+    assert table.column(warehouse.KEY_COLUMN)[0].as_py() == (
+        hashlib.md5(b'Bukayo Saka-2022-2023').hexdigest())
+
+
+def test_football_critic_batch_takes_the_table_schema():
+    batch = pa.table({
+        'Player Names': ['Bukayo Saka'],
+        'Club': ['Arsenal'],
+        'Nationality': ['England'],
+        'Age': ['21'],
+        'DOB': pa.array([datetime(2001, 9, 5)], pa.timestamp('ns')),
+        'Position': ['Forward'],
+        'Prefered Foot': ['Left'],
+        'Height': ['178cm'],
+        'Weight': ['72kg'],
+        'Previous Teams': [None],
+        'CreatedAt': pa.array([INGESTED_AT], pa.timestamp('us')),
+        'UpdatedAt': pa.array([INGESTED_AT], pa.timestamp('us')),
+        'Season': ['2022-2023']
+    }).to_batches()[0]
+    table = football_critic.transform_batch(batch)
+
+    assert set(table.schema) == set(football_critic.TABLE_SCHEMA)
+    assert table.column('Age').to_pylist() == [21]
+
+
+def test_season_object_loads_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        who_scored, 'player_stats_table', 'epl.player_stats_data')
+    sink = pa.BufferOutputStream()
+    pq.write_table(player_stats(), sink)
+    source = LocalObjectStore(str(tmp_path / 'bucket'))
+    source.put(OBJECT_PATH, sink.getvalue())
+    loader = warehouse.DuckDBLoader(':memory:')
+    snapshot = warehouse.LoadSnapshot(str(tmp_path / 'snapshot.parquet'))
+
+    first = who_scored.load_object(OBJECT_PATH, source, loader, snapshot)
+    rerun = who_scored.load_object(OBJECT_PATH, source, loader, snapshot)
+
+    assert first['rows'] == 3
+    assert (rerun['rows'], rerun['unchanged']) == (0, 3)
+    assert loader.connection.execute(
+        'select sum(Goals) from epl.player_stats_data').fetchone() == (50,)
@@ -0,0 +1,73 @@
+import pandas as pd
+import pandas.testing as pdt
+
+from analytics.league_table import (
+    LeagueTable, compute_standings, table_at)
+from test_elo import FIRST, SECOND, season
+
+
+MATCHDAY = season('2022-2023', '2022-08-27', [
+    ('Everton', 'Arsenal', 1, 2), ('Chelsea', 'Everton', 3, 0)])
+WHOLE_SECOND = pd.concat([SECOND, MATCHDAY], ignore_index=True)
+
+
+def assert_same_standings(actual: pd.DataFrame, expected: pd.DataFrame):
+    order = ['season', 'date', 'team']
+    actual = actual.astype({'date': 'datetime64[ns]'})
+    expected = expected.astype({'date': 'datetime64[ns]'})
+    pdt.assert_frame_equal(
+        actual.sort_values(order, ignore_index=True)[expected.columns],
+        expected.sort_values(order, ignore_index=True),
+        check_dtype=False)
+
+
+def test_positions_after_a_matchday():
+    table = table_at(compute_standings(FIRST), '2021-2022', 2)
+
+    # Arsenal won both, Chelsea and Everton drew once and
+    # lost once, Chelsea on goal difference (-2 to -3)
+    assert table['team'].tolist() == ['Arsenal', 'Chelsea', 'Everton']
+    assert table['points'].tolist() == [6, 1, 1]
+    assert table['position'].tolist() == [1, 2, 3]
+
+
+def test_update_matches_a_full_compute():
+    table = LeagueTable(pd.concat([FIRST, SECOND], ignore_index=True))
+    new_rows = table.update(MATCHDAY)
+
+    expected = compute_standings(
+        pd.concat([FIRST, WHOLE_SECOND], ignore_index=True))
+    assert len(new_rows) == 2 * len(MATCHDAY)
+    assert_same_standings(table.standings, expected)
+
+
+def test_restored_table_applies_only_new_matches():
+    stored = compute_standings(pd.concat([FIRST, SECOND], ignore_index=True))
+    # Stored standings are read back with dictionary encoded teams
+    stored = stored.astype({'team': 'category', 'opponent': 'category'})
+
+    table = LeagueTable.from_standings(stored)
+    applied = table.sync(WHOLE_SECOND)
+
+    assert len(applied) == 2 * len(MATCHDAY)
+    assert_same_standings(table.standings, compute_standings(
+        pd.concat([FIRST, WHOLE_SECOND], ignore_index=True)))
+
+
+def test_synced_season_without_new_matches_is_unchanged():
+    table = LeagueTable.from_standings(compute_standings(SECOND))
+
+    assert table.sync(SECOND).empty
+    assert_same_standings(table.standings, compute_standings(SECOND))
+
+
+def test_corrected_result_is_computed_again():
+    corrected = WHOLE_SECOND.copy()
+    corrected.loc[0, 'FTAG'] = 0
+
+    table = LeagueTable.from_standings(
+        compute_standings(pd.concat([FIRST, SECOND], ignore_index=True)))
+    table.sync(corrected)
+
+    assert_same_standings(table.standings, compute_standings(
+        pd.concat([FIRST, corrected], ignore_index=True)))
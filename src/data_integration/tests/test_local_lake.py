@@ -0,0 +1,93 @@
+import os
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from analytics.local_lake import LocalLake
+
+
+SEASON = '2022-2023'
+
+
+def write_dataset(root: str, name: str, table: pa.Table) -> str:
+    """Season partition of a local dataset"""
+
+    directory = os.path.join(root, name, f'season={SEASON}')
+    os.makedirs(directory)
+    pq.write_table(table, os.path.join(directory, 'part-0.parquet'))
+
+    return os.path.join(root, name)
+
+
+def match_data(root: str) -> str:
+    return write_dataset(root, 'epl_match_data', pa.table({
+        'HomeTeam': ['Arsenal', 'Fulham'],
+        'AwayTeam': ['Crystal Palace', 'Liverpool'],
+        'FTHG': [2, 2],
+        'FTAG': [0, 2],
+        'Season Year': [SEASON] * 2
+    }))
+
+
+def player_stats(root: str) -> str:
+    columns = ['Mins', 'Goals', 'Assists', 'Yel', 'Red', 'SpG', 'PS%',
+               'AerialsWon', 'MotM']
+    table = pa.table({'Player': ['Bukayo Saka', 'Aaron Ramsdale']})
+    for column in columns:
+        table = table.append_column(column, pa.array(['3', '-']))
+
+    return write_dataset(
+        root, 'epl_player_stats_data',
+        table.append_column('Season', pa.array([SEASON] * 2)))
+
+
+def player_demographics(root: str) -> str:
+    return write_dataset(root, 'epl_player_data', pa.table({
+        'Player Names': ['Bukayo Saka'],
+        'Club': ['Arsenal'],
+        'Nationality': ['England'],
+        'Age': ['21'],
+        'Position': ['Forward'],
+        'Prefered Foot': ['Left'],
+        'Height': ['178cm'],
+        'Weight': ['72kg'],
+        'Previous Teams': [None],
+        'DOB': ['2001-09-05'],
+        'Season': [SEASON]
+    }))
+
+
+def test_lake_with_match_data_only(tmp_path):
+    root = str(tmp_path)
+    lake = LocalLake({
+        'match_data': match_data(root),
+        'standings': os.path.join(root, 'epl_standings'),
+        'player_stats_data': os.path.join(root, 'epl_player_stats_data'),
+        'player_demo_data': os.path.join(root, 'epl_player_data')
+    }, cache_dir=os.path.join(root, 'cache'))
+
+    goals = lake.sql('select sum(FTHG + FTAG) as goals from match_data')
+    assert goals['goals'][0] == 6
+    assert lake.missing == {
+        'standings', 'player_stats_data', 'player_demo_data'}
+    with pytest.raises(FileNotFoundError, match='player_stats_data'):
+        lake.model('player_game_stats')
+
+
+def test_full_lake_materializes_models(tmp_path):
+    root = str(tmp_path)
+    lake = LocalLake({
+        'match_data': match_data(root),
+        'player_stats_data': player_stats(root),
+        'player_demo_data': player_demographics(root)
+    }, cache_dir=os.path.join(root, 'cache'))
+
+    dataset = lake.model('epl_dataset')
+    cached = lake.model('epl_dataset')
+
+    assert not lake.missing
+    assert dataset[['player_names', 'club', 'goals_scored']].values.tolist(
+    ) == [['Bukayo Saka', 'Arsenal', 3]]
+    assert cached.equals(dataset)
+    assert os.path.exists(os.path.join(root, 'cache', 'epl_dataset.json'))
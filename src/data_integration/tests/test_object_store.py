@@ -0,0 +1,139 @@
+import io
+import os
+
+import pyarrow as pa
+import pytest
+
+from common import object_store
+from common.object_store import (
+    GcsObjectStore, LocalObjectStore, ObjectStore)
+
+
+@pytest.fixture
+def small_parts(monkeypatch):
+    """Multipart transfers from 1 kB, in 300 byte parts"""
+
+    monkeypatch.setattr(object_store, 'MULTIPART_THRESHOLD', 1000)
+    monkeypatch.setattr(object_store, 'PART_SIZE', 300)
+
+
+class FakeBlob:
+    def __init__(self, bucket, name):
+        self.bucket, self.name = bucket, name
+
+    @property
+    def size(self):
+        return len(self.bucket.objects[self.name])
+
+    def upload_from_file(self, file, size):
+        self.bucket.objects[self.name] = file.read(size)
+
+    def compose(self, sources):
+        self.bucket.composed.append([source.name for source in sources])
+        self.bucket.objects[self.name] = b''.join(
+            self.bucket.objects[source.name] for source in sources)
+
+    def download_as_bytes(self, start=None, end=None):
+        content = self.bucket.objects[self.name]
+        return content if start is None else content[start:end + 1]
+
+    def open(self, mode, chunk_size=None):
+        return io.BytesIO(self.bucket.objects[self.name])
+
+    def exists(self):
+        return self.name in self.bucket.objects
+
+    def delete(self):
+        del self.bucket.objects[self.name]
+
+
+class FakeBucket:
+    """In-memory stand-in for a google.cloud.storage.Bucket"""
+
+    def __init__(self):
+        self.objects = {}
+        self.composed = []
+
+    def blob(self, name):
+        return FakeBlob(self, name)
+
+    def get_blob(self, name):
+        return FakeBlob(self, name) if name in self.objects else None
+
+
+@pytest.fixture(params=['local', 'gcs'])
+def store(request, tmp_path):
+    if request.param == 'local':
+        return LocalObjectStore(str(tmp_path))
+    return GcsObjectStore(FakeBucket(), 'folder/')
+
+
+def test_backends_share_the_object_store_interface():
+    assert issubclass(LocalObjectStore, ObjectStore)
+    assert issubclass(GcsObjectStore, ObjectStore)
+    with pytest.raises(TypeError):
+        ObjectStore()
+
+
+def test_small_object_round_trip(store):
+    buffer = pa.py_buffer(b'season data')
+    store.put('dataset/season=2022-2023/part-0.parquet', buffer)
+
+    assert store.exists('dataset/season=2022-2023/part-0.parquet')
+    assert store.get('dataset/season=2022-2023/part-0.parquet') == (
+        b'season data')
+    with store.open('dataset/season=2022-2023/part-0.parquet') as file:
+        assert file.read() == b'season data'
+
+    store.delete('dataset/season=2022-2023/part-0.parquet')
+    assert not store.exists('dataset/season=2022-2023/part-0.parquet')
+
+
+def test_large_object_round_trip_in_parts(store, small_parts):
+    buffer = pa.py_buffer(os.urandom(2500))
+    store.put('large.bin', buffer)
+
+    assert store.get('large.bin') == buffer.to_pybytes()
+
+
+def test_many_objects_round_trip(store):
+    objects = {
+        f'season={season}/part-0.parquet': pa.py_buffer(season.encode())
+        for season in ['2020-2021', '2021-2022', '2022-2023']
+    }
+    store.put_many(objects)
+
+    assert store.get_many(list(objects)) == {
+        path: buffer.to_pybytes() for path, buffer in objects.items()}
+
+
+def test_gcs_multipart_upload_composes_and_removes_parts(small_parts):
+    bucket = FakeBucket()
+    GcsObjectStore(bucket, 'folder').put(
+        'large.bin', pa.py_buffer(os.urandom(2500)))
+
+    assert len(bucket.composed[0]) == 9
+    assert list(bucket.objects) == ['folder/large.bin']
+
+
+def test_local_writes_leave_no_temporary_files(tmp_path, small_parts):
+    store = LocalObjectStore(str(tmp_path))
+    store.put('season=2022-2023/part-0.parquet',
+              pa.py_buffer(os.urandom(2500)))
+
+    assert os.listdir(tmp_path / 'season=2022-2023') == ['part-0.parquet']
+
+
+def test_local_writes_are_not_executable(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        LocalObjectStore(str(tmp_path)).put('small.bin', pa.py_buffer(b'1'))
+    finally:
+        os.umask(umask)
+
+    assert os.stat(tmp_path / 'small.bin').st_mode & 0o777 == 0o644
+
+
+def test_missing_objects_raise(store):
+    with pytest.raises(FileNotFoundError):
+        store.get('missing.bin')
@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from common import parquet_dataset, sinks
+from common.object_store import LocalObjectStore
+
+
+def standings(season: str, teams: list) -> pd.DataFrame:
+    """Rows carrying their season in the file too,
+    like the standings"""
+
+    return pd.DataFrame({
+        'season': season,
+        'team': teams,
+        'points': range(len(teams), 0, -1)
+    })
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    root = str(tmp_path / 'epl_standings')
+    for season, teams in [('2021-2022', ['Man City', 'Liverpool']),
+                          ('2022-2023', ['Man City', 'Arsenal', 'Everton'])]:
+        path = parquet_dataset.partition_path(root, season)
+        os.makedirs(os.path.dirname(path))
+        parquet_dataset.write_parquet(
+            standings(season, teams), path, dictionary_columns=['team'])
+
+    return root
+
+
+def test_partition_path_is_hive_style():
+    assert parquet_dataset.partition_path('epl_match_data/', '2022-2023') == (
+        'epl_match_data/season=2022-2023/part-0.parquet')
+
+
+def test_in_file_season_column_reads_back_once(dataset_path):
+    epl_df = parquet_dataset.read_dataset(dataset_path)
+
+    assert list(epl_df.columns) == ['season', 'team', 'points']
+    assert epl_df.groupby('season').size().to_dict() == {
+        '2021-2022': 2, '2022-2023': 3}
+
+
+def test_reads_only_the_requested_seasons_and_rows(dataset_path):
+    epl_df = parquet_dataset.read_dataset(
+        dataset_path, seasons=['2022-2023'], columns=['team'],
+        filter=ds.field('points') > 1)
+
+    assert epl_df['team'].tolist() == ['Man City', 'Arsenal']
+
+
+def test_writes_codec_row_groups_and_dictionaries(tmp_path):
+    path = str(tmp_path / 'part-0.parquet')
+    parquet_dataset.write_parquet(
+        standings('2022-2023', ['Arsenal'] * 5), path, codec='snappy',
+        row_group_size=2, dictionary_columns=['team', 'missing'])
+
+    metadata = pq.ParquetFile(path).metadata
+    team, points = (metadata.row_group(0).column(index) for index in [1, 2])
+    assert metadata.num_row_groups == 3
+    assert team.compression == 'SNAPPY'
+    assert 'RLE_DICTIONARY' in team.encodings
+    assert 'RLE_DICTIONARY' not in points.encodings
+    assert team.statistics.has_min_max
+
+
+def test_unknown_codec_is_refused(tmp_path):
+    with pytest.raises(ValueError, match='lz4'):
+        parquet_dataset.write_parquet(
+            standings('2022-2023', ['Arsenal']),
+            str(tmp_path / 'part-0.parquet'), codec='lz4')
+
+
+def test_old_season_files_move_into_partitions(tmp_path):
+    # Layout of the first pipelines: Data/<season>/<name>.parquet
+    for season in ['2021-2022', '2022-2023']:
+        os.makedirs(tmp_path / season)
+        standings(season, ['Arsenal']).to_parquet(
+            tmp_path / season / 'epl_standings.parquet', compression='gzip')
+    sink = sinks.ObjectSink(LocalObjectStore(str(tmp_path)), 'epl_standings')
+    # A season already written in the new layout keeps its partition
+    sinks.fan_out(standings('2022-2023', ['Chelsea']), '2022-2023', [sink])
+
+    moved = sinks.migrate_legacy_seasons(
+        sink, ['2020-2021', '2021-2022', '2022-2023'])
+
+    assert moved == ['2021-2022']
+    assert not os.path.exists(tmp_path / '2021-2022' / 'epl_standings.parquet')
+    assert not os.path.exists(tmp_path / '2022-2023' / 'epl_standings.parquet')
+    epl_df = parquet_dataset.read_dataset(str(tmp_path / 'epl_standings'))
+    assert sorted(zip(epl_df['season'], epl_df['team'])) == [
+        ('2021-2022', 'Arsenal'), ('2022-2023', 'Chelsea')]
+
+
+def test_legacy_path_sits_next_to_the_dataset():
+    sink = sinks.ObjectSink(
+        LocalObjectStore('Data'), 'epl_match_repository/epl_match_data')
+
+    assert sink.legacy_path('2022-2023') == (
+        'epl_match_repository/2022-2023/epl_match_data.parquet')
@@ -0,0 +1,57 @@
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from common import parquet_stream
+from common.object_store import LocalObjectStore
+
+
+OBJECT_PATH = 'dataset/season=2022-2023/part-0.parquet'
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Local store with a 25 row season file in row
+    groups of 10"""
+
+    table = pa.table({
+        'Player': [f'Player {index}' for index in range(25)],
+        'Goals': [str(index % 7) for index in range(25)],
+        'Season': ['2022-2023'] * 25
+    })
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, row_group_size=10)
+
+    store = LocalObjectStore(str(tmp_path))
+    store.put(OBJECT_PATH, sink.getvalue())
+
+    return store
+
+
+def test_batches_span_row_groups(store):
+    batches = list(parquet_stream.iter_batches(
+        store, OBJECT_PATH, batch_size=12))
+
+    assert [batch.num_rows for batch in batches] == [12, 12, 1]
+    assert pa.Table.from_batches(batches).column('Player').to_pylist() == [
+        f'Player {index}' for index in range(25)]
+
+
+def test_batch_size_caps_rows(store):
+    batches = list(parquet_stream.iter_batches(
+        store, OBJECT_PATH, batch_size=4))
+
+    assert max(batch.num_rows for batch in batches) == 4
+    assert sum(batch.num_rows for batch in batches) == 25
+
+
+def test_only_selected_columns_are_read(store):
+    batches = parquet_stream.iter_batches(
+        store, OBJECT_PATH, columns=['Player', 'Season'])
+
+    assert next(batches).schema.names == ['Player', 'Season']
+
+
+def test_missing_object_raises(store):
+    with pytest.raises(FileNotFoundError):
+        next(parquet_stream.iter_batches(store, 'missing.parquet'))
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from conftest import load_module
+
+
+profile_cache = load_module(
+    'epl_scrappers/football_critic/profile_cache.py', 'profile_cache')
+
+DAY = profile_cache.DAY
+HREF = 'https://www.footballcritic.com/bukayo-saka/profile/65412'
+DETAILS = [
+    'Club:', 'Arsenal',
+    'Position:', 'Right Winger',
+    'Height:', '178cm'
+]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(profile_cache.time, 'time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = profile_cache.ProfileCache(str(tmp_path / 'profiles.sqlite'))
+    cache.put(HREF, list(DETAILS))
+    return cache
+
+
+def test_fresh_profile_is_served(cache, clock):
+    clock[0] += 10 * DAY
+
+    assert cache.get(HREF) == DETAILS
+
+
+def test_stale_club_expires_profile_without_listing_club(cache, clock):
+    clock[0] += 31 * DAY
+
+    assert cache.get(HREF) is None
+    assert cache.expired == 1
+
+
+def test_listing_club_keeps_profile_past_club_ttl(cache, clock):
+    clock[0] += 31 * DAY
+    assert cache.get(HREF, club='Chelsea')[:2] == ['Club:', 'Chelsea']
+
+    # The listing's club counts as freshly fetched
+    clock[0] += 20 * DAY
+    assert cache.get(HREF)[:2] == ['Club:', 'Chelsea']
+    assert cache.hits == 2
+
+
+def test_long_lived_labels_still_expire(cache, clock):
+    clock[0] += 181 * DAY
+
+    assert cache.get(HREF, club='Arsenal') is None
+
+
+def test_profiles_cached_with_one_fetch_time_are_read(tmp_path, clock):
+    cache = profile_cache.ProfileCache(str(tmp_path / 'profiles.sqlite'))
+    cache._execute(
+        'INSERT INTO profiles VALUES (?, ?, ?, ?)',
+        (HREF, json.dumps(DETAILS), clock[0], clock[0]))
+
+    assert cache.get(HREF) == DETAILS
+    clock[0] += 31 * DAY
+    assert cache.get(HREF, club='Arsenal') == DETAILS
+
+
+def test_age_is_recomputed_from_date_of_birth():
+    assert profile_cache.refresh_age(
+        '20 years (05-09-2001)',
+        today=profile_cache.date(2023, 9, 5)) == '22 years (05-09-2001)'
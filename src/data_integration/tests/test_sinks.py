@@ -0,0 +1,103 @@
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from common import parquet_dataset, sinks
+from common.object_store import LocalObjectStore
+
+
+def matches(season: str, home_teams: list) -> pd.DataFrame:
+    return pd.DataFrame({
+        'HomeTeam': home_teams,
+        'AwayTeam': 'Everton',
+        'FTHG': range(len(home_teams)),
+        'Season Year': season
+    })
+
+
+class RecordingStore(LocalObjectStore):
+    """Local store keeping the buffers it is handed"""
+
+    name = 'recording'
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.buffers = []
+
+    def put(self, path: str, buffer) -> None:
+        self.buffers.append(buffer)
+        super().put(path, buffer)
+
+
+@pytest.fixture
+def stores(tmp_path):
+    return [LocalObjectStore(str(tmp_path / 'local')),
+            RecordingStore(str(tmp_path / 'bucket'))]
+
+
+@pytest.fixture
+def dataset_sinks(stores):
+    return [
+        sinks.ObjectSink(stores[0], 'epl_match_data'),
+        sinks.ObjectSink(stores[1], 'epl_match_repository/epl_match_data',
+                         name='bucket')
+    ]
+
+
+def read_back(tmp_path, dataset_path: str) -> pd.DataFrame:
+    epl_df = parquet_dataset.read_dataset(str(tmp_path / dataset_path))
+
+    return epl_df.drop(columns='season').astype({'HomeTeam': str})
+
+
+def test_season_is_written_to_every_sink(tmp_path, dataset_sinks, stores):
+    season = matches('2022-2023', ['Arsenal', 'Chelsea'])
+
+    report = sinks.fan_out(season, '2022-2023', dataset_sinks,
+                           dictionary_columns=['HomeTeam'])
+
+    for dataset_path in ['local/epl_match_data',
+                         'bucket/epl_match_repository/epl_match_data']:
+        pdt.assert_frame_equal(read_back(tmp_path, dataset_path), season,
+                               check_dtype=False)
+    assert report['bytes'] == stores[1].buffers[0].size
+    assert set(report['write_seconds']) == {'local', 'bucket'}
+    assert report['encode_seconds'] > 0
+
+
+def test_seasons_are_encoded_once_for_all_sinks(tmp_path, dataset_sinks,
+                                                stores, monkeypatch):
+    season_frames = {
+        '2021-2022': matches('2021-2022', ['Liverpool']),
+        '2022-2023': matches('2022-2023', ['Arsenal', 'Chelsea'])
+    }
+    encoded = []
+    encode_parquet = parquet_dataset.encode_parquet
+
+    def counting_encode(data_frame, **options):
+        encoded.append(data_frame)
+        return encode_parquet(data_frame, **options)
+
+    monkeypatch.setattr(parquet_dataset, 'encode_parquet', counting_encode)
+    report = sinks.fan_out_seasons(season_frames, dataset_sinks)
+
+    assert len(encoded) == len(season_frames)
+    assert report['bytes'] == sum(
+        buffer.size for buffer in stores[1].buffers)
+    for dataset_path in ['local/epl_match_data',
+                         'bucket/epl_match_repository/epl_match_data']:
+        pdt.assert_frame_equal(
+            read_back(tmp_path, dataset_path)
+            .sort_values('Season Year', ignore_index=True),
+            pd.concat(season_frames.values(), ignore_index=True),
+            check_dtype=False)
+
+
+def test_rewritten_season_replaces_its_partition(tmp_path, dataset_sinks):
+    sinks.fan_out(matches('2022-2023', ['Arsenal']), '2022-2023',
+                  dataset_sinks)
+    sinks.fan_out(matches('2022-2023', ['Chelsea', 'Fulham']), '2022-2023',
+                  dataset_sinks)
+
+    epl_df = read_back(tmp_path, 'local/epl_match_data')
+    assert epl_df['HomeTeam'].tolist() == ['Chelsea', 'Fulham']
@@ -0,0 +1,174 @@
+import hashlib
+from datetime import datetime
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pytest
+
+from common import warehouse
+
+
+TABLE_ID = 'epl.player_stats_data'
+FIRST_SCRAPE = datetime(2023, 5, 21, 18, 30)
+RESCRAPE = datetime(2023, 5, 28, 18, 30)
+
+
+def season_rows(scraped_at: datetime, goals: list = None,
+                players: list = None) -> pa.Table:
+    """Cleaned rows with their keys and hashes"""
+
+    players = players or ['Bukayo Saka', 'Erling Haaland']
+    goals = goals or [14, 36][:len(players)]
+    table = pa.table({
+        'Player': players,
+        'Goals': pa.array(goals, pa.int64()),
+        'Season': ['2022-2023'] * len(players),
+        'CreatedAt': pa.array([scraped_at] * len(players), pa.timestamp('us')),
+        'UpdatedAt': pa.array([scraped_at] * len(players), pa.timestamp('us'))
+    })
+
+    return warehouse.add_row_hashes(table, ['Player', 'Season'])
+
+
+@pytest.fixture
+def loader():
+    return warehouse.DuckDBLoader(':memory:')
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    return warehouse.LoadSnapshot(str(tmp_path / 'snapshot.parquet'))
+
+
+def rows(loader) -> list:
+    return loader.connection.execute(
+        f'select Player, Goals, CreatedAt, UpdatedAt from {TABLE_ID} '
+        'order by Player').fetchall()
+
+
+def test_row_hashes_ignore_ingestion_times():
+    first = season_rows(FIRST_SCRAPE)
+    rescrape = season_rows(RESCRAPE)
+    changed = season_rows(RESCRAPE, goals=[15, 36])
+
+    hashes = first.column(warehouse.HASH_COLUMN).to_pylist()
+    assert rescrape.column(warehouse.HASH_COLUMN).to_pylist() == hashes
+    assert changed.column(warehouse.HASH_COLUMN).to_pylist()[0] != hashes[0]
+
+
+def test_rescrape_of_unchanged_rows_moves_nothing(loader, snapshot):
+    warehouse.load_batches(
+        season_rows(FIRST_SCRAPE).to_batches(), TABLE_ID, loader,
+        snapshot=snapshot)
+    report = warehouse.load_batches(
+        season_rows(RESCRAPE).to_batches(), TABLE_ID, loader,
+        snapshot=snapshot)
+
+    assert (report['rows'], report['unchanged']) == (0, 2)
+
+
+def test_merge_keeps_created_at(loader, snapshot):
+    warehouse.load_batches(
+        season_rows(FIRST_SCRAPE).to_batches(), TABLE_ID, loader,
+        snapshot=snapshot)
+    warehouse.load_batches(
+        season_rows(RESCRAPE, goals=[15, 36]).to_batches(), TABLE_ID,
+        loader, snapshot=snapshot)
+
+    assert rows(loader) == [
+        ('Bukayo Saka', 15, FIRST_SCRAPE, RESCRAPE),
+        ('Erling Haaland', 36, FIRST_SCRAPE, FIRST_SCRAPE)
+    ]
+
+
+def test_duplicate_keys_keep_the_first_row(loader, snapshot, capsys):
+    batches = (
+        season_rows(FIRST_SCRAPE, players=['Ben Davies', 'Ben Davies'],
+                    goals=[0, 1]).to_batches()
+        + season_rows(FIRST_SCRAPE, players=['Ben Davies'],
+                      goals=[2]).to_batches()
+    )
+    report = warehouse.load_batches(
+        batches, TABLE_ID, loader, snapshot=snapshot)
+
+    assert (report['rows'], report['duplicates']) == (1, 2)
+    assert [row[:2] for row in rows(loader)] == [('Ben Davies', 0)]
+    assert 'Dropped 2 rows' in capsys.readouterr().out
+
+
+class FakeJob:
+    num_dml_affected_rows = 2
+
+    def result(self):
+        return self
+
+
+class FakeBigQueryClient:
+    """Records the queries of a BigQuery merge"""
+
+    def __init__(self, columns: list):
+        self.columns = columns
+        self.queries = []
+
+    def load_table_from_file(self, file, table_id, job_config):
+        return FakeJob()
+
+    def get_table(self, table_id):
+        return SimpleNamespace(
+            schema=[SimpleNamespace(name=name) for name in self.columns])
+
+    def query(self, sql):
+        self.queries.append(sql)
+        return FakeJob()
+
+    def delete_table(self, table_id, not_found_ok):
+        pass
+
+
+def test_bigquery_merge_leaves_created_at():
+    pytest.importorskip('google.cloud.bigquery')
+    table = season_rows(FIRST_SCRAPE)
+    client = FakeBigQueryClient(table.column_names)
+
+    warehouse.BigQueryLoader(client).upsert(pa.py_buffer(b''), TABLE_ID)
+
+    merge = client.queries[-1]
+    assert 'UpdatedAt = source.UpdatedAt' in merge
+    assert 'CreatedAt = source.CreatedAt' not in merge
+
+
+def test_bigquery_merge_inserts_columns_by_name():
+    pytest.importorskip('google.cloud.bigquery')
+    # Scraped order, not the order of the table schema
+    columns = ['Player_Names', 'Age', 'CreatedAt', 'UpdatedAt', 'DOB',
+               'Season', warehouse.KEY_COLUMN, warehouse.HASH_COLUMN]
+    client = FakeBigQueryClient(columns)
+
+    warehouse.BigQueryLoader(client).upsert(pa.py_buffer(b''), TABLE_ID)
+
+    merge = client.queries[-1]
+    assert 'insert row' not in merge
+    assert (
+        'when not matched then insert (Player_Names, Age, CreatedAt, '
+        'UpdatedAt, DOB, Season, RowKey, RowHash) values ('
+        'source.Player_Names, source.Age, source.CreatedAt, '
+        'source.UpdatedAt, source.DOB, source.Season, source.RowKey, '
+        'source.RowHash)'
+    ) in merge
+
+
+def test_timestamps_key_as_dates():
+    table = pa.table({
+        'Player_Names': ['Ben Davies', 'Ben Davies'],
+        'DOB': pa.array([datetime(1993, 4, 24), datetime(1995, 8, 11)],
+                        pa.timestamp('us', tz='UTC')),
+        'Season': ['2016-2017'] * 2
+    })
+
+    keys = warehouse.add_row_hashes(
+        table, ['Player_Names', 'DOB', 'Season']).column(
+        warehouse.KEY_COLUMN).to_pylist()
+
+    assert keys[0] == hashlib.md5(
+        b'Ben Davies-1993-04-24-2016-2017').hexdigest()
+    assert keys[0] != keys[1]
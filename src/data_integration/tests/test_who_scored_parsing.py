@@ -0,0 +1,36 @@
+import pytest
+
+from common.http_engine import JavaScriptRequired
+from conftest import load_module, read_fixture
+
+
+utils = load_module('epl_scrappers/who_scored/utils.py', 'who_scored_utils')
+
+
+def test_stats_table_is_parsed_column_by_column():
+    page_stats = utils.parse_stats_table(
+        read_fixture('whoscored_player_statistics.html'))
+
+    assert page_stats['Player'] == ['Erling Haaland', 'Harry Kane']
+    assert page_stats['Mins'] == ['2769', '3406']
+    assert page_stats['Goals'] == ['36', '30']
+    assert page_stats['Red'] == ['-', '-']
+    assert page_stats['PS%'] == ['74.1', '72.5']
+    assert all(len(values) == 2 for values in page_stats.values())
+
+
+def test_region_label_is_dropped_from_player_names():
+    page_stats = {
+        'Player': ['England', 'Bukayo Saka', 'England', 'Harry Kane'],
+        'Mins': ['3000', '2700']
+    }
+
+    assert utils.drop_region_labels(page_stats) == {
+        'Player': ['Bukayo Saka', 'Harry Kane'],
+        'Mins': ['3000', '2700']
+    }
+
+
+def test_unrendered_table_requires_javascript():
+    with pytest.raises(JavaScriptRequired):
+        utils.parse_stats_table(read_fixture('whoscored_unrendered.html'))